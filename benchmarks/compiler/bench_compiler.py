@@ -0,0 +1,299 @@
+"""
+Throughput benchmark for the Tusmo compiler front end and code generator.
+
+Generates synthetic `.tus` programs and times every pipeline stage: lexing,
+parsing, import resolution, the prepare pass (f-strings and docstrings),
+tree shaking, semantic checking, constant folding and C generation. The C compiler is not run.
+
+    python benchmarks/compiler/bench_compiler.py                  # all scenarios
+    python benchmarks/compiler/bench_compiler.py --scale 4 -r 5   # bigger programs
+    python benchmarks/compiler/bench_compiler.py --save-baseline  # record a baseline
+    python benchmarks/compiler/bench_compiler.py --compare        # flag regressions
+
+Baselines hold the median time per scenario and stage. They only make
+sense on the machine that recorded them. `--compare` exits with status 1
+when a stage is slower than the baseline by more than `--threshold`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# Every run must measure real work, not the on-disk AST/build caches.
+os.environ["TUSMO_NO_CACHE"] = "1"
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO_ROOT)
+
+from compiler.backend.transpiler import Transpiler  # noqa: E402
+from compiler.frontend.lexer.lexer import lexer  # noqa: E402
+from compiler.midend.ast_prepare import prepare_ast  # noqa: E402
+from compiler.midend.constant_fold import fold_constants  # noqa: E402
+from compiler.midend.docstring_utils import preprocess_docstrings  # noqa: E402
+from compiler.midend.semanticanalyzer import SemanticChecker  # noqa: E402
+from compiler.midend.symbol_table import SymbolTable  # noqa: E402
+from compiler.midend.tree_shake import shake_tree  # noqa: E402
+from compiler.pass_timing import count_nodes  # noqa: E402
+from compiler.processer import parse_code_to_ast, preparse_imports, process_imports  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+STDLIB_DIR = os.path.join(REPO_ROOT, "stdlib")
+STAGES = ("lex", "parse", "imports", "prepare", "shake", "semantic", "fold", "codegen")
+
+
+# ---------------- Synthetic programs ----------------
+
+def gen_functions(count: int) -> str:
+    """`count` hawl functions, each with locals, a branch and a call to the previous one."""
+    out = []
+    for i in range(count):
+        call = f"f{i - 1}(a, c)" if i else "a + b"
+        out.append(
+            f"hawl f{i}(a: tiro, b: tiro) : tiro {{\n"
+            f"    keyd:tiro c = a * {i % 7 + 1} + b;\n"
+            f"    haddii (c > {i}) {{\n"
+            f"        c = c - 1;\n"
+            f"    }} haddii_kale {{\n"
+            f"        c = c + 1;\n"
+            f"    }}\n"
+            f"    soo_celi {call};\n"
+            f"}}\n"
+        )
+    out.append(f"qor(f{count - 1}(1, 2));\n")
+    return "".join(out)
+
+
+def gen_class_hierarchy(depth: int) -> str:
+    """A single `dhaxlaya` chain `depth` classes deep; each level adds a member and a method."""
+    out = []
+    for i in range(depth):
+        parent = f" dhaxlaya K{i - 1}" if i else ""
+        assigns = "".join(f"        kan.m{j} = v + {j};\n" for j in range(max(0, i - 3), i + 1))
+        out.append(
+            f"koox K{i}{parent} {{\n"
+            f"    keyd:tiro m{i};\n"
+            f"    dhis(v: tiro) : waxbo {{\n"
+            f"{assigns}"
+            f"    }}\n"
+            f"    hawl get{i}() : tiro {{\n"
+            f"        soo_celi kan.m{i} * 2;\n"
+            f"    }}\n"
+            f"}}\n"
+        )
+    out.append(f"keyd:K{depth - 1} obj = K{depth - 1}(1) cusub;\n")
+    out.append(f"qor(obj.get{depth - 1}(), obj.m0);\n")
+    return "".join(out)
+
+
+def gen_fstrings(count: int, parts: int = 12) -> str:
+    """`count` f-strings with `parts` interpolations each."""
+    out = ["keyd:tiro x = 7;\n", 'keyd:eray s = "abc";\n']
+    for i in range(count):
+        body = " ".join(f"p{j}={{x + {j}}} s={{s}}" for j in range(parts))
+        out.append(f'keyd:eray f{i} = $"{body}";\n')
+    out.append(f"qor(f{count - 1});\n")
+    return "".join(out)
+
+
+def gen_literals(count: int, width: int = 200) -> str:
+    """`count` large qaamuus and tix literals with `width` entries each."""
+    out = []
+    for i in range(count):
+        pairs = ", ".join(f'"k{j}": {j}' if j % 2 else f'"k{j}": "v{j}"' for j in range(width))
+        items = ", ".join(str(j) for j in range(width))
+        out.append(f"keyd:qaamuus q{i} = {{{pairs}}};\n")
+        out.append(f"keyd:tix:tiro t{i} = [{items}];\n")
+    out.append('qor(q0["k1"], t0[1]);\n')
+    return "".join(out)
+
+
+def gen_imports(count: int, directory: str, functions_per_module: int = 20) -> str:
+    """Write `count` modules to `directory` and return a main program that `keen`s them all."""
+    for m in range(count):
+        body = []
+        for f in range(functions_per_module):
+            body.append(
+                f"hawl mod{m}_f{f}(a: tiro) : tiro {{\n"
+                f"    keyd:tiro b = a + {f};\n"
+                f"    soo_celi b * 2;\n"
+                f"}}\n"
+            )
+        with open(os.path.join(directory, f"mod{m}.tus"), "w") as fh:
+            fh.write("".join(body))
+    imports = "".join(f'keen "mod{m}";\n' for m in range(count))
+    calls = " + ".join(f"mod{m}_f0({m})" for m in range(count))
+    return f"{imports}qor({calls});\n"
+
+
+def build_scenarios(scale: int, directory: str) -> dict[str, str]:
+    return {
+        "functions": gen_functions(1000 * scale),
+        "class_hierarchy": gen_class_hierarchy(60 * scale),
+        "fstrings": gen_fstrings(300 * scale),
+        "literals": gen_literals(20 * scale),
+        "imports": gen_imports(40 * scale, directory),
+    }
+
+
+# ---------------- Measurement ----------------
+
+def run_pipeline(source: str, path: str) -> dict[str, float]:
+    """Run the compiler stages once over `source` and return seconds per stage."""
+    timings = {}
+    directory = os.path.dirname(path)
+
+    start = time.perf_counter()
+    lexer.input(preprocess_docstrings(source))
+    lexer.lineno = 1
+    for _ in iter(lexer.token, None):
+        pass
+    timings["lex"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ast = parse_code_to_ast(source, path)
+    entry_ast = list(ast)
+    timings["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed = preparse_imports(ast, base_directory=directory, stdlib_path=STDLIB_DIR)
+    ast = process_imports(ast, base_directory=directory, stdlib_path=STDLIB_DIR, parsed_modules=parsed)
+    timings["imports"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prepare_ast(ast)
+    timings["prepare"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    shake_tree(ast, roots=entry_ast)
+    timings["shake"] = time.perf_counter() - start
+
+    symbol_table = SymbolTable()
+    start = time.perf_counter()
+    checker = SemanticChecker(symbol_table)
+    checker.check(ast)
+    timings["semantic"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fold_constants(ast)
+    timings["fold"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Transpiler(symbol_table, checker).transpile(ast)
+    timings["codegen"] = time.perf_counter() - start
+
+    timings["_nodes"] = count_nodes(ast)
+    return timings
+
+
+def benchmark(scenarios: dict[str, str], directory: str, repeat: int) -> dict:
+    results = {}
+    for name, source in scenarios.items():
+        path = os.path.join(directory, f"{name}.tus")
+        with open(path, "w") as fh:
+            fh.write(source)
+        runs = [run_pipeline(source, path) for _ in range(repeat)]
+        results[name] = {
+            "lines": source.count("\n"),
+            "nodes": runs[0]["_nodes"],
+            "stages": {stage: statistics.median(run[stage] for run in runs) for stage in STAGES},
+        }
+    return results
+
+
+# ---------------- Reporting ----------------
+
+def print_results(results: dict, baseline: dict | None, threshold: float) -> list[str]:
+    """Print one row per scenario and stage; return the regressions found against `baseline`."""
+    regressions = []
+    header = f"{'scenario':<16} {'stage':<9} {'ms':>10} {'baseline':>10} {'change':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        base_stages = (baseline or {}).get(name, {}).get("stages", {})
+        for stage in STAGES:
+            seconds = result["stages"][stage]
+            base = base_stages.get(stage)
+            if base:
+                change = (seconds - base) / base
+                flag = " !" if change > threshold else ""
+                # Sub-millisecond stages are too noisy to call regressions.
+                if change > threshold and seconds - base > 0.001:
+                    regressions.append(f"{name}/{stage}: {base * 1000:.2f} ms -> {seconds * 1000:.2f} ms ({change:+.0%})")
+                print(f"{name:<16} {stage:<9} {seconds * 1000:>10.2f} {base * 1000:>10.2f} {change:>+7.0%}{flag}")
+            else:
+                print(f"{name:<16} {stage:<9} {seconds * 1000:>10.2f} {'-':>10} {'':>8}")
+        total = sum(result["stages"].values())
+        print(f"{name:<16} {'total':<9} {total * 1000:>10.2f}   ({result['lines']} lines, {result['nodes']} nodes)")
+    return regressions
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark the Tusmo compiler on synthetic programs.")
+    arg_parser.add_argument("--scale", type=int, default=1, help="Multiply every scenario's size.")
+    arg_parser.add_argument("-r", "--repeat", type=int, default=3, help="Runs per scenario; the median is kept.")
+    arg_parser.add_argument("-s", "--scenario", action="append", help="Only run these scenarios.")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+    arg_parser.add_argument("--compare", action="store_true", help="Exit 1 when a stage regressed past the threshold.")
+    arg_parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown (0.15 = 15%%).")
+    arg_parser.add_argument("--json", metavar="FILE", help="Also write the results to FILE.")
+    args = arg_parser.parse_args(argv)
+
+    # Deep class chains and long expressions recurse through the checker.
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    baseline_doc = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline_doc = json.load(fh)
+        if baseline_doc.get("scale") != args.scale:
+            print(f"Baseline was recorded at scale {baseline_doc.get('scale')}; ignoring it.", file=sys.stderr)
+            baseline_doc = None
+
+    with tempfile.TemporaryDirectory(prefix="tusmo-bench-") as directory:
+        scenarios = build_scenarios(args.scale, directory)
+        if args.scenario:
+            unknown = set(args.scenario) - set(scenarios)
+            if unknown:
+                arg_parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+            scenarios = {name: scenarios[name] for name in args.scenario}
+        results = benchmark(scenarios, directory, args.repeat)
+
+    regressions = print_results(results, baseline_doc and baseline_doc["results"], args.threshold)
+
+    document = {
+        "scale": args.scale,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(document, fh, indent=2)
+    if args.save_baseline:
+        if baseline_doc and args.scenario:
+            # Keep the scenarios that were not re-run this time.
+            document["results"] = {**baseline_doc["results"], **results}
+        with open(args.baseline, "w") as fh:
+            json.dump(document, fh, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        if args.compare:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+// benchmarks/runtime/alloc_hook.h
+//
+// Force-included (`-include alloc_hook.h`) ahead of every runtime source in
+// the benchmark build. gc.h is pulled in first, so the runtime's own
+// `#include <gc.h>` is a no-op and the allocation macros below stay in
+// effect: every runtime allocation goes through the counters in
+// bench_runtime.c before reaching the collector.
+
+#ifndef TUSMO_BENCH_ALLOC_HOOK_H
+#define TUSMO_BENCH_ALLOC_HOOK_H
+
+#include <stddef.h>
+#include <gc.h>
+
+void* tusmo_bench_malloc(size_t size);
+void* tusmo_bench_realloc(void* ptr, size_t size);
+
+#undef GC_MALLOC
+#undef GC_REALLOC
+#define GC_MALLOC(size) tusmo_bench_malloc(size)
+#define GC_REALLOC(ptr, size) tusmo_bench_realloc((ptr), (size))
+
+#endif // TUSMO_BENCH_ALLOC_HOOK_H
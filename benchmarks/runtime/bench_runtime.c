@@ -0,0 +1,418 @@
+// benchmarks/runtime/bench_runtime.c
+//
+// Microbenchmarks for the C runtime hot paths. Built and run by
+// bench_runtime.py, which compiles this file together with the runtime
+// sources and `-include alloc_hook.h` so every GC_MALLOC/GC_REALLOC made by
+// the runtime is counted.
+//
+//   ./bench_runtime [--json] [--min-time SECONDS] [filter...]
+//
+// Each benchmark runs with a growing iteration count until it takes at
+// least --min-time, then reports ns/op, allocations/op, bytes/op and the
+// time spent in (full) garbage collections.
+
+#include "tusmo_runtime.h"
+
+#include <sys/socket.h>
+#include <time.h>
+#include <unistd.h>
+
+// --------------------------------------------------------------------------
+// Allocation counting (see alloc_hook.h)
+// --------------------------------------------------------------------------
+static bool bench_counting = false;
+static unsigned long long bench_allocs = 0;
+static unsigned long long bench_bytes = 0;
+
+void* tusmo_bench_malloc(size_t size) {
+    if (bench_counting) {
+        bench_allocs++;
+        bench_bytes += size;
+    }
+    return GC_malloc(size);
+}
+
+void* tusmo_bench_realloc(void* ptr, size_t size) {
+    if (bench_counting) {
+        bench_allocs++;
+        bench_bytes += size;
+    }
+    return GC_realloc(ptr, size);
+}
+
+// --------------------------------------------------------------------------
+// Timer with pause/resume so per-batch setup is not measured
+// --------------------------------------------------------------------------
+static double bench_elapsed_ns = 0;
+static unsigned long long bench_pauses = 0;
+static double bench_pause_overhead_ns = 0;
+static struct timespec bench_started;
+
+static double now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec * 1e9 + (double)ts.tv_nsec;
+}
+
+static void bench_resume(void) {
+    clock_gettime(CLOCK_MONOTONIC, &bench_started);
+    bench_counting = true;
+}
+
+static void bench_pause(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    bench_elapsed_ns += (double)(ts.tv_sec - bench_started.tv_sec) * 1e9
+                      + (double)(ts.tv_nsec - bench_started.tv_nsec);
+    bench_pauses++;
+    bench_counting = false;
+}
+
+// Cost of one resume/pause pair, subtracted from benchmarks that pause
+// around every operation.
+static void calibrate_timer(void) {
+    bench_elapsed_ns = 0;
+    bench_pauses = 0;
+    for (int i = 0; i < 1000000; i++) {
+        bench_resume();
+        bench_pause();
+    }
+    bench_pause_overhead_ns = bench_elapsed_ns / (double)bench_pauses;
+}
+
+static double measured_ns(void) {
+    double ns = bench_elapsed_ns - bench_pause_overhead_ns * (double)bench_pauses;
+    return ns > 0 ? ns : 0;
+}
+
+// Keeps results alive so the optimiser cannot drop the measured calls.
+static volatile uintptr_t bench_sink;
+#define SINK(x) (bench_sink ^= (uintptr_t)(x))
+
+// --------------------------------------------------------------------------
+// Shared fixtures
+// --------------------------------------------------------------------------
+#define KEY_COUNT 1024
+#define ARRAY_SIZE 1024
+
+static char* keys[KEY_COUNT];
+
+static void init_keys(void) {
+    for (int i = 0; i < KEY_COUNT; i++) {
+        keys[i] = tusmo_str_format("key_%d", i);
+    }
+}
+
+static TusmoTixTiro* filled_tix(size_t count) {
+    TusmoTixTiro* tix = tusmo_hp_tix_tiro_create(count);
+    for (size_t i = 0; i < count; i++) tusmo_hp_tix_tiro_append(tix, (int)i);
+    return tix;
+}
+
+static TusmoValue tiro_value(int v) {
+    TusmoValue val;
+    val.type = TUSMO_TIRO;
+    val.value.as_tiro = v;
+    return val;
+}
+
+static TusmoValue eray_value(char* s) {
+    TusmoValue val;
+    val.type = TUSMO_ERAY;
+    val.value.as_eray = s;
+    return val;
+}
+
+// --------------------------------------------------------------------------
+// Benchmarks: each runs `n` operations between bench_resume/bench_pause
+// --------------------------------------------------------------------------
+static void bench_tix_tiro_append(long n) {
+    TusmoTixTiro* tix = tusmo_hp_tix_tiro_create(0);
+    bench_resume();
+    for (long i = 0; i < n; i++) {
+        tusmo_hp_tix_tiro_append(tix, (int)i);
+    }
+    bench_pause();
+    SINK(tix->size);
+}
+
+static void bench_tix_tiro_insert_middle(long n) {
+    TusmoTixTiro* tix = filled_tix(ARRAY_SIZE);
+    for (long i = 0; i < n; i++) {
+        bench_resume();
+        tusmo_hp_tix_tiro_insert(tix, tix->size / 2, (int)i);
+        bench_pause();
+        // Keep the array at ARRAY_SIZE so every insert moves the same amount.
+        tusmo_hp_tix_tiro_pop(tix, tix->size - 1);
+    }
+    SINK(tix->size);
+}
+
+static void bench_tix_tiro_pop_middle(long n) {
+    TusmoTixTiro* tix = filled_tix(ARRAY_SIZE);
+    for (long i = 0; i < n; i++) {
+        bench_resume();
+        int value = tusmo_hp_tix_tiro_pop(tix, tix->size / 2);
+        bench_pause();
+        tusmo_hp_tix_tiro_append(tix, value);
+    }
+    SINK(tix->size);
+}
+
+static void bench_tix_tiro_remove_value(long n) {
+    TusmoTixTiro* tix = filled_tix(ARRAY_SIZE);
+    for (long i = 0; i < n; i++) {
+        int value = (int)(i % ARRAY_SIZE);
+        bench_resume();
+        bool removed = tusmo_hp_tix_tiro_remove(tix, value);
+        bench_pause();
+        tusmo_hp_tix_tiro_append(tix, value);
+        SINK(removed);
+    }
+}
+
+static void bench_qaamuus_set(long n) {
+    TusmoQaamuus* q = tusmo_qaamuus_create();
+    bench_resume();
+    for (long i = 0; i < n; i++) {
+        tusmo_qaamuus_set(q, keys[i % KEY_COUNT], tiro_value((int)i));
+    }
+    bench_pause();
+    SINK(q);
+}
+
+static void bench_qaamuus_get(long n) {
+    TusmoQaamuus* q = tusmo_qaamuus_create();
+    for (int i = 0; i < KEY_COUNT; i++) tusmo_qaamuus_set(q, keys[i], tiro_value(i));
+    long total = 0;
+    bench_resume();
+    for (long i = 0; i < n; i++) {
+        total += tusmo_qaamuus_get(q, keys[(i * 7) % KEY_COUNT]).value.as_tiro;
+    }
+    bench_pause();
+    SINK(total);
+}
+
+static void bench_qaamuus_delete(long n) {
+    TusmoQaamuus* q = tusmo_qaamuus_create();
+    for (int i = 0; i < KEY_COUNT; i++) tusmo_qaamuus_set(q, keys[i], tiro_value(i));
+    for (long i = 0; i < n; i++) {
+        char* key = keys[i % KEY_COUNT];
+        bench_resume();
+        tusmo_qaamuus_delete(q, key);
+        bench_pause();
+        tusmo_qaamuus_set(q, key, tiro_value((int)i));
+    }
+    SINK(q);
+}
+
+static void bench_concat_cstr(long n) {
+    const char* left = "Salaan, adduunka oo dhan! 0123456";
+    const char* right = "Tusmo waa luuqad barnaamij 98765";
+    bench_resume();
+    for (long i = 0; i < n; i++) {
+        SINK(tusmo_concat_cstr(left, right));
+    }
+    bench_pause();
+}
+
+static void bench_str_format(long n) {
+    bench_resume();
+    for (long i = 0; i < n; i++) {
+        SINK(tusmo_str_format("%d-%s-%.2f", (int)i, "magac", (double)i * 0.5));
+    }
+    bench_pause();
+}
+
+static void bench_to_eray(long n) {
+    TusmoValue values[3];
+    values[0] = tiro_value(123456);
+    values[1].type = TUSMO_JAJAB;
+    values[1].value.as_jajab = 3.14159;
+    values[2] = eray_value("qoraal");
+    bench_resume();
+    for (long i = 0; i < n; i++) {
+        SINK(tusmo_to_eray(values[i % 3]));
+    }
+    bench_pause();
+}
+
+static void bench_http_qaamuus_to_json(long n) {
+    TusmoQaamuus* q = tusmo_qaamuus_create();
+    for (int i = 0; i < 16; i++) {
+        if (i % 2) tusmo_qaamuus_set(q, keys[i], tiro_value(i));
+        else tusmo_qaamuus_set(q, keys[i], eray_value("qiimo \"la xigtay\"\n"));
+    }
+    bench_resume();
+    for (long i = 0; i < n; i++) {
+        SINK(tusmo_http_qaamuus_to_json(q));
+    }
+    bench_pause();
+}
+
+static char payload_small[126];
+static char payload_large[4097];
+
+static void init_payloads(void) {
+    memset(payload_small, 'a', sizeof(payload_small) - 1);
+    memset(payload_large, 'b', sizeof(payload_large) - 1);
+}
+
+static void bench_ws_encode_small_masked(long n) {
+    bench_resume();
+    for (long i = 0; i < n; i++) {
+        SINK(tusmo_ws_encode_frame(0x1, payload_small, sizeof(payload_small) - 1, true));
+    }
+    bench_pause();
+}
+
+static void bench_ws_encode_4k(long n) {
+    bench_resume();
+    for (long i = 0; i < n; i++) {
+        SINK(tusmo_ws_encode_frame(0x1, payload_large, sizeof(payload_large) - 1, false));
+    }
+    bench_pause();
+}
+
+static void bench_ws_decode_small_masked(long n) {
+    // Frames go through a socketpair, as they would from a real client;
+    // writing them is not measured, reading and decoding is.
+    int fds[2];
+    if (socketpair(AF_UNIX, SOCK_STREAM, 0, fds) != 0) {
+        perror("socketpair");
+        exit(1);
+    }
+    char* handle = tusmo_socket_from_fd(fds[1]);
+    size_t payload_len = sizeof(payload_small) - 1;
+    char* frame = tusmo_ws_encode_frame(0x1, payload_small, payload_len, true);
+    size_t frame_len = 2 + 4 + payload_len;
+    for (long i = 0; i < n; i++) {
+        if (write(fds[0], frame, frame_len) != (ssize_t)frame_len) {
+            perror("write");
+            exit(1);
+        }
+        bench_resume();
+        SINK(tusmo_ws_decode_frame(handle));
+        bench_pause();
+    }
+    close(fds[0]);
+    close(fds[1]);
+}
+
+typedef struct {
+    const char* name;
+    void (*run)(long n);
+} Benchmark;
+
+static const Benchmark benchmarks[] = {
+    {"tix_tiro_append", bench_tix_tiro_append},
+    {"tix_tiro_insert_middle", bench_tix_tiro_insert_middle},
+    {"tix_tiro_pop_middle", bench_tix_tiro_pop_middle},
+    {"tix_tiro_remove_value", bench_tix_tiro_remove_value},
+    {"qaamuus_set", bench_qaamuus_set},
+    {"qaamuus_get", bench_qaamuus_get},
+    {"qaamuus_delete", bench_qaamuus_delete},
+    {"concat_cstr", bench_concat_cstr},
+    {"str_format", bench_str_format},
+    {"to_eray", bench_to_eray},
+    {"http_qaamuus_to_json", bench_http_qaamuus_to_json},
+    {"ws_encode_small_masked", bench_ws_encode_small_masked},
+    {"ws_encode_4k", bench_ws_encode_4k},
+    {"ws_decode_small_masked", bench_ws_decode_small_masked},
+};
+
+// --------------------------------------------------------------------------
+// GC statistics (only with the real Boehm GC, version 8 or newer)
+// --------------------------------------------------------------------------
+#if defined(GC_VERSION_MAJOR) && GC_VERSION_MAJOR >= 8
+#define BENCH_HAVE_GC_STATS 1
+static unsigned long gc_time_ms(void) { return GC_get_full_gc_total_time(); }
+static unsigned long gc_count(void) { return (unsigned long)GC_get_gc_no(); }
+#else
+#define BENCH_HAVE_GC_STATS 0
+static unsigned long gc_time_ms(void) { return 0; }
+static unsigned long gc_count(void) { return 0; }
+#endif
+
+static bool matches(const char* name, int filter_count, char** filters) {
+    if (filter_count == 0) return true;
+    for (int i = 0; i < filter_count; i++) {
+        if (strstr(name, filters[i])) return true;
+    }
+    return false;
+}
+
+int main(int argc, char** argv) {
+#if BENCH_HAVE_GC_STATS
+    GC_start_performance_measurement();
+#endif
+    GC_INIT();
+
+    bool json = false;
+    double min_time = 0.2;
+    char* filters[64];
+    int filter_count = 0;
+    for (int i = 1; i < argc; i++) {
+        if (strcmp(argv[i], "--json") == 0) json = true;
+        else if (strcmp(argv[i], "--min-time") == 0 && i + 1 < argc) min_time = atof(argv[++i]);
+        else if (filter_count < 64) filters[filter_count++] = argv[i];
+    }
+
+    init_keys();
+    init_payloads();
+    calibrate_timer();
+
+    if (json) printf("{\"gc_stats\": %s, \"results\": [", BENCH_HAVE_GC_STATS ? "true" : "false");
+    else printf("%-26s %12s %12s %10s %12s %8s %8s\n", "benchmark", "iterations", "ns/op", "allocs/op", "bytes/op", "GC ms", "GCs");
+
+    bool first = true;
+    for (size_t b = 0; b < sizeof(benchmarks) / sizeof(benchmarks[0]); b++) {
+        const Benchmark* bench = &benchmarks[b];
+        if (!matches(bench->name, filter_count, filters)) continue;
+
+        long n = 1;
+        for (;;) {
+            bench_elapsed_ns = 0;
+            bench_pauses = 0;
+            bench_allocs = 0;
+            bench_bytes = 0;
+            unsigned long gc_ms_before = gc_time_ms();
+            unsigned long gcs_before = gc_count();
+            double wall_start = now_ns();
+            bench->run(n);
+            double wall = now_ns() - wall_start;
+
+            // Stop once the measured part is long enough, or the whole run
+            // (including paused setup) is getting too slow to scale further.
+            double elapsed = measured_ns();
+            if (elapsed >= min_time * 1e9 || wall >= min_time * 1e9 * 20 || n >= (1L << 30)) {
+                double ns_per_op = elapsed / (double)n;
+                double allocs_per_op = (double)bench_allocs / (double)n;
+                double bytes_per_op = (double)bench_bytes / (double)n;
+                unsigned long gc_ms = gc_time_ms() - gc_ms_before;
+                unsigned long gcs = gc_count() - gcs_before;
+                if (json) {
+                    printf("%s\n  {\"name\": \"%s\", \"iterations\": %ld, \"ns_per_op\": %.3f, "
+                           "\"allocs_per_op\": %.3f, \"bytes_per_op\": %.1f, \"gc_ms\": %lu, \"gc_count\": %lu}",
+                           first ? "" : ",", bench->name, n, ns_per_op, allocs_per_op, bytes_per_op, gc_ms, gcs);
+                } else {
+                    printf("%-26s %12ld %12.1f %10.2f %12.1f %8lu %8lu\n",
+                           bench->name, n, ns_per_op, allocs_per_op, bytes_per_op, gc_ms, gcs);
+                }
+                fflush(stdout);
+                first = false;
+                break;
+            }
+
+            // Aim for the target time based on the rate so far, growing 1.5x-100x per round.
+            double per_op = elapsed > 0 ? elapsed / (double)n : 1.0;
+            long next = (long)(min_time * 1e9 * 1.2 / per_op);
+            if (next < n + n / 2 + 1) next = n + n / 2 + 1;
+            if (next > n * 100) next = n * 100;
+            n = next;
+        }
+    }
+
+    if (json) printf("\n]}\n");
+    return 0;
+}
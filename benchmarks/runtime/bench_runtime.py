@@ -0,0 +1,160 @@
+"""
+Builds and runs the C runtime microbenchmarks (bench_runtime.c).
+
+    python benchmarks/runtime/bench_runtime.py                  # build + run all
+    python benchmarks/runtime/bench_runtime.py qaamuus ws_      # only matching names
+    python benchmarks/runtime/bench_runtime.py --save-baseline  # record a baseline
+    python benchmarks/runtime/bench_runtime.py --compare        # flag regressions
+
+The harness is linked against the runtime sources and libgc the same way
+tusmo.py links programs. It honours TUSMO_CC, TUSMO_INCLUDE_DIR and
+TUSMO_LIB_DIR. Baselines are machine specific; `--compare` exits with
+status 1 when a benchmark's ns/op or allocs/op grew by more than
+`--threshold`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(BENCH_DIR))
+RUNTIME_DIR = os.path.join(REPO_ROOT, "runtime")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+RUNTIME_SOURCES = [
+    "array.c",
+    "array_generic.c",
+    "dictionary.c",
+    "string.c",
+    "type_conversion.c",
+    "io.c",
+    "http.c",
+    "socket.c",
+    "websocket.c",
+]
+
+
+def build(output: str, cflags: list[str]) -> None:
+    cc = os.environ.get("TUSMO_CC", "gcc")
+    include_dirs = [RUNTIME_DIR]
+    if os.environ.get("TUSMO_INCLUDE_DIR"):
+        include_dirs.insert(0, os.environ["TUSMO_INCLUDE_DIR"])
+    lib_dir = os.environ.get("TUSMO_LIB_DIR")
+
+    command = [
+        cc, *cflags,
+        "-include", os.path.join(BENCH_DIR, "alloc_hook.h"),
+        *(f"-I{path}" for path in include_dirs),
+        "-o", output,
+        os.path.join(BENCH_DIR, "bench_runtime.c"),
+        *(os.path.join(RUNTIME_DIR, name) for name in RUNTIME_SOURCES),
+        *([f"-L{lib_dir}"] if lib_dir else []),
+        "-lgc",
+    ]
+    result = subprocess.run(command)
+    if result.returncode != 0:
+        sys.exit(f"Cilad: harness-ka lama dhisi karo ({' '.join(command)})")
+
+
+def run(binary: str, filters: list[str], min_time: float) -> dict:
+    result = subprocess.run(
+        [binary, "--json", "--min-time", str(min_time), *filters],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        sys.exit(f"Cilad: harness-ku wuu fashilmay (code {result.returncode})")
+    return json.loads(result.stdout)
+
+
+def print_results(results: list[dict], baseline: dict | None, threshold: float, gc_stats: bool) -> list[str]:
+    """Print one row per benchmark; return the regressions against `baseline`."""
+    regressions = []
+    header = f"{'benchmark':<26} {'ns/op':>10} {'baseline':>10} {'change':>8} {'allocs/op':>10} {'bytes/op':>10} {'GC ms':>7}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        name = row["name"]
+        base = (baseline or {}).get(name)
+        gc_ms = str(row["gc_ms"]) if gc_stats else "n/a"
+        if base and base["ns_per_op"] > 0:
+            change = (row["ns_per_op"] - base["ns_per_op"]) / base["ns_per_op"]
+            flag = " !" if change > threshold else ""
+            if change > threshold:
+                regressions.append(f"{name}: {base['ns_per_op']:.1f} -> {row['ns_per_op']:.1f} ns/op ({change:+.0%})")
+            if row["allocs_per_op"] > base["allocs_per_op"] * (1 + threshold) + 0.01:
+                regressions.append(f"{name}: {base['allocs_per_op']:.2f} -> {row['allocs_per_op']:.2f} allocs/op")
+            base_text, change_text = f"{base['ns_per_op']:.1f}", f"{change:+.0%}{flag}"
+        else:
+            base_text, change_text = "-", ""
+        print(f"{name:<26} {row['ns_per_op']:>10.1f} {base_text:>10} {change_text:>8} "
+              f"{row['allocs_per_op']:>10.2f} {row['bytes_per_op']:>10.1f} {gc_ms:>7}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark the Tusmo C runtime.")
+    arg_parser.add_argument("filters", nargs="*", help="Only run benchmarks whose name contains one of these.")
+    arg_parser.add_argument("--min-time", type=float, default=0.2, help="Seconds each benchmark runs for.")
+    arg_parser.add_argument("--cflags", default="-O2", help="C flags for the harness and runtime (default: -O2).")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+    arg_parser.add_argument("--compare", action="store_true", help="Exit 1 when a benchmark regressed past the threshold.")
+    arg_parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown (0.15 = 15%%).")
+    arg_parser.add_argument("--json", metavar="FILE", help="Also write the results to FILE.")
+    args = arg_parser.parse_args(argv)
+
+    baseline_doc = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline_doc = json.load(fh)
+        if baseline_doc.get("cflags") != args.cflags:
+            print(f"Baseline was built with '{baseline_doc.get('cflags')}'; ignoring it.", file=sys.stderr)
+            baseline_doc = None
+
+    with tempfile.TemporaryDirectory(prefix="tusmo-rtbench-") as directory:
+        binary = os.path.join(directory, "bench_runtime")
+        build(binary, args.cflags.split())
+        report = run(binary, args.filters, args.min_time)
+
+    results = report["results"]
+    baseline = {row["name"]: row for row in baseline_doc["results"]} if baseline_doc else None
+    regressions = print_results(results, baseline, args.threshold, report["gc_stats"])
+
+    document = {
+        "cflags": args.cflags,
+        "machine": platform.machine(),
+        "gc_stats": report["gc_stats"],
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(document, fh, indent=2)
+    if args.save_baseline:
+        if baseline_doc and args.filters:
+            # Keep the benchmarks that were not re-run this time.
+            merged = {row["name"]: row for row in baseline_doc["results"]}
+            merged.update({row["name"]: row for row in results})
+            document["results"] = list(merged.values())
+        with open(args.baseline, "w") as fh:
+            json.dump(document, fh, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        if args.compare:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+
+from compiler.build_cache import compiler_fingerprint
+from compiler.runtime_cache import default_cache_dir
+
+
+class ModuleASTCache:
+    """
+    On-disk cache of parsed module ASTs, one pickle per source file.
+
+    Each entry starts with a small header (mtime, size, content hash and
+    compiler fingerprint) followed by the AST, so a stale entry is rejected
+    without unpickling the tree. When only the mtime moved (checkout,
+    touch) the content hash decides and the header is refreshed.
+
+    With `keep_in_memory` (the compile daemon, batch builds) entries are
+    also kept as pickled bytes keyed by mtime and size, even when the disk
+    cache is turned off. Every hit unpickles a fresh tree, because later
+    passes mutate the AST they are given.
+    """
+
+    def __init__(self, cache_dir: str | None = None, keep_in_memory: bool = False) -> None:
+        self.root = os.path.join(cache_dir or default_cache_dir(), "modules")
+        self.enabled = not os.environ.get("TUSMO_NO_CACHE")
+        self.keep_in_memory = keep_in_memory
+        self._memory: dict[str, tuple[int, int, bytes]] = {}
+
+    def _entry_path(self, source_path: str) -> str:
+        key = hashlib.sha256(os.path.abspath(source_path).encode()).hexdigest()[:24]
+        return os.path.join(self.root, f"{key}.ast")
+
+    def load(self, source_path: str, source: str | None = None):
+        """Return the cached AST for `source_path`, or None when it is missing or stale."""
+        if self.keep_in_memory:
+            ast = self._load_from_memory(source_path)
+            if ast is not None:
+                return ast
+        if not self.enabled:
+            return None
+        entry_path = self._entry_path(source_path)
+        try:
+            stat = os.stat(source_path)
+            with open(entry_path, "rb") as f:
+                header = pickle.load(f)
+                if header.get("compiler") != compiler_fingerprint():
+                    return None
+                if header["mtime_ns"] != stat.st_mtime_ns or header["size"] != stat.st_size:
+                    if source is None:
+                        with open(source_path, "r") as src:
+                            source = src.read()
+                    if _hash_source(source) != header["sha"]:
+                        return None
+                    header["mtime_ns"], header["size"] = stat.st_mtime_ns, stat.st_size
+                    ast = pickle.load(f)
+                    self._write(entry_path, header, ast)
+                    self._remember(source_path, stat, ast)
+                    return ast
+                ast = pickle.load(f)
+                self._remember(source_path, stat, ast)
+                return ast
+        except (OSError, EOFError, KeyError, AttributeError, pickle.UnpicklingError):
+            return None
+
+    def _load_from_memory(self, source_path: str):
+        entry = self._memory.get(os.path.abspath(source_path))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        if entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            return None
+        return pickle.loads(entry[2])
+
+    def remember(self, source_path: str, ast) -> None:
+        """Keep `ast` in memory (when `keep_in_memory` is set) even if the disk cache is off."""
+        if not self.keep_in_memory or os.path.abspath(source_path) in self._memory:
+            return
+        try:
+            self._remember(source_path, os.stat(source_path), ast)
+        except OSError:
+            pass
+
+    def _remember(self, source_path: str, stat: os.stat_result, ast) -> None:
+        if not self.keep_in_memory:
+            return
+        try:
+            blob = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError):
+            return
+        self._memory[os.path.abspath(source_path)] = (stat.st_mtime_ns, stat.st_size, blob)
+
+    def store(self, source_path: str, source: str, ast) -> None:
+        if not self.enabled:
+            self.remember(source_path, ast)
+            return
+        try:
+            stat = os.stat(source_path)
+            header = {
+                "compiler": compiler_fingerprint(),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha": _hash_source(source),
+            }
+            os.makedirs(self.root, exist_ok=True)
+            self._write(self._entry_path(source_path), header, ast)
+            self._remember(source_path, stat, ast)
+        except (OSError, RecursionError, pickle.PicklingError):
+            # Very deep trees may not pickle; they are simply parsed again next time.
+            pass
+
+    @staticmethod
+    def _write(entry_path: str, header: dict, ast) -> None:
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(ast, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def _hash_source(source: str) -> str:
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+module_ast_cache = ModuleASTCache()
@@ -1,6 +1,6 @@
 # compiler/backend/transpiler/__init__.py (Updated)
 
-from .c_code_generator import CCodeGenerator
+from .c_code_generator import CCodeGenerator, TranslationUnits
 from compiler.midend.symbol_table import SymbolTable
 from compiler.midend.semanticanalyzer import SemanticChecker
 
@@ -9,8 +9,15 @@ class Transpiler:
     def __init__(self, symbol_table: SymbolTable, semantic_checker: SemanticChecker):
         self.symbol_table = symbol_table
         # 2. The semantic_checker is passed down when creating CCodeGenerator.
-        self.used_features = set() 
-        self.code_generator = CCodeGenerator(symbol_table, semantic_checker, self.used_features)
+        self.code_generator = CCodeGenerator(symbol_table, semantic_checker)
         
     def transpile(self, ast):
-        return self.code_generator.generate(ast)
\ No newline at end of file
+        return self.code_generator.generate(ast)
+
+    def transpile_to(self, ast, out):
+        """Write the generated C straight to the file object `out`; returns the runtime symbols it uses."""
+        return self.code_generator.generate_to(ast, out)
+
+    def transpile_units(self, ast, directory, name, entry_file) -> TranslationUnits:
+        """Write one C translation unit per module (plus a shared header) into `directory`."""
+        return self.code_generator.generate_units(ast, directory, name, entry_file)
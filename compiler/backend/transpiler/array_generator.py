@@ -12,7 +12,7 @@ class ArrayGenerator:
 
 
     def get_c_type_map(self):
-        return {'tiro': 'int', 'jajab': 'double', 'eray': 'char*', 'miyaa': 'bool', 'xaraf': 'char', 'waxbo': 'void', 'qaamuus': 'TusmoQaamuus*'}
+        return {'tiro': 'int', 'jajab': 'double', 'eray': 'char*', 'miyaa': 'bool', 'xaraf': 'char', 'waxbo': 'void', 'qaamuus': 'TusmoQaamuus*', 'xadhig': 'TusmoXadhig*'}
 
     def get_tix_struct_name(self, element_type_str):
         # --- FIX #1 IS HERE ---
@@ -35,7 +35,6 @@ class ArrayGenerator:
             return f"{struct_name}*"
 
     def _generate_recursive_initializer(self, type_node, element_nodes):
-        self.main_generator.used_features.add("array")
         temp_var = self.main_generator.get_temp_var()
         c_type = self.get_c_type_from_tusmo_type(type_node)
         capacity = len(element_nodes) if element_nodes else 8
@@ -43,12 +42,12 @@ class ArrayGenerator:
         if isinstance(type_node.element_type, ArrayTypeNode):
             create_func = "tusmo_tix_generic_create"
             append_func = "tusmo_tix_generic_append"
-            self.main_generator.c_code += f"    {c_type} {temp_var} = {create_func}({capacity});\n"
+            self.main_generator.emit(f"    {c_type} {temp_var} = {create_func}({capacity});\n")
             for sub_array_literal_node in element_nodes:
                 sub_array_type = type_node.element_type
                 sub_array_elements = sub_array_literal_node.elements
                 sub_init_var = self._generate_recursive_initializer(sub_array_type, sub_array_elements)
-                self.main_generator.c_code += f"    {append_func}({temp_var}, {sub_init_var});\n"
+                self.main_generator.emit(f"    {append_func}({temp_var}, {sub_init_var});\n")
         
         # --- FIX #2 IS HERE ---
         # Handle dynamic vs. homogeneous arrays
@@ -59,7 +58,7 @@ class ArrayGenerator:
             if element_type_str == 'None' or element_type_str == 'qaamuus':
                 create_func = "tusmo_tix_mixed_create"
                 append_func = "tusmo_tix_mixed_append"
-                self.main_generator.c_code += f"    {c_type} {temp_var} = {create_func}({capacity});\n"
+                self.main_generator.emit(f"    {c_type} {temp_var} = {create_func}({capacity});\n")
                 
                 # For mixed arrays, each element must be wrapped in a TusmoValue struct
                 for element_node in element_nodes:
@@ -69,15 +68,14 @@ class ArrayGenerator:
             else:
                 create_func = f"tusmo_hp_tix_{element_type_str}_create"
                 append_func = f"tusmo_hp_tix_{element_type_str}_append"
-                self.main_generator.c_code += f"    {c_type} {temp_var} = {create_func}({capacity});\n"
+                self.main_generator.emit(f"    {c_type} {temp_var} = {create_func}({capacity});\n")
                 for primitive_node in element_nodes:
                     element_c_code = self.expr_generator.generate_expression(primitive_node)
-                    self.main_generator.c_code += f"    {append_func}({temp_var}, {element_c_code});\n"
+                    self.main_generator.emit(f"    {append_func}({temp_var}, {element_c_code});\n")
                 
         return temp_var
 
     def generate_access(self, node: ArrayAccessNode):
-        self.main_generator.used_features.add("array")
         base_expr_c = self.expr_generator.generate_expression(node.array_name_node)
         index_c = self.expr_generator.generate_expression(node.index_expression)
         base_tusmo_type = self.expr_generator.get_expression_type(node.array_name_node)
@@ -97,11 +95,10 @@ class ArrayGenerator:
     def generate_assignment(self, node: ArrayAssignmentNode):
         access_c = self.generate_access(node.array_access_node)
         value_c = self.expr_generator.generate_expression(node.value_expression)
-        self.main_generator.c_code += f"    {access_c} = {value_c};\n"
+        self.main_generator.emit(f"    {access_c} = {value_c};\n")
         
     # In array_generator.py, replace the generate_method_call method with this:
     def generate_method_call(self, node: MethodCallNode):
-        self.main_generator.used_features.add("array")
         object_c = self.expr_generator.generate_expression(node.object_node)
         object_type = self.expr_generator.get_expression_type(node.object_node)
         args = node.args_list # Use raw args list as we handle named args manually
@@ -136,11 +133,11 @@ class ArrayGenerator:
             self.generate_mixed_append_call(array_c_name, element_node)
         elif isinstance(element_type, ArrayTypeNode): # Nested array
             element_c_code = self.expr_generator.generate_expression(element_node)
-            self.main_generator.c_code += f"    tusmo_tix_generic_append({array_c_name}, {element_c_code});\n"
+            self.main_generator.emit(f"    tusmo_tix_generic_append({array_c_name}, {element_c_code});\n")
         elif not isinstance(element_type, ArrayTypeNode):
             element_c_code = self.expr_generator.generate_expression(element_node)
             append_func = f"tusmo_hp_tix_{element_type}_append"
-            self.main_generator.c_code += f"    {append_func}({array_c_name}, {element_c_code});\n"
+            self.main_generator.emit(f"    {append_func}({array_c_name}, {element_c_code});\n")
 
     def generate_insert_call(self, array_c_name, array_type_node, index_node, element_node):
         element_type = array_type_node.element_type
@@ -150,11 +147,11 @@ class ArrayGenerator:
             self.generate_mixed_insert_call(array_c_name, index_c, element_node)
         elif isinstance(element_type, ArrayTypeNode): # Nested array
             element_c_code = self.expr_generator.generate_expression(element_node)
-            self.main_generator.c_code += f"    tusmo_tix_generic_insert({array_c_name}, {index_c}, {element_c_code});\n"
+            self.main_generator.emit(f"    tusmo_tix_generic_insert({array_c_name}, {index_c}, {element_c_code});\n")
         elif not isinstance(element_type, ArrayTypeNode):
             element_c_code = self.expr_generator.generate_expression(element_node)
             insert_func = f"tusmo_hp_tix_{element_type}_insert"
-            self.main_generator.c_code += f"    {insert_func}({array_c_name}, {index_c}, {element_c_code});\n"
+            self.main_generator.emit(f"    {insert_func}({array_c_name}, {index_c}, {element_c_code});\n")
 
     def generate_pop_call(self, array_c_name, array_type_node, index_node):
         element_type = array_type_node.element_type
@@ -201,20 +198,20 @@ class ArrayGenerator:
         type_str = str(element_tusmo_type)
         temp_var = self.main_generator.get_temp_var()
         
-        self.main_generator.c_code += f"    TusmoValue {temp_var};\n"
-        self.main_generator.c_code += f"    {temp_var}.type = {type_enum_map.get(type_str, 'TUSMO_WAXBA')};\n"
+        self.main_generator.emit(f"    TusmoValue {temp_var};\n")
+        self.main_generator.emit(f"    {temp_var}.type = {type_enum_map.get(type_str, 'TUSMO_WAXBA')};\n")
         if type_str in union_member_map:
-            self.main_generator.c_code += f"    {temp_var}.value.{union_member_map[type_str]} = {element_c_code};\n"
+            self.main_generator.emit(f"    {temp_var}.value.{union_member_map[type_str]} = {element_c_code};\n")
             
         return temp_var
 
     def generate_mixed_append_call(self, array_c_name, element_node):
         temp_var = self._generate_tusmo_value(element_node)
-        self.main_generator.c_code += f"    tusmo_tix_mixed_append({array_c_name}, {temp_var});\n"
+        self.main_generator.emit(f"    tusmo_tix_mixed_append({array_c_name}, {temp_var});\n")
 
     def generate_mixed_insert_call(self, array_c_name, index_c, element_node):
         temp_var = self._generate_tusmo_value(element_node)
-        self.main_generator.c_code += f"    tusmo_tix_mixed_insert({array_c_name}, {index_c}, {temp_var});\n"
+        self.main_generator.emit(f"    tusmo_tix_mixed_insert({array_c_name}, {index_c}, {temp_var});\n")
 
     def generate_mixed_remove_call(self, array_c_name, element_node):
         # For remove, we need to pass the value to check against
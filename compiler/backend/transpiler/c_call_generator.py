@@ -10,7 +10,6 @@ class CCallGenerator:
 
     def __init__(self, code_generator):
         self.cg = code_generator  # your CCodeGenerator instance
-        self.used_features = code_generator.used_features
 
         # Registry of available C functions
         # key = C function name as string (or identifier), value = number of parameters
@@ -58,11 +57,5 @@ class CCallGenerator:
         args_c = [self.cg.generate_expression(arg) for arg in provided_args]
         args_str = ", ".join(args_c)
 
-        # Track feature if it comes from runtime (arrays, random, etc.)
-        if func_name_str.startswith("tusmo_hp_tix") or func_name_str.startswith("tusmo_tix_"):
-            self.used_features.add("array")
-        elif func_name_str.startswith("tusmo_random") or func_name_str == "tusmo_init_random":
-            self.used_features.add("random")
-
         # Emit the call
         return f"{func_name_str}({args_str})"
@@ -1,8 +1,16 @@
 # c_code_generator.py (Updated)
 
+import hashlib
+import io
+import os
+import re
+from typing import NamedTuple
+
 from compiler.frontend.parser.ast_nodes import *
 from compiler.midend.symbol_table import SymbolTable
 from compiler.midend.semanticanalyzer import SemanticChecker, SemanticError
+from compiler.runtime_manifest import runtime_manifest
+from compiler.toolchain import RUNTIME_DIR
 
 from .keyd_generator import KeydGenerator
 from .qor_generator import QorGenerator
@@ -16,24 +24,39 @@ from .array_generator import ArrayGenerator
 from .dictionary_generator import DictionaryGenerator
 from .loop_generator import LoopGenerator
 from .class_generator import ClassGenerator
+from .c_emitter import CEmitter
 from compiler.frontend.parser.ast_nodes import MethodCallNode
 from compiler.frontend.parser.ast_nodes import ArrayTypeNode, EmbeddedCNode
 
 
+def _module_temp_prefix(module):
+    """`<stem>_<path hash>_` for a module file; the hash keeps same-named modules apart."""
+    if module is None:
+        return ""
+    stem = re.sub(r"\W", "_", os.path.splitext(os.path.basename(module))[0])
+    return f"{stem}_{hashlib.sha1(module.encode()).hexdigest()[:8]}_"
+
+
+class TranslationUnits(NamedTuple):
+    """The files written by `CCodeGenerator.generate_units`."""
+    header: str | None
+    sources: list
+    runtime_symbols: set
+
+
 class CCodeGenerator:
     # 1. The __init__ method is updated to accept 'semantic_checker'.
-    def __init__(self, symbol_table: SymbolTable, semantic_checker: SemanticChecker, used_features):
+    def __init__(self, symbol_table: SymbolTable, semantic_checker: SemanticChecker):
         self.symbol_table = symbol_table
         # 2. The semantic_checker is stored as an attribute. This is what fixes the error.
         self.semantic_checker = semantic_checker
 
-        self.c_code = ""
+        self.emitter = CEmitter()
         self.temp_var_counter = 0
-        self.function_definitions = ""
-        self.class_definitions = ""
         self.current_class = None
-        self.used_features = used_features
+        self.runtime_symbols = set()
         self.embedded_c_chunks = []
+        self.module_temp_counters = {}
 
         self.expr_generator = ExpressionGenerator(self)
         self.function_generator = FunctionGenerator(self, self.expr_generator)
@@ -48,7 +71,19 @@ class CCodeGenerator:
         self.loop_generator = LoopGenerator(self, self.expr_generator)
         self.class_generator = ClassGenerator(self)
 
+    def emit(self, code):
+        """Append C statements to the body currently being generated."""
+        self.emitter.emit(code)
+
     def get_temp_var(self):
+        if self.emitter.split_modules:
+            # Numbered per module under a prefix taken from the module's path,
+            # so editing one module leaves the C of the others (and their
+            # cached objects) unchanged.
+            module = self.emitter.current_module
+            prefix, count = self.module_temp_counters.get(module) or (_module_temp_prefix(module), 0)
+            self.module_temp_counters[module] = (prefix, count + 1)
+            return f"__tusmo_temp_{prefix}{count + 1}"
         self.temp_var_counter += 1
         return f"__tusmo_temp_{self.temp_var_counter}"
     
@@ -62,11 +97,11 @@ class CCodeGenerator:
         if isinstance(object_type, ArrayTypeNode):
             method_call_c = self.array_generator.generate_method_call(node)
             if method_call_c: # Only add if code was generated
-                self.c_code += f"    {method_call_c};\n"
+                self.emitter.line(f"{method_call_c};")
         else:
             # For class methods, generate as an expression statement
             method_call_c = self.expr_generator.generate_expression(node)
-            self.c_code += f"    {method_call_c};\n"
+            self.emitter.line(f"{method_call_c};")
 
     def get_c_type(self, tusmo_type):
         if isinstance(tusmo_type, FunctionTypeNode):
@@ -86,37 +121,129 @@ class CCodeGenerator:
         return "void*"
 
     def generate(self, ast):
-        self.c_code = ""
-        self.function_definitions = ""
-        self.class_definitions = ""
+        """Generate the whole C file and return it as a string with the runtime symbols it uses."""
+        buffer = io.StringIO()
+        self.generate_to(ast, buffer)
+        return buffer.getvalue(), self.runtime_symbols
+
+    def generate_to(self, ast, out):
+        """
+        Generate the C file straight into the text file object `out`. The
+        sections are written out one after another instead of being joined
+        into a single string first.
+        """
+        self._generate_program(ast)
+        self._write_preamble(out)
+        self.emitter.classes.write_to(out)
+        self.emitter.functions.write_to(out)
+        self._write_main(out)
+        self.emitter.close()
+        return self.runtime_symbols
+
+    def generate_units(self, ast, directory, name, entry_file):
+        """
+        Generate one C translation unit per `.tus` module into `directory`.
+        `<name>_tusmo.h` holds the class structs and a prototype for every
+        function; each imported module's functions go to their own `.c`
+        file and `<name>.c` gets the functions of `entry_file` and `main`.
+        A program with embedded C is written as a single unit, since that
+        code may define things every unit would otherwise need.
+        """
+        self._generate_program(ast, split_modules=True)
+        emitter = self.emitter
+        entry_module = os.path.abspath(entry_file)
+        main_path = os.path.join(directory, f"{name}.c")
+        try:
+            if self.embedded_c_chunks:
+                with open(main_path, "w") as out:
+                    self._write_preamble(out)
+                    emitter.classes.write_to(out)
+                    emitter.prototypes.write_to(out)
+                    out.write("\n")
+                    for section in emitter.module_functions.values():
+                        section.write_to(out)
+                    self._write_main(out)
+                return TranslationUnits(None, [main_path], self.runtime_symbols)
+
+            header_name = f"{name}_tusmo.h"
+            guard = re.sub(r"\W", "_", header_name).upper()
+            header_path = os.path.join(directory, header_name)
+            with open(header_path, "w") as out:
+                out.write(f"#ifndef {guard}\n#define {guard}\n\n")
+                out.write('#include "tusmo_runtime.h"\n\n')
+                emitter.classes.write_to(out)
+                emitter.prototypes.write_to(out)
+                out.write(f"\n#endif /* {guard} */\n")
+
+            sources = []
+            taken = {name}
+            for module, section in emitter.module_functions.items():
+                if module is None or module == entry_module:
+                    continue
+                stem = re.sub(r"\W", "_", os.path.splitext(os.path.basename(module))[0])
+                unit_name = stem
+                while unit_name in taken:
+                    unit_name = f"{stem}_{len(taken)}"
+                taken.add(unit_name)
+                unit_path = os.path.join(directory, f"{unit_name}.c")
+                with open(unit_path, "w") as out:
+                    out.write(f'/* {os.path.basename(module)} */\n#include "{header_name}"\n\n')
+                    section.write_to(out)
+                sources.append(unit_path)
+
+            with open(main_path, "w") as out:
+                out.write(f'#include "{header_name}"\n\n')
+                for module in (None, entry_module):
+                    if module in emitter.module_functions:
+                        emitter.module_functions[module].write_to(out)
+                self._write_main(out)
+            sources.append(main_path)
+            return TranslationUnits(header_path, sources, self.runtime_symbols)
+        finally:
+            emitter.close()
+
+    def _generate_program(self, ast, split_modules=False):
+        self.emitter.close()
+        self.emitter = CEmitter(split_modules=split_modules)
         self.embedded_c_chunks = []
+        self.module_temp_counters = {}
         for node in ast:
+            if split_modules:
+                self.emitter.current_module = os.path.abspath(node.filename) if getattr(node, "filename", None) else None
             self._generate_node(node)
-        header_include = '#include "tusmo_runtime.h"\n\n'
-        embedded_section = ""
+        self._collect_runtime_symbols()
+
+    def _collect_runtime_symbols(self):
+        """
+        Record the runtime functions and macros the generated C refers to;
+        the driver links the runtime objects that define them.
+        """
+        manifest = runtime_manifest(RUNTIME_DIR)
+        symbols = set()
+        for section in self.emitter.sections():
+            for text in section.iter_text():
+                symbols |= manifest.symbols_in(text)
+        for code, _ in self.embedded_c_chunks:
+            symbols |= manifest.symbols_in(code)
+        self.runtime_symbols = symbols
+
+    def _write_preamble(self, out):
+        out.write('#include "tusmo_runtime.h"\n\n')
         if self.embedded_c_chunks:
-            embedded_bodies = []
             for code, meta in self.embedded_c_chunks:
-                comment = ""
                 if meta.filename:
-                    comment = f"/* Embedded C from {meta.filename}:{meta.line} */\n"
-                body = code
-                if not body.endswith("\n"):
-                    body += "\n"
-                embedded_bodies.append(f"{comment}{body}")
-            embedded_section = "".join(embedded_bodies) + "\n"
-        final_c_code = (
-            f"{header_include}"
-            f"{embedded_section}"
-            f"{self.class_definitions}"
-            f"{self.function_definitions}"
-            f"int main(void) {{\n"
-            f"    GC_INIT();\n"
-            f"{self.c_code}"
-            f"    return 0;\n"
-            f"}}\n"
-        )
-        return final_c_code, self.used_features
+                    out.write(f"/* Embedded C from {meta.filename}:{meta.line} */\n")
+                out.write(code)
+                if not code.endswith("\n"):
+                    out.write("\n")
+            out.write("\n")
+
+    def _write_main(self, out):
+        out.write("int main(void) {\n")
+        out.write("    GC_INIT();\n")
+        self.emitter.main.write_to(out)
+        out.write("    return 0;\n")
+        out.write("}\n")
 
     def _generate_node(self, node):
         if node is None: return
@@ -135,7 +262,7 @@ class CCodeGenerator:
     def _unhandled_node(self, node):
         if isinstance(node, ExpressionNode):
             expr_c = self.expr_generator.generate_expression(node)
-            self.c_code += f"    {expr_c};\n"
+            self.emitter.line(f"{expr_c};")
         else:
             print(f"Digniin: Ma jiro hab-turjun loogu talagalay nooca '{type(node).__name__}' ee ku jira jirka ugu weyn.")
 
@@ -151,28 +278,23 @@ class CCodeGenerator:
     def _generate_assignmentnode(self, node: AssignmentNode):
         self.keyd_assignment.generate(node)
     def _generate_qornode(self, node: QorNode):
-        self.used_features.add("io")
         self.qor_generator.generate(node)
     def _generate_helnode(self, node: HelNode):
-        self.used_features.add("io")
         self.hel_generator.generate(node)
     def _generate_ifnode(self, node: IfNode):
         self.condition_generator.generate(node)
     
     def _generate_returnstatementnode(self, node): self.return_generator.generate(node)
     def _generate_arrayassignmentnode(self, node: ArrayAssignmentNode):
-        self.used_features.add("array")
         self.array_generator.generate_assignment(node)
     def _generate_dictionaryinitializationnode(self, node: DictionaryInitializationNode):
-        self.used_features.add("dictionary")
         self.dictionary_generator.generate_initialization(node)
     def _generate_dictionaryassignmentnode(self, node: DictionaryAssignmentNode):
-        self.used_features.add("dictionary")
         self.dictionary_generator.generate_assignment(node)
     def _generate_breaknode(self, node: BreakNode):
-        self.c_code += "    break;\n"
+        self.emitter.line("break;")
     def _generate_continuenode(self, node: ContinueNode):
-        self.c_code += "    continue;\n"
+        self.emitter.line("continue;")
     def _generate_embeddedcnode(self, node: EmbeddedCNode):
         self.embedded_c_chunks.append((node.code, node))
     def _generate_whilenode(self, node: WhileNode): self.loop_generator.generate_while(node)
@@ -0,0 +1,138 @@
+# c_emitter.py
+
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+# Sections larger than this are moved to a temporary file while generating,
+# so very large programs do not keep the whole C output in memory.
+DEFAULT_SPILL_THRESHOLD = 8 * 1024 * 1024
+
+INDENT = "    "
+
+
+class CodeSection:
+    """
+    Append-only buffer for one part of the generated C file.
+
+    Text is collected as a list of chunks and joined once at the end, so
+    emitting stays linear however many small pieces are written.
+    """
+
+    def __init__(self, spill_threshold=DEFAULT_SPILL_THRESHOLD):
+        self.chunks = []
+        self.size = 0
+        self.spill_threshold = spill_threshold
+        self._spill_file = None
+
+    def write(self, text):
+        self.chunks.append(text)
+        self.size += len(text)
+        if self.spill_threshold and self.size >= self.spill_threshold:
+            self._spill()
+
+    def _spill(self):
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self._spill_file.write("".join(self.chunks))
+        self.chunks = []
+        self.size = 0
+
+    def getvalue(self):
+        pending = "".join(self.chunks)
+        if self._spill_file is None:
+            return pending
+        self._spill_file.seek(0)
+        spilled = self._spill_file.read()
+        self._spill_file.seek(0, 2)
+        return spilled + pending
+
+    def iter_text(self, block_size=1024 * 1024):
+        """Yield the section's text in blocks of whole lines, without joining a spilled section in memory."""
+        if self._spill_file is not None:
+            self._spill_file.seek(0)
+            while True:
+                lines = self._spill_file.readlines(block_size)
+                if not lines:
+                    break
+                yield "".join(lines)
+            self._spill_file.seek(0, 2)
+        yield "".join(self.chunks)
+
+    def write_to(self, out):
+        """Copy the section to the file object `out` without joining it in memory."""
+        if self._spill_file is not None:
+            self._spill_file.seek(0)
+            shutil.copyfileobj(self._spill_file, out)
+            self._spill_file.seek(0, 2)
+        out.writelines(self.chunks)
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        self.chunks = []
+        self.size = 0
+
+
+class CEmitter:
+    """
+    Collects generated C in the sections of the final file: class structs,
+    function definitions and the body of `main`. Statements go to `body`,
+    which is `main` except while a function body is being captured.
+
+    With `split_modules` the function definitions are kept per `.tus`
+    module (`current_module`) so each module can become its own
+    translation unit; `prototypes` then declares them all for the header.
+    """
+
+    def __init__(self, spill_threshold=DEFAULT_SPILL_THRESHOLD, split_modules=False):
+        self.spill_threshold = spill_threshold
+        self.split_modules = split_modules
+        self.classes = CodeSection(spill_threshold)
+        self.functions = CodeSection(spill_threshold)
+        self.prototypes = CodeSection(spill_threshold)
+        self.module_functions = {}
+        self.current_module = None
+        self.main = CodeSection(spill_threshold)
+        self.body = self.main
+
+    def function(self, signature, code):
+        """Add a complete function definition whose C signature is `signature`."""
+        if not self.split_modules:
+            self.functions.write(code)
+            return
+        self.prototypes.write(f"{signature};\n")
+        section = self.module_functions.get(self.current_module)
+        if section is None:
+            section = self.module_functions[self.current_module] = CodeSection(self.spill_threshold)
+        section.write(code)
+
+    def emit(self, text):
+        """Append raw text (which carries its own indentation) to the current body."""
+        self.body.write(text)
+
+    def line(self, text=""):
+        """Append one statement line, indented like the rest of a body."""
+        self.body.write(f"{INDENT}{text}\n" if text else "\n")
+
+    @contextmanager
+    def capture(self):
+        """
+        Send statements to a fresh section for the duration of the block,
+        e.g. while generating a function body, then restore the previous one.
+        """
+        previous_body = self.body
+        self.body = section = CodeSection(spill_threshold=None)
+        try:
+            yield section
+        finally:
+            self.body = previous_body
+
+    def sections(self):
+        """Every section holding generated code (the prototypes only repeat the functions)."""
+        return (self.classes, self.functions, *self.module_functions.values(), self.main)
+
+    def close(self):
+        for section in (*self.sections(), self.prototypes):
+            section.close()
@@ -16,7 +16,7 @@ class ClassGenerator:
         Orchestrates the generation of all parts of a class.
         """
         # 1. Generate the C struct definition (e.g., struct Qof { ... };)
-        # This code is added to the `class_definitions` buffer.
+        # This code is added to the emitter's `classes` section.
         self._generate_struct_definition(node)
 
         # 2. Set the context to the current class. This is crucial for the
@@ -54,7 +54,7 @@ class ClassGenerator:
         struct_def += f"}};\n\n"
 
         # Add the complete struct definition to the dedicated buffer in the main generator
-        self.main_generator.class_definitions += struct_def
+        self.main_generator.emitter.classes.write(struct_def)
 
     def _generate_class_creator(self, node: ClassNode):
         """
@@ -93,11 +93,12 @@ class ClassGenerator:
         creator_body += "    return kan;\n"
 
         # Assemble the full creator function
+        creator_signature = f"{class_name}* {creator_func_name}({c_params})"
         creator_function = (
-            f"{class_name}* {creator_func_name}({c_params}) {{\n"
+            f"{creator_signature} {{\n"
             f"{creator_body}"
             f"}}\n\n"
         )
 
-        # Add the creator function to the global function definitions buffer
-        self.main_generator.function_definitions += creator_function
\ No newline at end of file
+        # Add the creator function to the emitter's function definitions
+        self.main_generator.emitter.function(creator_signature, creator_function)
\ No newline at end of file
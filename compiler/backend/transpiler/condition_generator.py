@@ -10,16 +10,16 @@ class ConditionGenerator:
         for condition, body in node.cases:
             keyword = "if" if is_first_case else "else if"
             condition_c = self.expr_generator.generate_expression(condition)
-            self.main_generator.c_code += f"    {keyword} ({condition_c}) {{\n"
+            self.main_generator.emit(f"    {keyword} ({condition_c}) {{\n")
             self.symbol_table.push_scope()
             self.main_generator._generate_node(body)
             self.symbol_table.pop_scope()
-            self.main_generator.c_code += f"    }}\n"
+            self.main_generator.emit(f"    }}\n")
             is_first_case = False
 
         if node.else_case:
-            self.main_generator.c_code += f"    else {{\n"
+            self.main_generator.emit(f"    else {{\n")
             self.symbol_table.push_scope()
             self.main_generator._generate_node(node.else_case)
             self.symbol_table.pop_scope()
-            self.main_generator.c_code += f"    }}\n"
\ No newline at end of file
+            self.main_generator.emit(f"    }}\n")
\ No newline at end of file
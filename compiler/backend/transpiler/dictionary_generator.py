@@ -12,12 +12,12 @@ class DictionaryGenerator:
 
     def generate_initialization(self, node: DictionaryInitializationNode):
         dict_var = self.code_generator.get_temp_var()
-        self.code_generator.c_code += f"    TusmoQaamuus* {dict_var} = tusmo_qaamuus_create();\n"
+        self.code_generator.emit(f"    TusmoQaamuus* {dict_var} = tusmo_qaamuus_create();\n")
 
         for key_node, value_node in node.pairs:
             key_c = self.expr_generator.generate_expression(key_node)
             value_c, value_type = self._generate_tusmo_value(value_node)
-            self.code_generator.c_code += f"    tusmo_qaamuus_set({dict_var}, {key_c}, {value_c});\n"
+            self.code_generator.emit(f"    tusmo_qaamuus_set({dict_var}, {key_c}, {value_c});\n")
         
         return dict_var
 
@@ -25,7 +25,7 @@ class DictionaryGenerator:
         dict_var_c = self.expr_generator.generate_expression(node.dictionary_access_node.dictionary_node)
         key_c = self.expr_generator.generate_expression(node.dictionary_access_node.key_node)
         value_c, _ = self._generate_tusmo_value(node.value_node)
-        self.code_generator.c_code += f"    tusmo_qaamuus_set({dict_var_c}, {key_c}, {value_c});\n"
+        self.code_generator.emit(f"    tusmo_qaamuus_set({dict_var_c}, {key_c}, {value_c});\n")
 
     def generate_access(self, node: DictionaryAccessNode):
         dict_var_c = self.expr_generator.generate_expression(node.dictionary_node)
@@ -5,10 +5,20 @@ from compiler.frontend.parser.ast_nodes import (
     CharNode, IdentifierNode, BinaryOpNode, FStringNode, BooleanNode,
     FunctionCallNode, ArrayAccessNode, ArrayTypeNode, MethodCallNode,
     ClassInstantiationNode, MemberAccessNode, ThisNode, WaalidNode, ArrayInitializationNode, ArrayTypeQueryNode,
-    ASTNode, CCallNode, DictionaryInitializationNode, FunctionTypeNode, NamedArgument, TypeLiteralNode
+    ASTNode, CCallNode, DictionaryInitializationNode, FunctionTypeNode, NamedArgument, TypeLiteralNode,
+    SliceNode
 )
+from compiler.midend.built_in_fn import eray_functions_
+
+
+# kala_jar/ku_dar/raadi/beddel map straight onto the memchr-based helpers in runtime/string.c.
+_ERAY_FUNCTION_C_NAMES = {
+    'kala_jar': 'tusmo_str_split',
+    'ku_dar': 'tusmo_str_join',
+    'raadi': 'tusmo_str_find',
+    'beddel': 'tusmo_str_replace',
+}
 
-from compiler.midend.built_in_fn import functions_ as built_in_functions
 
 class Cilad(Exception):
 
@@ -34,6 +44,9 @@ class ExpressionGenerator:
         elif isinstance(node, FloatNode):
             return str(node.value)
         elif isinstance(node, StringNode):
+            if node.owned:
+                # Literal-ku waa akhris-keliya; isku-darku wuxuu ahaa eray cusub oo la beddeli karo.
+                return f"tusmo_str_copy({self._escape_c_string_literal(node.value)})"
             return self._escape_c_string_literal(node.value)
         elif isinstance(node, CharNode):
             return f"'{node.value}'"
@@ -56,7 +69,6 @@ class ExpressionGenerator:
         elif isinstance(node, ArrayInitializationNode):
             return self._generate_array_initialization(node)
         elif isinstance(node, DictionaryInitializationNode):
-            self.main_generator.used_features.add("dictionary")
             return self.main_generator.dictionary_generator.generate_initialization(node)
 
         # Consolidated Access Logic for [...] syntax
@@ -68,19 +80,16 @@ class ExpressionGenerator:
 
             # Case 1: It's a direct dictionary variable. Generate a get() call.
             if str(base_type) == 'qaamuus':
-                self.main_generator.used_features.add("dictionary")
                 return f"tusmo_qaamuus_get({base_expr_c}, {index_c})"
 
             # Case 2: It's a value from a mixed array. Unwrap it, then do a get() call.
             elif str(base_type) == 'dynamic_value':
                 temp_var = self.main_generator.get_temp_var()
                 # Evaluate once so we can branch based on runtime type
-                self.main_generator.c_code += f"    TusmoValue {temp_var} = {base_expr_c};\n"
+                self.main_generator.emit(f"    TusmoValue {temp_var} = {base_expr_c};\n")
                 if str(index_type) == 'eray':
-                    self.main_generator.used_features.add("dictionary")
                     return f"tusmo_qaamuus_get({temp_var}.value.as_qaamuus, {index_c})"
                 else:
-                    self.main_generator.used_features.add("array")
                     return f"({temp_var}.value.as_tix->data[tusmo_bounds_check({index_c}, {temp_var}.value.as_tix->size)])"
 
             # Case 3: It's a string. Generate C string indexing.
@@ -91,6 +100,13 @@ class ExpressionGenerator:
             else:
                 return self.main_generator.array_generator.generate_access(node)
 
+        elif isinstance(node, SliceNode):
+            value_c = self.generate_expression(node.value_node)
+            start_c = self.generate_expression(node.start_expression) if node.start_expression is not None else "0"
+            if node.end_expression is None:
+                return f"tusmo_str_slice_from({value_c}, {start_c})"
+            return f"tusmo_str_slice({value_c}, {start_c}, {self.generate_expression(node.end_expression)})"
+
         elif isinstance(node, ClassInstantiationNode):
             return self._generate_class_instantiation(node)
         elif isinstance(node, MemberAccessNode):
@@ -147,7 +163,6 @@ class ExpressionGenerator:
             return self.main_generator.array_generator.generate_method_call(node)
         
         if str(object_type) == 'qaamuus':
-            self.main_generator.used_features.add("dictionary")
             object_c = self.generate_expression(node.object_node)
             args = self._unwrap_args(getattr(node, "ordered_args", None), node.args_list)
             
@@ -158,6 +173,11 @@ class ExpressionGenerator:
             if node.method_name == 'majiraa':
                 key_c = self.generate_expression(args[0])
                 return f"tusmo_qaamuus_has_key({object_c}, {key_c})"
+
+        if str(object_type) == 'xadhig' and node.method_name == 'gali':
+            value_node = self._unwrap_args(getattr(node, "ordered_args", None), node.args_list)[0]
+            value_type = str(self.get_expression_type(value_node))
+            return f"tusmo_xadhig_append_{value_type}({self.generate_expression(node.object_node)}, {self.generate_expression(value_node)})"
         object_c = self.generate_expression(node.object_node)
         
         # Use recorded source class for name mangling
@@ -196,21 +216,15 @@ class ExpressionGenerator:
         return f"{mangled_name}({', '.join(arg_exprs)})"
 
     def _generate_binary_op(self, node):
+        left_type = self.get_expression_type(node.left)
+        if node.op == '+' and str(left_type) == 'eray':
+            return self._generate_string_build(self._concat_operands(node))
         left_c = self.generate_expression(node.left)
         right_c = self.generate_expression(node.right)
-        left_type = self.get_expression_type(node.left)
         right_type = self.get_expression_type(node.right)
-        if node.op == '+' and str(left_type) == 'eray':
-            self.main_generator.used_features.add("string")
-            right_c_converted = self._ensure_string_operand(right_c, right_type)
-            return f"tusmo_concat_cstr({left_c}, {right_c_converted})"
         if node.op in ('==', '!=') and ('eray' in (str(left_type), str(right_type))):
-            self.main_generator.used_features.add("string")
-            cmp = f"strcmp({left_c}, {right_c})"
-            if node.op == '==':
-                return f"({cmp} == 0)"
-            else:
-                return f"({cmp} != 0)"
+            equal = f"tusmo_str_eq({left_c}, {right_c})"
+            return f"({equal})" if node.op == '==' else f"(!{equal})"
         op_map = {'+': '+', '-': '-', '*': '*', '/': '/', '%': '%',
                   'iyo': '&&', 'ama': '||', '==': '==', '!=': '!=',
                   '>': '>', '<': '<', '>=': '>=', '<=': '<='}
@@ -235,14 +249,11 @@ class ExpressionGenerator:
                 
                 # Case 1: Other side is a dynamic value
                 if other_type == "dynamic_value":
-                    self.main_generator.used_features.add("conversion")
-                    self.main_generator.used_features.add("string")
                     res = f'(strcmp(tusmo_type_of({other_c}), "{type_name}") == 0)'
                     return res if is_equal else f"(!{res})"
                 
                 # Case 2: Other side is already a string (e.g. nooc(x) == tiro)
                 elif other_type == "eray":
-                    self.main_generator.used_features.add("string")
                     res = f'(strcmp({other_c}, "{type_name}") == 0)'
                     return res if is_equal else f"(!{res})"
                 
@@ -278,49 +289,53 @@ class ExpressionGenerator:
         return f'"{s}"'
 
     def _generate_fstring(self, node: FStringNode):
-        self.main_generator.used_features.add("string")
-        segments = []
+        pieces = []
         for part_type, part_value in node.parts:
             if part_type == "text":
                 if part_value:
-                    segments.append(self._escape_c_string_literal(part_value))
+                    pieces.append(StringNode(part_value, line=node.line, filename=node.filename))
             elif part_type == "expr":
-                expr_node = part_value if isinstance(part_value, ASTNode) else StringNode(str(part_value), line=node.line, filename=node.filename)
-                expr_code = self.generate_expression(expr_node)
-                expr_type = self.get_expression_type(expr_node)
-                segments.append(self._ensure_string_operand(expr_code, expr_type))
-        if not segments:
+                pieces.append(part_value if isinstance(part_value, ASTNode) else StringNode(str(part_value), line=node.line, filename=node.filename))
+        return self._generate_string_build(pieces)
+
+    def _concat_operands(self, node):
+        """The operands of an `eray + ... + ...` chain, left to right."""
+        operands = []
+        while (isinstance(node, BinaryOpNode) and node.op == '+'
+               and str(self.get_expression_type(node.left)) == 'eray'):
+            operands.append(node.right)
+            node = node.left
+        operands.append(node)
+        operands.reverse()
+        return operands
+
+    def _generate_string_build(self, pieces):
+        """
+        One `tusmo_str_build` call for a whole concatenation or f-string: the
+        runtime sizes the result once and writes every piece (tiro, jajab,
+        xaraf and miyaa formatted in place) into a single allocation.
+        """
+        if not pieces:
             return '""'
-        result = segments[0]
-        for segment in segments[1:]:
-            result = f"tusmo_concat_cstr({result}, {segment})"
-        return result
+        values = []
+        for piece in pieces:
+            piece_c = self.generate_expression(piece)
+            piece_type = str(self.get_expression_type(piece))
+            if piece_type == 'xadhig':
+                piece_c, piece_type = f"tusmo_xadhig_eray({piece_c})", 'eray'
+            if piece_type not in ('eray', 'tiro', 'jajab', 'xaraf', 'miyaa'):
+                self._ensure_string_operand(piece_c, piece_type)  # Cilad: nooc aan qoraal loo beddeli karin.
+            if len(pieces) == 1 and piece_type == 'eray':
+                return piece_c
+            values.append(
+                f"{{.type = {self._get_tusmo_type_enum(piece_type)}, "
+                f".value.{self._get_union_member(piece_type)} = {piece_c}}}"
+            )
+        return f"tusmo_str_build({len(values)}, (TusmoValue[]){{{', '.join(values)}}})"
 
     def _generate_ccall(self, node):
-        '''Registering c call fn'''
+        '''A direct call into the C runtime (`___c__call_`).'''
         c_function_name = node.c_function_name
-        if c_function_name in ["tusmo_init_random", "tusmo_random_int", "tusmo_random_double"]:
-            self.main_generator.used_features.add("nasiib")
-        
-        elif "tusmo_time" in c_function_name or "tusmo_get" in c_function_name:
-            self.main_generator.used_features.add("wakhti")
-        
-        elif "tusmo_os" in c_function_name:
-            self.main_generator.used_features.add("os")
-            if c_function_name == "tusmo_os_list_dir":
-                self.main_generator.used_features.add("array")
-        elif "tusmo_http" in c_function_name:
-            self.main_generator.used_features.add("http")
-            if c_function_name == "tusmo_http_server_accept":
-                self.main_generator.used_features.add("dictionary")
-            if c_function_name == "tusmo_http_qaamuus_to_json":
-                self.main_generator.used_features.add("dictionary")
-        elif "tusmo_socket" in c_function_name:
-            self.main_generator.used_features.add("socket")
-        elif "tusmo_ws" in c_function_name:
-            self.main_generator.used_features.add("websocket")
-            self.main_generator.used_features.add("socket")  # WebSocket needs socket
-            self.main_generator.used_features.add("dictionary")  # For decode_frame result
         c_args = [self.generate_expression(arg) for arg in node.args]
 
         return f'{c_function_name}({", ".join(c_args)})'
@@ -330,13 +345,10 @@ class ExpressionGenerator:
         if expr_type_str == 'eray':
             return expr_code
         if expr_type_str == 'xaraf':
-            self.main_generator.used_features.add("string")
             return f'tusmo_str_format("%c", {expr_code})'
         if expr_type_str == 'tiro':
-            self.main_generator.used_features.add("string")
             return f'tusmo_str_format("%d", {expr_code})'
         if expr_type_str == 'jajab':
-            self.main_generator.used_features.add("string")
             return f'tusmo_str_format("%f", {expr_code})'
         if expr_type_str == 'miyaa':
             return f"(({expr_code}) ? \"run\" : \"been\")"
@@ -345,7 +357,6 @@ class ExpressionGenerator:
     def _generate_function_call(self, node: FunctionCallNode):
         # Handle Type Casting Functions
         if node.name in ["eray", "tiro", "jajab", "miyaa"]:
-            self.main_generator.used_features.add("conversion")
             args = self._unwrap_args(getattr(node, "ordered_args", None), node.params)
             if len(args) != 1:
                 raise Cilad(f"Khalad: Hawsha '{node.name}' waxay filaysaa 1 parameter, laakiin waxaa lasiiyay {len(args)}")
@@ -354,6 +365,9 @@ class ExpressionGenerator:
             arg_c = self.generate_expression(arg_node)
             arg_type = self.get_expression_type(arg_node)
 
+            if node.name == "eray" and str(arg_type) == "xadhig":
+                return f"tusmo_xadhig_eray({arg_c})"
+
             # If the argument is already a TusmoValue (dynamic array element), pass it straight through.
             if str(arg_type) == "dynamic_value":
                 c_func_name = f"tusmo_to_{node.name}"
@@ -361,26 +375,24 @@ class ExpressionGenerator:
 
             # Create a TusmoValue struct on the stack
             val_var = self.main_generator.get_temp_var()
-            self.main_generator.c_code += f"    TusmoValue {val_var};\n"
-            self.main_generator.c_code += f"    {val_var}.type = {self._get_tusmo_type_enum(arg_type)};\n"
-            self.main_generator.c_code += f"    {val_var}.value.{self._get_union_member(arg_type)} = {arg_c};\n"
+            self.main_generator.emit(f"    TusmoValue {val_var};\n")
+            self.main_generator.emit(f"    {val_var}.type = {self._get_tusmo_type_enum(arg_type)};\n")
+            self.main_generator.emit(f"    {val_var}.value.{self._get_union_member(arg_type)} = {arg_c};\n")
 
             c_func_name = f"tusmo_to_{node.name}"
             return f"{c_func_name}({val_var})"
 
-        if node.name in built_in_functions:
-            feature = built_in_functions[node.name].get("feature")
-            if feature:
-                self.main_generator.used_features.add(feature)
         if node.name == 'dherer':
             if len(node.params) != 1:
                 raise Cilad(f"Khalad: dherer Waxa uu filayaa kaliya 1 parameter, laakiin waxaa lasiiyay {len(node.params)} ")
             arg_expr = self.generate_expression(node.params[0])
             arg_type = self.main_generator.semantic_checker.get_expression_type(node.params[0], skip_context_check=True)
             if str(arg_type) == 'eray':
-                return f"strlen({arg_expr})"
+                return f"tusmo_str_len({arg_expr})"
             elif isinstance(arg_type, ArrayTypeNode):
                 return f"{arg_expr}->size"
+            elif str(arg_type) == 'xadhig':
+                return f"{arg_expr}->length"
             else:
                 raise Cilad(f"Generator Error: dherer does not support type {arg_type}")
         if node.name == 'nooc':
@@ -392,26 +404,25 @@ class ExpressionGenerator:
                 base_type = self.main_generator.semantic_checker.get_expression_type(arg_node, skip_context_check=True)
                 if not isinstance(base_type, ArrayTypeNode):
                     raise Cilad("Generator Error: nooc(arr[]) requires a tix variable.")
-                self.main_generator.used_features.add("array")
                 elem_type = base_type.element_type
                 type_str = "tix:dynamic" if elem_type is None else f"tix:{elem_type}"
                 return f'"{type_str}"'
 
             arg_type = self.main_generator.semantic_checker.get_expression_type(arg_node, skip_context_check=True)
-            if isinstance(arg_type, ArrayTypeNode):
-                self.main_generator.used_features.add("array")
             # If it's a mixed-array element (dynamic_value), ask the runtime for the actual tag.
             if str(arg_type) == "dynamic_value":
-                self.main_generator.used_features.add("conversion")
                 arg_expr = self.generate_expression(arg_node)
                 return f"tusmo_type_of({arg_expr})"
             type_str = str(arg_type)
             return f'"{type_str}"'
+        if node.name == 'xadhig' and not self.symbol_table.get(node.name):
+            return f"tusmo_xadhig_create({self.generate_expression(node.params[0])})"
         if node.name == 'tix_cayiman':
-            self.main_generator.used_features.add("array")
             raise Cilad("Generator Error: tix_cayiman can only be used in variable declarations or assignments.")
         
         func_info = self.symbol_table.get(node.name)
+        if node.name in eray_functions_ and not func_info:
+            return self._generate_eray_function(node)
         if not func_info:
             # This should have been caught by the semantic analyzer, but as a safeguard:
             raise Cilad(f"hawashan '{node.name}' Ma ahan mid jirta.")
@@ -445,6 +456,13 @@ class ExpressionGenerator:
             c_func_name = node.name
             return f"{c_func_name}({', '.join(arg_exprs)})"
 
+    def _generate_eray_function(self, node: FunctionCallNode):
+        c_function_name = _ERAY_FUNCTION_C_NAMES[node.name]
+        arg_exprs = [self.generate_expression(arg) for arg in node.params]
+        if node.name == 'raadi' and len(arg_exprs) == 2:
+            arg_exprs.append("0")
+        return f"{c_function_name}({', '.join(arg_exprs)})"
+
     def _get_tusmo_type_enum(self, type_str):
         type_map = {
             "tiro": "TUSMO_TIRO",
@@ -52,8 +52,8 @@ class FunctionGenerator:
         function_signature = f"{c_return_type} {c_func_name}({c_params})"
 
         # --- Generate the function body ---
-        # We temporarily hijack the main generator's C code buffer to generate
-        # the body for this function, then restore it.
+        # The body is captured into its own section of the emitter while it is
+        # generated, then the previous body is restored.
         self.symbol_table.push_scope()
 
         # Add parameters to the symbol table for the scope of this function's body
@@ -62,16 +62,14 @@ class FunctionGenerator:
         for param in node.params:
             self.symbol_table.set(param.name, param.param_type)
 
-        original_c_code_buffer = self.main_generator.c_code
-        self.main_generator.c_code = ""  # Clear buffer for this function's body
-        self.main_generator._generate_node(node.body)
-        function_body_code = self.main_generator.c_code
-        self.main_generator.c_code = original_c_code_buffer # Restore original buffer
+        with self.main_generator.emitter.capture() as body_section:
+            self.main_generator._generate_node(node.body)
+        function_body_code = body_section.getvalue()
 
         self.symbol_table.pop_scope()
 
         # --- Assemble and store the final function code ---
         full_function_code = f"{function_signature} {{\n{function_body_code}}}\n\n"
 
-        # Add the complete C function to the dedicated `function_definitions` buffer
-        self.main_generator.function_definitions += full_function_code
\ No newline at end of file
+        # Add the complete C function to the emitter's function definitions
+        self.main_generator.emitter.function(function_signature, full_function_code)
\ No newline at end of file
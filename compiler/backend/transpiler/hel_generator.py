@@ -14,14 +14,14 @@ class HelGenerator:
 
         
         if varInfo[1] == "eray": 
-            self.main_generator.c_code += f'    {var_name} = hel_str();\n'
+            self.main_generator.emit(f'    {var_name} = hel_str();\n')
 
         
         if varInfo[1] == "tiro": 
-            self.main_generator.c_code += f'    scanf("%d", &{var_name});\n'
-            self.main_generator.c_code += f'    {{ int c; while((c = getchar()) != \'\\n\' && c != EOF); }}\n'
+            self.main_generator.emit(f'    scanf("%d", &{var_name});\n')
+            self.main_generator.emit(f'    {{ int c; while((c = getchar()) != \'\\n\' && c != EOF); }}\n')
 
         
         if varInfo[1] == "jajab": 
-            self.main_generator.c_code += f'    scanf("%lf", &{var_name});\n'
-            self.main_generator.c_code += f'    {{ int c; while((c = getchar()) != \'\\n\' && c != EOF); }}\n'
\ No newline at end of file
+            self.main_generator.emit(f'    scanf("%lf", &{var_name});\n')
+            self.main_generator.emit(f'    {{ int c; while((c = getchar()) != \'\\n\' && c != EOF); }}\n')
\ No newline at end of file
@@ -1,4 +1,4 @@
-from compiler.frontend.parser.ast_nodes import ArrayTypeNode, ArrayAccessNode
+from compiler.frontend.parser.ast_nodes import ArrayTypeNode, ArrayAccessNode, IdentifierNode, MemberAccessNode
 
 
 class Keyd_Assignment_Generator:
@@ -21,7 +21,24 @@ class Keyd_Assignment_Generator:
                  # Use dictionary generator helper to wrap value in TusmoValue
                  value_c, _ = self.main_generator.dictionary_generator._generate_tusmo_value(right_expr_node)
                  
-                 self.main_generator.c_code += f"    tusmo_qaamuus_set({dict_c}, {key_c}, {value_c});\n"
+                 self.main_generator.emit(f"    tusmo_qaamuus_set({dict_c}, {key_c}, {value_c});\n")
+                 return
+             if str(base_type) == 'eray':
+                 # The runtime copies a literal (or an interior pointer) before writing to it
+                 # and returns the buffer it wrote, which is stored back in the variable.
+                 string_node = left_expr_node.array_name_node
+                 string_c = self.expr_generator.generate_expression(string_node)
+                 index_c = self.expr_generator.generate_expression(left_expr_node.index_expression)
+                 value_c = self.expr_generator.generate_expression(right_expr_node)
+                 if isinstance(string_node, IdentifierNode):
+                     self.main_generator.emit(f"    {string_c} = tusmo_str_set_xaraf({string_c}, {index_c}, {value_c});\n")
+                 elif isinstance(string_node, (MemberAccessNode, ArrayAccessNode)):
+                     # Evaluate the member/element once and write the result back through it.
+                     slot = self.main_generator.get_temp_var()
+                     self.main_generator.emit(f"    char** {slot} = &({string_c});\n")
+                     self.main_generator.emit(f"    *{slot} = tusmo_str_set_xaraf(*{slot}, {index_c}, {value_c});\n")
+                 else:
+                     self.main_generator.emit(f"    tusmo_str_set_xaraf({string_c}, {index_c}, {value_c});\n")
                  return
 
         left_c_code = self.expr_generator.generate_expression(left_expr_node)
@@ -48,7 +65,7 @@ class Keyd_Assignment_Generator:
                 element_type_str = str(element_type)
                 init_c = f"tusmo_hp_tix_{element_type_str}_create({size_expr})"
             
-            self.main_generator.c_code += f"    {left_c_code} = {init_c};\n"
+            self.main_generator.emit(f"    {left_c_code} = {init_c};\n")
 
         else:
             right_c_code = self.expr_generator.generate_expression(right_expr_node)
@@ -72,6 +89,6 @@ class Keyd_Assignment_Generator:
 
             if str(left_side_type) == "eray" and op == "+=":
                 right_c_converted = self.expr_generator._ensure_string_operand(right_c_code, right_side_type)
-                self.main_generator.c_code += f"    {left_c_code} = tusmo_concat_cstr({left_c_code}, {right_c_converted});\n"
+                self.main_generator.emit(f"    {left_c_code} = tusmo_concat_cstr({left_c_code}, {right_c_converted});\n")
             else:
-                self.main_generator.c_code += f"    {left_c_code} {op} {right_c_code};\n"
+                self.main_generator.emit(f"    {left_c_code} {op} {right_c_code};\n")
@@ -17,13 +17,17 @@ class KeydGenerator:
 
         # Handle qaamuus type
         if str(var_type) == "qaamuus":
-            self.main_generator.used_features.add("dictionary")
             c_type = "TusmoQaamuus*"
             if value:
                 init_c = self.expr_generator.generate_expression(value)
-                self.main_generator.c_code += f"    {c_type} {var_name} = {init_c};\n"
+                self.main_generator.emit(f"    {c_type} {var_name} = {init_c};\n")
             else:
-                self.main_generator.c_code += f"    {c_type} {var_name} = tusmo_qaamuus_create();\n"
+                self.main_generator.emit(f"    {c_type} {var_name} = tusmo_qaamuus_create();\n")
+            return
+        # Handle xadhig (string builder) type
+        if str(var_type) == "xadhig":
+            init_c = self.expr_generator.generate_expression(value) if value else "tusmo_xadhig_create(0)"
+            self.main_generator.emit(f"    TusmoXadhig* {var_name} = {init_c};\n")
             return
         # Handle array types
         if isinstance(var_type, ArrayTypeNode):
@@ -50,19 +54,19 @@ class KeydGenerator:
                         element_type_str = str(element_type)
                         init_c = f"tusmo_hp_tix_{element_type_str}_create({size_expr})"
                     
-                    self.main_generator.c_code += f"    {c_type} {var_name} = {init_c};\n"
+                    self.main_generator.emit(f"    {c_type} {var_name} = {init_c};\n")
                 # Check if it's an array initialization
                 elif hasattr(value, '__class__') and value.__class__.__name__ == 'ArrayInitializationNode':
                     # Use the declared type instead of inferred type for empty arrays
                     init_c = self.main_generator.array_generator._generate_recursive_initializer(var_type, value.elements)
-                    self.main_generator.c_code += f"    {c_type} {var_name} = {init_c};\n"
+                    self.main_generator.emit(f"    {c_type} {var_name} = {init_c};\n")
                 else:
                     # Other initializations
                     init_c = self.expr_generator.generate_expression(value)
-                    self.main_generator.c_code += f"    {c_type} {var_name} = {init_c};\n"
+                    self.main_generator.emit(f"    {c_type} {var_name} = {init_c};\n")
             else:
                 # Array without initialization - set to NULL
-                self.main_generator.c_code += f"    {c_type} {var_name} = NULL;\n"
+                self.main_generator.emit(f"    {c_type} {var_name} = NULL;\n")
         # Handle class types
         elif isinstance(var_type, str):
             type_info = self.symbol_table.get(var_type)
@@ -73,9 +77,9 @@ class KeydGenerator:
                 c_type = f"{var_type}*"
                 if value:
                     init_c = self.expr_generator.generate_expression(value)
-                    self.main_generator.c_code += f"    {c_type} {var_name} = {init_c};\n"
+                    self.main_generator.emit(f"    {c_type} {var_name} = {init_c};\n")
                 else:
-                    self.main_generator.c_code += f"    {c_type} {var_name} = NULL;\n"
+                    self.main_generator.emit(f"    {c_type} {var_name} = NULL;\n")
             else:
                 # Primitive type
                 if value:
@@ -97,7 +101,7 @@ class KeydGenerator:
                         member = unwrap_map.get(str(var_type))
                         if member:
                             init_c = f"({init_c}).value.{member}"
-                    self.main_generator.c_code += f"    {var_name} = {init_c};\n"
+                    self.main_generator.emit(f"    {var_name} = {init_c};\n")
                 else:
                     # Declaration without initialization - use defaults
                     self.generate_declaration_only(var_name, var_type)
@@ -106,29 +110,29 @@ class KeydGenerator:
     def generate_declaration_only(self, var_name, var_type):
         """Generates only the C declaration line for a primitive variable."""
         if var_type == "tiro":
-            self.main_generator.c_code += f"    int {var_name};\n"
+            self.main_generator.emit(f"    int {var_name};\n")
         elif var_type == "jajab":
-            self.main_generator.c_code += f"    double {var_name};\n"
+            self.main_generator.emit(f"    double {var_name};\n")
         elif var_type == "xaraf":
-            self.main_generator.c_code += f"    char {var_name};\n"
+            self.main_generator.emit(f"    char {var_name};\n")
         elif var_type == "miyaa":
-            self.main_generator.c_code += f"    bool {var_name};\n"
+            self.main_generator.emit(f"    bool {var_name};\n")
         elif var_type == "eray":
-            self.main_generator.c_code += f"    char* {var_name};\n"
+            self.main_generator.emit(f"    char* {var_name};\n")
         elif var_type == "waxbo":
-            self.main_generator.c_code += f"    void* {var_name};\n"
+            self.main_generator.emit(f"    void* {var_name};\n")
 
     def generate_default_init(self, var_name, var_type):
         """Generates an assignment to a default value if no initializer was provided."""
         if var_type == "tiro":
-            self.main_generator.c_code += f"    {var_name} = 0;\n"
+            self.main_generator.emit(f"    {var_name} = 0;\n")
         elif var_type == "jajab":
-            self.main_generator.c_code += f"    {var_name} = 0.0;\n"
+            self.main_generator.emit(f"    {var_name} = 0.0;\n")
         elif var_type == "xaraf":
-            self.main_generator.c_code += f"    {var_name} = '\\0';\n"
+            self.main_generator.emit(f"    {var_name} = '\\0';\n")
         elif var_type == "miyaa":
-            self.main_generator.c_code += f"    {var_name} = false;\n"
+            self.main_generator.emit(f"    {var_name} = false;\n")
         elif var_type == "eray":
-            self.main_generator.c_code += f"    {var_name} = NULL;\n"
+            self.main_generator.emit(f"    {var_name} = NULL;\n")
         elif var_type == "waxbo":
-            self.main_generator.c_code += f"    {var_name} = NULL;\n"
+            self.main_generator.emit(f"    {var_name} = NULL;\n")
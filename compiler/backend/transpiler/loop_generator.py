@@ -10,19 +10,19 @@ class LoopGenerator:
 
     def generate_while(self, node: WhileNode):
         condition_c = self.expr_generator.generate_expression(node.condition)
-        self.main_generator.c_code += f"    while ({condition_c}) {{\n"
+        self.main_generator.emit(f"    while ({condition_c}) {{\n")
         self.symbol_table.push_scope()
         self.main_generator._generate_node(node.body)
         self.symbol_table.pop_scope()
-        self.main_generator.c_code += f"    }}\n"
+        self.main_generator.emit(f"    }}\n")
 
     def generate_do_while(self, node: DoWhileNode):
-        self.main_generator.c_code += f"    do {{\n"
+        self.main_generator.emit(f"    do {{\n")
         self.symbol_table.push_scope()
         self.main_generator._generate_node(node.body)
         self.symbol_table.pop_scope()
         condition_c = self.expr_generator.generate_expression(node.condition)
-        self.main_generator.c_code += f"    }} while ({condition_c});\n"
+        self.main_generator.emit(f"    }} while ({condition_c});\n")
 
     def generate_for_range(self, node: ForRangeNode):
         iterator = node.iterator_var_name
@@ -32,9 +32,9 @@ class LoopGenerator:
         self.symbol_table.push_scope()
         self.symbol_table.set(iterator, 'tiro')
 
-        self.main_generator.c_code += f"    for (int {iterator} = {start_c}; {iterator} < {end_c}; ++{iterator}) {{\n"
+        self.main_generator.emit(f"    for (int {iterator} = {start_c}; {iterator} < {end_c}; ++{iterator}) {{\n")
         self.main_generator._generate_node(node.body)
-        self.main_generator.c_code += f"    }}\n"
+        self.main_generator.emit(f"    }}\n")
 
         self.symbol_table.pop_scope()
 
@@ -47,36 +47,36 @@ class LoopGenerator:
 
         if str(array_type) == 'eray':
             length_var = self.main_generator.get_temp_var()
-            self.main_generator.c_code += f"    int {length_var} = strlen({array_c});\n"
+            self.main_generator.emit(f"    int {length_var} = tusmo_str_len({array_c});\n")
             index_var = self.main_generator.get_temp_var()
-            self.main_generator.c_code += f"    for (int {index_var} = 0; {index_var} < {length_var}; ++{index_var}) {{\n"
+            self.main_generator.emit(f"    for (int {index_var} = 0; {index_var} < {length_var}; ++{index_var}) {{\n")
             self.symbol_table.set(item_var, 'xaraf')
-            self.main_generator.c_code += f"        char {item_var} = {array_c}[{index_var}];\n"
+            self.main_generator.emit(f"        char {item_var} = {array_c}[{index_var}];\n")
             self.main_generator._generate_node(node.body)
-            self.main_generator.c_code += "    }\n"
+            self.main_generator.emit("    }\n")
 
         else: # It's a Tusmo array type
             index_var = self.main_generator.get_temp_var() + "_i"
-            self.main_generator.c_code += f"    for (size_t {index_var} = 0; {index_var} < {array_c}->size; ++{index_var}) {{\n"
+            self.main_generator.emit(f"    for (size_t {index_var} = 0; {index_var} < {array_c}->size; ++{index_var}) {{\n")
             
             element_tusmo_type = array_type.element_type
             
             if element_tusmo_type is None:
                 iterator_c_type = "TusmoValue"
                 self.symbol_table.set(item_var, 'dynamic_value')
-                self.main_generator.c_code += f"        {iterator_c_type} {item_var} = {array_c}->data[{index_var}];\n"
+                self.main_generator.emit(f"        {iterator_c_type} {item_var} = {array_c}->data[{index_var}];\n")
             
             elif isinstance(element_tusmo_type, ArrayTypeNode):
                 iterator_c_type = self.main_generator.array_generator.get_c_type_from_tusmo_type(element_tusmo_type)
                 self.symbol_table.set(item_var, element_tusmo_type)
-                self.main_generator.c_code += f"        {iterator_c_type} {item_var} = ({iterator_c_type})({array_c}->data[{index_var}]);\n"
+                self.main_generator.emit(f"        {iterator_c_type} {item_var} = ({iterator_c_type})({array_c}->data[{index_var}]);\n")
 
             else:
                 iterator_c_type = self.main_generator.array_generator.get_c_type_map().get(str(element_tusmo_type))
                 self.symbol_table.set(item_var, str(element_tusmo_type))
-                self.main_generator.c_code += f"        {iterator_c_type} {item_var} = {array_c}->data[{index_var}];\n"
+                self.main_generator.emit(f"        {iterator_c_type} {item_var} = {array_c}->data[{index_var}];\n")
 
             self.main_generator._generate_node(node.body)
-            self.main_generator.c_code += f"    }}\n"
+            self.main_generator.emit(f"    }}\n")
 
         self.symbol_table.pop_scope()
\ No newline at end of file
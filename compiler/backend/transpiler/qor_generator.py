@@ -65,8 +65,8 @@ class QorGenerator:
             # Build format string and arguments
             fmt = "".join(format_parts)
             args = ", ".join(arg_parts)
-            self.main_generator.c_code += f'    printf("{fmt}"{", " + args if args else ""} \n);\n'
-            self.main_generator.c_code += "    fflush(stdout);\n"
+            self.main_generator.emit(f'    printf("{fmt}"{", " + args if args else ""} \n);\n')
+            self.main_generator.emit("    fflush(stdout);\n")
 
             # Reset batch
             format_parts = []
@@ -80,8 +80,8 @@ class QorGenerator:
                 key_c = self.expr_generator.generate_expression(expr.key_node)
                 unwrapped_dict = f"({array_access_c}).value.as_qaamuus"
                 get_call = f"tusmo_qaamuus_get({unwrapped_dict}, {key_c})"
-                self.main_generator.c_code += f'    tusmo_qor_dynamic_value({get_call});\n'
-                self.main_generator.c_code += "    fflush(stdout);\n"
+                self.main_generator.emit(f'    tusmo_qor_dynamic_value({get_call});\n')
+                self.main_generator.emit("    fflush(stdout);\n")
                 continue
 
             # Get the type using enhanced detection
@@ -91,13 +91,12 @@ class QorGenerator:
             # --- Handle complex types that need their own print function ---
             if expr_type_str.startswith("tix"):
                 flush_printf_batch()
-                self.main_generator.c_code += f'    prints({c_expr});\n'
-                self.main_generator.c_code += "    fflush(stdout);\n"
+                self.main_generator.emit(f'    prints({c_expr});\n')
+                self.main_generator.emit("    fflush(stdout);\n")
             elif expr_type_str == "qaamuus":
                 flush_printf_batch()
-                self.main_generator.used_features.add("dictionary")
-                self.main_generator.c_code += f'    tusmo_qaamuus_print({c_expr});\n'
-                self.main_generator.c_code += "    fflush(stdout);\n"
+                self.main_generator.emit(f'    tusmo_qaamuus_print({c_expr});\n')
+                self.main_generator.emit("    fflush(stdout);\n")
 
             # --- Handle simple types that can be batched into one printf call ---
             elif expr_type_str == "tiro":
@@ -115,19 +114,22 @@ class QorGenerator:
             elif expr_type_str == "miyaa":
                 format_parts.append("%s")
                 arg_parts.append(f'({c_expr} ? "run" : "been")')
+            elif expr_type_str == "xadhig":
+                format_parts.append("%s")
+                arg_parts.append(f"tusmo_xadhig_eray({c_expr})")
             elif expr_type_str == "dynamic_value":
                 # This is a TusmoValue from a mixed array - call the special function
                 flush_printf_batch()
-                self.main_generator.c_code += f'    tusmo_qor_dynamic_value({c_expr});\n'
-                self.main_generator.c_code += "    fflush(stdout);\n"
+                self.main_generator.emit(f'    tusmo_qor_dynamic_value({c_expr});\n')
+                self.main_generator.emit("    fflush(stdout);\n")
             else:
                 # Unknown type - try to call tusmo_qor_dynamic_value as fallback
                 flush_printf_batch()
-                self.main_generator.c_code += f'    tusmo_qor_dynamic_value({c_expr});\n'
-                self.main_generator.c_code += "    fflush(stdout);\n"
+                self.main_generator.emit(f'    tusmo_qor_dynamic_value({c_expr});\n')
+                self.main_generator.emit("    fflush(stdout);\n")
 
         # After processing all expressions, flush any remaining batch
         flush_printf_batch()
         if node.expressions:
-            self.main_generator.c_code += '    printf("\\n");\n'
-            self.main_generator.c_code += "    fflush(stdout);\n"
+            self.main_generator.emit('    printf("\\n");\n')
+            self.main_generator.emit("    fflush(stdout);\n")
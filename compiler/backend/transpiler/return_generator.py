@@ -8,6 +8,6 @@ class ReturnGenerator:
         expression_node = node.expression
         if expression_node:
             expr_c_code = self.expr_generator.generate_expression(expression_node)
-            self.main_generator.c_code += f"    return {expr_c_code};\n"
+            self.main_generator.emit(f"    return {expr_c_code};\n")
         else:
-            self.main_generator.c_code += "    return;\n"
\ No newline at end of file
+            self.main_generator.emit("    return;\n")
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+Batch builds: many Tusmo programs in one `tusmo.py` invocation.
+
+    python tusmo.py a.tus b.tus examples/ -j 8
+
+1. Every program and every module it `keen`s is parsed once, in parallel,
+   and kept in memory; programs that import the same module share it.
+2. The front and middle end (imports, prepare, tree shaking, semantic
+   check, constant folding, codegen) run per program in a process pool
+   forked after step 1, so the workers start with the shared module ASTs
+   already loaded.
+3. The runtime objects all programs need are compiled once, then the C
+   compiler is run for the programs in parallel.
+
+Results are reported per program; the exit status is 1 when any failed.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import io
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+
+from compiler.ast_cache import module_ast_cache
+from compiler.backend.transpiler import Transpiler
+from compiler.build_cache import BuildCache, runtime_fingerprint, toolchain_key
+from compiler.midend.ast_prepare import prepare_ast
+from compiler.midend.constant_fold import fold_constants
+from compiler.midend.semanticanalyzer import SemanticChecker, SemanticError
+from compiler.midend.symbol_table import SymbolTable
+from compiler.midend.tree_shake import shake_tree
+from compiler.processer import default_jobs, load_module_ast, preparse_imports, preparse_modules, process_imports
+from compiler.runtime_cache import compile_runtime_objects
+from compiler.toolchain import (
+    RUNTIME_DIR, STDLIB_DIR, BuildProfile, get_profile, link_command, runtime_sources, toolchain,
+)
+
+
+@dataclass
+class ProgramResult:
+    """Outcome of building one entry file."""
+
+    source: str
+    ok: bool = False
+    cached: bool = False
+    linked: bool = False
+    output: str = ""
+    runtime_symbols: set[str] = field(default_factory=set)
+    imported_files: list[str] | None = None
+    frontend_seconds: float = 0.0
+    cc_seconds: float = 0.0
+
+    @property
+    def c_file(self) -> str:
+        return self.source.replace(".tus", ".c")
+
+    @property
+    def binary(self) -> str:
+        return self.c_file.replace(".c", "")
+
+
+def collect_entry_files(inputs: list[str]) -> list[str]:
+    """Expand directories to the `.tus` files directly inside them, keeping order and dropping duplicates."""
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith(".tus")
+            ))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(os.path.abspath(path) for path in files))
+
+
+def _pool_context():
+    # Fork lets the workers inherit the module ASTs parsed in step 1; where
+    # fork is unavailable they fall back to the on-disk AST cache.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def _translate(source: str) -> ProgramResult:
+    """Front and middle end for one program: writes its `.c` file. Runs in a pool worker."""
+    result = ProgramResult(source)
+    started = time.perf_counter()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            initial_ast = load_module_ast(source)
+            if initial_ast:
+                base_directory = os.path.dirname(source)
+                imported_files = set()
+                parsed_modules = preparse_imports(initial_ast, base_directory, STDLIB_DIR, jobs=1)
+                final_ast = process_imports(
+                    initial_ast, base_directory, STDLIB_DIR, imported_files, parsed_modules
+                )
+                prepare_ast(final_ast)
+                shake_tree(final_ast, roots=initial_ast)
+                symbol_table = SymbolTable()
+                checker = SemanticChecker(symbol_table)
+                checker.check(final_ast)
+                fold_constants(final_ast)
+                with open(result.c_file, "w") as f:
+                    result.runtime_symbols = set(Transpiler(symbol_table, checker).transpile_to(final_ast, f))
+                result.imported_files = sorted(imported_files)
+                result.ok = True
+            else:
+                print("Barnaamijku waa madhan yahay.")
+        except SemanticError as e:
+            print(f"\n{e}")
+        except SystemExit:
+            pass  # Ciladda waa la daabacay (tusaale: khalad naxwe).
+        except Exception:
+            print("\nCilad Lama Filaan Ah Ayaa Dhacday:")
+            traceback.print_exc(file=sys.stdout)
+    result.output = output.getvalue()
+    result.frontend_seconds = time.perf_counter() - started
+    return result
+
+
+def compile_batch(inputs: list[str], jobs: int | None = None, keep_c: bool = False,
+                  profile: BuildProfile | None = None) -> int:
+    jobs = jobs or default_jobs()
+    profile = profile or get_profile()
+    c_flags = list(profile.c_flags)
+    sources = collect_entry_files(inputs)
+    results = {source: ProgramResult(source) for source in sources}
+
+    cc, include_dir, lib_dir_override = toolchain()
+    use_cache = not os.environ.get("TUSMO_NO_CACHE")
+    build_cache = BuildCache() if use_cache else None
+    build_toolchain = toolchain_key(
+        cc, c_flags, [include_dir, lib_dir_override or "", runtime_fingerprint(RUNTIME_DIR)]
+    ) if use_cache else None
+
+    pending = []
+    for source in sources:
+        result = results[source]
+        if not os.path.exists(source):
+            result.output = f"Cilad: Faylka '{source}' ma jiro.\n"
+            continue
+        cached = build_cache.lookup(source) if build_cache else None
+        if cached is None:
+            pending.append(source)
+            continue
+        result.ok = result.cached = True
+        result.runtime_symbols = cached["runtime_symbols"]
+        if not keep_c and build_cache.fetch_binary(source, build_toolchain, result.binary):
+            result.linked = True
+            continue
+        with open(result.c_file, "w") as f:
+            f.write(cached["c_code"])
+
+    # 1. Parse the programs and all the modules they import, each exactly once.
+    module_ast_cache.keep_in_memory = True
+    for path, ast in preparse_modules(pending, STDLIB_DIR, jobs).items():
+        module_ast_cache.remember(path, ast)
+
+    # 2. Front and middle end, one program per worker task.
+    if len(pending) > 1 and jobs > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(jobs, len(pending)), mp_context=_pool_context()
+        ) as pool:
+            for translated in pool.map(_translate, pending):
+                results[translated.source] = translated
+    else:
+        for source in pending:
+            results[source] = _translate(source)
+
+    # 3. Shared runtime objects, then every program's C compile in parallel.
+    to_link = [r for r in results.values() if r.ok and not r.linked and os.path.exists(r.c_file)]
+    needed = list(dict.fromkeys(path for r in to_link for path in runtime_sources(r.runtime_symbols)))
+    objects = {}
+    if needed and use_cache:
+        compiled = compile_runtime_objects(cc, c_flags, needed, [include_dir], RUNTIME_DIR, jobs=jobs)
+        objects = dict(zip(needed, compiled or []))
+
+    def link(result: ProgramResult) -> None:
+        sources = [result.c_file, *(objects.get(path, path) for path in runtime_sources(result.runtime_symbols))]
+        command = link_command(cc, c_flags, result.binary, sources, include_dir, lib_dir_override)
+        started = time.perf_counter()
+        completed = subprocess.run(command, capture_output=True, text=True)
+        result.cc_seconds = time.perf_counter() - started
+        result.output += completed.stdout + completed.stderr
+        if completed.returncode != 0:
+            result.ok = False
+            result.output += f"\nCilad ayaa ka dhacday isku-darka C code-ka. Faylka C wuxuu ku yaal: {result.c_file}\n"
+            return
+        result.linked = True
+        if build_cache:
+            if result.imported_files is not None:
+                build_cache.store(result.source, [result.source, *result.imported_files],
+                                  result.c_file, result.runtime_symbols)
+            build_cache.store_binary(result.source, build_toolchain, result.binary)
+        if not keep_c:
+            os.remove(result.c_file)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(link, to_link))
+
+    return report(list(results.values()))
+
+
+def report(results: list[ProgramResult]) -> int:
+    """Print one line per program (and its messages); return the exit status."""
+    for result in results:
+        if not result.ok:
+            status = "FASHIL"
+        elif result.cached and not result.cc_seconds:
+            status = "KAYD"
+        else:
+            status = "OK"
+        timing = f"  ({result.frontend_seconds:.2f}s + cc {result.cc_seconds:.2f}s)" if result.ok and not result.cached else ""
+        print(f"[{status:<6}] {os.path.relpath(result.source)}{timing}")
+        if result.output.strip():
+            for line in result.output.strip("\n").splitlines():
+                print(f"    {line}")
+    failed = sum(1 for result in results if not result.ok)
+    print(f"\n{len(results) - failed}/{len(results)} barnaamij ayaa guulaystay.")
+    return 1 if failed else 0
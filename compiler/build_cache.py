@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Iterable
+
+from compiler.runtime_cache import compiler_identity, default_cache_dir
+
+_COMPILER_ROOT = os.path.dirname(os.path.abspath(__file__))
+_compiler_fingerprint: str | None = None
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def compiler_fingerprint() -> str:
+    """
+    Identifies the compiler itself: any edit to the compiler sources
+    invalidates every cached program.
+    """
+    global _compiler_fingerprint
+    if _compiler_fingerprint is None:
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(_COMPILER_ROOT):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            for name in sorted(files):
+                if name.endswith(".py") and not name.startswith(("parsetab", "lextab")):
+                    path = os.path.join(root, name)
+                    digest.update(os.path.relpath(path, _COMPILER_ROOT).encode())
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+        _compiler_fingerprint = digest.hexdigest()
+    return _compiler_fingerprint
+
+
+def runtime_fingerprint(runtime_dir: str) -> str:
+    """Hash of the C runtime, so a runtime change relinks every cached program."""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(runtime_dir)):
+        if name.endswith((".c", ".h")):
+            digest.update(name.encode())
+            with open(os.path.join(runtime_dir, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def toolchain_key(cc: str, flags: Iterable[str], extra: Iterable[str] = ()) -> str:
+    """Key for linked binaries: the C compiler's identity (not its name), its flags and `extra`."""
+    digest = hashlib.sha256()
+    for part in (compiler_identity(cc), *flags, *extra):
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:24]
+
+
+class BuildCache:
+    """
+    Content-addressed cache of whole Tusmo programs.
+
+    Every entry file gets its own directory holding the generated C and
+    the hashes of every `.tus` file that went into it. Linked binaries are
+    stored next to it per toolchain key, so changing only the C flags
+    reuses the generated C and just re-runs the C compiler.
+    """
+
+    def __init__(self, cache_dir: str | None = None) -> None:
+        self.root = os.path.join(cache_dir or default_cache_dir(), "builds")
+
+    def _entry_dir(self, main_file: str) -> str:
+        key = hashlib.sha256(os.path.abspath(main_file).encode()).hexdigest()[:24]
+        return os.path.join(self.root, key)
+
+    def _read_manifest(self, main_file: str) -> dict | None:
+        path = os.path.join(self._entry_dir(main_file), "manifest.json")
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def lookup(self, main_file: str, with_c_code: bool = True) -> dict | None:
+        """
+        Return the cached front-end result for `main_file` when none of its
+        sources changed: a dict with `c_code` and `runtime_symbols`. Builds
+        split into per-module units store no C; pass `with_c_code=False` to
+        only check that the sources are unchanged.
+        """
+        manifest = self._read_manifest(main_file)
+        if not manifest or manifest.get("compiler") != compiler_fingerprint():
+            return None
+        for path, digest in manifest.get("inputs", {}).items():
+            try:
+                if hash_file(path) != digest:
+                    return None
+            except OSError:
+                return None
+        c_code = None
+        if with_c_code:
+            try:
+                with open(os.path.join(self._entry_dir(main_file), "program.c"), "r") as f:
+                    c_code = f.read()
+            except OSError:
+                return None
+        return {"c_code": c_code, "runtime_symbols": set(manifest.get("runtime_symbols", []))}
+
+    def store(self, main_file: str, inputs: Iterable[str], c_file: str | None, runtime_symbols) -> None:
+        """
+        Record the generated C file `c_file` for `main_file` and the sources it
+        came from. With `c_file=None` (per-module units) only the sources are
+        recorded and any older single-file C is dropped. Binaries linked from
+        the previous sources are dropped too, whatever toolchain built them.
+        """
+        entry_dir = self._entry_dir(main_file)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            for name in os.listdir(entry_dir):
+                if name.startswith("bin-"):
+                    os.remove(os.path.join(entry_dir, name))
+            manifest = {
+                "main": os.path.abspath(main_file),
+                "compiler": compiler_fingerprint(),
+                "inputs": {os.path.abspath(p): hash_file(p) for p in inputs},
+                "runtime_symbols": sorted(runtime_symbols),
+            }
+            program_path = os.path.join(entry_dir, "program.c")
+            if c_file is None:
+                if os.path.exists(program_path):
+                    os.remove(program_path)
+            else:
+                tmp_path = f"{program_path}.{os.getpid()}.tmp"
+                shutil.copyfile(c_file, tmp_path)
+                os.replace(tmp_path, program_path)
+            self._atomic_write(os.path.join(entry_dir, "manifest.json"), json.dumps(manifest, indent=2))
+        except OSError:
+            # The cache is an optimisation; a read-only cache dir must never break a build.
+            pass
+
+    def binary_path(self, main_file: str, toolchain: str) -> str:
+        return os.path.join(self._entry_dir(main_file), f"bin-{toolchain}")
+
+    def fetch_binary(self, main_file: str, toolchain: str, destination: str) -> bool:
+        """Copy the cached binary to `destination`; no-op when it is already identical."""
+        cached = self.binary_path(main_file, toolchain)
+        if not os.path.exists(cached):
+            return False
+        if os.path.exists(destination) and hash_file(destination) == hash_file(cached):
+            return True
+        shutil.copy2(cached, destination)
+        return True
+
+    def store_binary(self, main_file: str, toolchain: str, binary: str) -> None:
+        cached = self.binary_path(main_file, toolchain)
+        try:
+            tmp_path = f"{cached}.{os.getpid()}.tmp"
+            shutil.copy2(binary, tmp_path)
+            os.replace(tmp_path, cached)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _atomic_write(path: str, content: str) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,181 @@
+"""
+Long-running compile server for `tusmo.py serve`.
+
+The server process imports the compiler once, builds the lexer and parser
+tables, loads the stdlib ASTs into memory and compiles the runtime objects.
+Every request is then handled in a child forked from that warm process, so
+a compile never sees state left behind by an earlier one.
+
+The client passes its stdin/stdout/stderr over the Unix socket (SCM_RIGHTS),
+so compiler messages and the C compiler's diagnostics go straight to the
+caller's terminal. The wire format is one JSON line each way:
+
+    -> {"argv": [...], "cwd": "...", "env": {...}}
+    <- {"exit_code": 0}
+
+This module only uses the standard library so the client stays cheap to
+import; the compiler itself is only loaded by the server.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from typing import Callable, Sequence
+
+from compiler.runtime_cache import default_cache_dir
+
+
+def default_socket_path() -> str:
+    """`TUSMO_DAEMON_SOCKET`, otherwise `daemon.sock` in the cache directory."""
+    return os.environ.get("TUSMO_DAEMON_SOCKET") or os.path.join(default_cache_dir(), "daemon.sock")
+
+
+def _pid_path(socket_path: str) -> str:
+    return os.path.splitext(socket_path)[0] + ".pid"
+
+
+def _exit_code(code) -> int:
+    """Map a SystemExit code the same way the interpreter does."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _daemon_alive(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+class _CompileHandler(socketserver.StreamRequestHandler):
+    """Runs one compile request. Executes in a freshly forked child."""
+
+    def handle(self):
+        _, fds, _, _ = socket.recv_fds(self.connection, 1, 3)
+        line = self.rfile.readline()
+        if len(fds) != 3 or not line:
+            return  # Tusaale: `serve` oo hubinaya in daemon kale shaqaynayo.
+        request = json.loads(line)
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+
+        try:
+            os.chdir(request["cwd"])
+            os.environ.clear()
+            os.environ.update(request["env"])
+            self.server.compile_fn(request["argv"])
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = _exit_code(e.code)
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+        self.wfile.write(json.dumps({"exit_code": exit_code}).encode() + b"\n")
+
+
+class _CompileServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    def __init__(self, socket_path: str, compile_fn: Callable[[list[str]], None]) -> None:
+        self.compile_fn = compile_fn
+        super().__init__(socket_path, _CompileHandler)
+
+
+def serve(compile_fn: Callable[[list[str]], None], socket_path: str | None = None,
+          warm: Callable[[], None] | None = None) -> int:
+    """
+    Listen on `socket_path` until SIGTERM/SIGINT. `warm` runs once before
+    the first request; `compile_fn(argv)` runs in a forked child per request.
+    """
+    socket_path = socket_path or default_socket_path()
+    if os.path.exists(socket_path):
+        if _daemon_alive(socket_path):
+            print(f"Cilad: daemon-ku horay ayuu u shaqaynayaa ({socket_path}).", file=sys.stderr)
+            return 1
+        os.remove(socket_path)  # Socket ka hadhay daemon dhintay.
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+
+    if warm is not None:
+        warm()
+
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    pid_path = _pid_path(socket_path)
+    server = _CompileServer(socket_path, compile_fn)
+    try:
+        with open(pid_path, "w") as f:
+            f.write(str(os.getpid()))
+        print(f"Tusmo daemon wuxuu dhegaysanayaa {socket_path}", file=sys.stderr)
+        sys.stderr.flush()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for path in (socket_path, pid_path):
+            if os.path.exists(path):
+                os.remove(path)
+    return 0
+
+
+def stop(socket_path: str | None = None) -> int:
+    """Ask the daemon listening on `socket_path` to shut down."""
+    pid_path = _pid_path(socket_path or default_socket_path())
+    try:
+        with open(pid_path) as f:
+            pid = int(f.read().strip())
+        os.kill(pid, signal.SIGTERM)
+    except (OSError, ValueError):
+        print("Daemon ma shaqaynayo.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def request_compile(argv: Sequence[str], socket_path: str | None = None) -> int | None:
+    """
+    Send a compile request to the daemon and return its exit code, or None
+    when no daemon is listening so the caller can compile in-process.
+    """
+    socket_path = socket_path or default_socket_path()
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return None
+        sys.stdout.flush()
+        sys.stderr.flush()
+        request = {"argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)}
+        try:
+            socket.send_fds(client, [b"T"], [0, 1, 2])
+        except OSError:
+            return None  # Tusaale: stdin waa xiran yahay.
+        client.sendall(json.dumps(request).encode() + b"\n")
+        with client.makefile("rb") as reply_file:
+            reply = reply_file.readline()
+        if not reply:
+            print("Cilad: daemon-ku wuu go'ay intii la turjumayay.", file=sys.stderr)
+            return 1
+        return json.loads(reply)["exit_code"]
+    finally:
+        client.close()
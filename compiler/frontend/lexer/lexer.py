@@ -1,5 +1,15 @@
+import glob
+import hashlib
+import os
+import re
+import shutil
+import sys
+import tempfile
+
 import ply.lex as lex
 
+_LEXER_DIR = os.path.dirname(os.path.abspath(__file__))
+
 reserved = {
     'keyd': 'KEYD', 'tiro': 'TIRO', 'eray': 'ERAY', 'xaraf': 'XARAF', 'miyaa': 'MIYAA',
     'jajab': 'JAJAB', 'tix': 'TIX', 'qaamuus': 'QAAMUUS', 'tix_cayiman':'TIX_CAYIMAN', 'run': 'RUN', 'haa': 'HAA', 
@@ -75,43 +85,54 @@ def t_ML_STRING(t):
     t.type = 'STRING'
     return t
 
+_FSTRING_BRACE = re.compile(r"[{}]")
+
+
 def _parse_fstring_content(content):
-    # Parse the f-string content to extract expressions
+    """
+    Split f-string content into ('text', run) and ('expr', source) parts.
+    Each literal run between holes is one part; `{{` and `}}` are escaped
+    braces and an unmatched `{` is kept as text.
+    """
     parts = []
-    i = 0
-    while i < len(content):
-        if content[i] == '{' and i + 1 < len(content) and content[i+1] != '{':
-            # Start of an expression
-            j = i + 1
-            brace_count = 1
-            while j < len(content) and brace_count > 0:
-                if content[j] == '{':
-                    brace_count += 1
-                elif content[j] == '}':
-                    brace_count -= 1
-                j += 1
-            
-            if brace_count == 0:
-                # Extract the expression
-                expr = content[i+1:j-1]
-                parts.append(('expr', expr))
-                i = j
-            else:
-                # Unmatched brace, treat as literal
-                parts.append(('text', content[i]))
-                i += 1
-        elif content[i] == '{' and i + 1 < len(content) and content[i+1] == '{':
-            # Escaped brace
-            parts.append(('text', '{'))
-            i += 2
-        elif content[i] == '}' and i + 1 < len(content) and content[i+1] == '}':
-            # Escaped brace
-            parts.append(('text', '}'))
-            i += 2
-        else:
-            # Regular text
-            parts.append(('text', content[i]))
-            i += 1
+    text = []
+    i, end = 0, len(content)
+    while i < end:
+        brace = _FSTRING_BRACE.search(content, i)
+        if brace is None:
+            text.append(content[i:])
+            break
+        start = brace.start()
+        text.append(content[i:start])
+        if content.startswith("{{", start) or content.startswith("}}", start):
+            text.append(content[start])
+            i = start + 2
+            continue
+        if content[start] == "}":
+            text.append("}")
+            i = start + 1
+            continue
+        # Bilowga expression: raadi xiraha u dhigma.
+        depth, j = 1, start + 1
+        while j < end and depth:
+            if content[j] == "{":
+                depth += 1
+            elif content[j] == "}":
+                depth -= 1
+            j += 1
+        if depth:
+            text.append("{")
+            i = start + 1
+            continue
+        joined = "".join(text)
+        if joined:
+            parts.append(("text", joined))
+        text = []
+        parts.append(("expr", content[start + 1:j - 1]))
+        i = j
+    joined = "".join(text)
+    if joined:
+        parts.append(("text", joined))
     return parts
 
 def t_FSTRING(t):
@@ -154,5 +175,71 @@ def t_error(t):
 
 
 
+def _lexer_table_name():
+    # Kala saar jadwalka lexer-ka si uusan u noqon mid duugoobay marka faylkan la beddelo.
+    if getattr(sys, "frozen", False):
+        return "lextab"
+    try:
+        with open(os.path.join(_LEXER_DIR, "lexer.py"), "rb") as f:
+            return f"lextab_{hashlib.sha256(f.read()).hexdigest()[:16]}"
+    except OSError:
+        return "lextab"
+
+
+def build_lexer(table_module=None):
+    """
+    Build the lexer from a pre-generated 'lextab' module so the master regex
+    is not re-validated on every start. The module is written on first use.
+    """
+    table_module = table_module or _lexer_table_name()
+    table_path = os.path.join(_LEXER_DIR, f"{table_module}.py")
+    if os.path.exists(table_path):
+        return lex.lex(optimize=True, lextab=f"compiler.frontend.lexer.{table_module}", outputdir=_LEXER_DIR)
+
+    # Marka ugu horreysa hubi qawaaniinta calaamadaha ka hor inta aan jadwalka la qorin.
+    built = lex.lex()
+    for stale in glob.glob(os.path.join(_LEXER_DIR, "lextab_*.py")):
+        try:
+            os.remove(stale)
+        except OSError:
+            pass  # Compile kale ayaa tirtiray, ama galku waa akhris-keliya.
+    try:
+        staging = tempfile.mkdtemp(prefix=".lextab-", dir=_LEXER_DIR)
+    except OSError:
+        return built
+    try:
+        # Jadwalka waxaa lagu qoraa gal gaar ah kadib la wareejiyaa, si compile
+        # kale uusan u akhrin jadwal bar-qoran.
+        lex.lex(optimize=True, lextab=table_module, outputdir=staging)
+        os.replace(os.path.join(staging, f"{table_module}.py"), table_path)
+    except OSError:
+        pass
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return built
+
+
+class _LazyLexer:
+    """
+    Stands in for the PLY lexer so importing the compiler does not build or
+    load the lexer table until the first token is needed. Attribute writes
+    (`filename`, `lineno`) go to the real lexer.
+    """
+
+    def __init__(self):
+        object.__setattr__(self, "_lexer", None)
+
+    def _get(self):
+        if self._lexer is None:
+            object.__setattr__(self, "_lexer", build_lexer())
+        return self._lexer
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(), name, value)
+
+
 # Build the lexer
-lexer = lex.lex()
+lexer = _LazyLexer()
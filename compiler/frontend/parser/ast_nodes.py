@@ -4,41 +4,71 @@ class ASTNode:
     """
     Fasalka aasaasiga ah ee dhammaan qodobbada AST.
     Wuxuu si toos ah u kaydiyaa lambarka safka iyo magaca faylka.
+
+    `_fields` waxay magacaabaan xubnaha ay ku jiraan qodobbada carruurta ah
+    (child nodes), si loo socdaalo geedka iyadoon la isticmaalin dir().
+
+    Fasal kasta wuxuu sheegaa `__slots__`, sidaas darteed qodobbadu ma
+    yeeshaan `__dict__`. Xubin kasta oo gudbiyadu (passes) ay dhigaan
+    (tusaale `ordered_args`, `parent_class`) waa in fasalkeeda lagu sheego.
     """
+    _fields = ()
+    __slots__ = ('line', 'filename')
     def __init__(self, line=None, filename=None):
         self.line = line
         self.filename = filename
 
 class ExpressionNode(ASTNode):
-    """Fasalka aasaasiga ah ee dhammaan 'expressions'."""
-    pass
+    """
+    Fasalka aasaasiga ah ee dhammaan 'expressions'.
+
+    `inferred_type` waxaa dhigaya semantic checker-ka marka nooca la helo,
+    si code generator-ku u akhriyo halkii uu mar kale xisaabin lahaa.
+    """
+    __slots__ = ('inferred_type',)
+    def __init__(self, line=None, filename=None):
+        super().__init__(line, filename)
+        self.inferred_type = None
 
 class NumberNode(ExpressionNode):
+    __slots__ = ('value',)
     def __init__(self, value, line=None, filename=None):
         super().__init__(line, filename)
         self.value = value
 
 class FloatNode(ExpressionNode):
+    __slots__ = ('value',)
     def __init__(self, value, line=None, filename=None):
         super().__init__(line, filename)
         self.value = value
 
 class StringNode(ExpressionNode):
-    def __init__(self, value, line=None, filename=None):
+    """
+    `owned` waa run marka qoraalku ka yimid isku-darid la isku laabay
+    (constant folding): barnaamijku wuxuu filayaa eray cusub oo wax laga
+    beddeli karo, sidaa darteed code generator-ku wuxuu sameeyaa nuqul.
+    """
+    __slots__ = ('value', 'owned')
+    def __init__(self, value, line=None, filename=None, owned=False):
         super().__init__(line, filename)
         self.value = value
+        self.owned = owned
 
 class CharNode(ExpressionNode):
+    __slots__ = ('value',)
     def __init__(self, value, line=None, filename=None):
         super().__init__(line, filename)
         self.value = value
 
 class IdentifierNode(ExpressionNode):
+    __slots__ = ('name',)
     def __init__(self, name, line=None, filename=None):
         super().__init__(line, filename)
         self.name = name
 
 class TernaryOpNode(ExpressionNode):
+    _fields = ('condition', 'if_true', 'if_false')
+    __slots__ = ('condition', 'if_true', 'if_false')
     def __init__(self, condition, if_true, if_false, line=None, filename=None):
         super().__init__(line, filename)
         self.condition = condition
@@ -46,11 +76,14 @@ class TernaryOpNode(ExpressionNode):
         self.if_false = if_false
 
 class BooleanNode(ExpressionNode):
+    __slots__ = ('value',)
     def __init__(self, value, line=None, filename=None):
         super().__init__(line, filename)
         self.value = value
 
 class BinaryOpNode(ExpressionNode):
+    _fields = ('left', 'right')
+    __slots__ = ('left', 'op', 'right', 'type')
     def __init__(self, left, op, right, line=None, filename=None):
         super().__init__(line, filename)
         self.left = left
@@ -59,6 +92,8 @@ class BinaryOpNode(ExpressionNode):
         self.type = "binary_op"
 
 class FStringNode(ExpressionNode):
+    _fields = ('parts',)
+    __slots__ = ('parts', 'type')
     def __init__(self, parts, line=None, filename=None):
         super().__init__(line, filename)
         self.parts = parts
@@ -66,6 +101,7 @@ class FStringNode(ExpressionNode):
 
 class TypeLiteralNode(ExpressionNode):
     """Represents a type used as a literal, e.g., tiro, eray, or a class name."""
+    __slots__ = ('type_name',)
     def __init__(self, type_name, line=None, filename=None):
         super().__init__(line, filename)
         self.type_name = type_name
@@ -75,6 +111,8 @@ class TypeLiteralNode(ExpressionNode):
 #|-----------------------------------------------------------------|
 
 class KeydNode(ASTNode):
+    _fields = ('value',)
+    __slots__ = ('var_name', 'var_type', 'value')
     def __init__(self, var_name, var_type, value, line, filename):
         super().__init__(line, filename)
         self.var_name = var_name
@@ -82,6 +120,8 @@ class KeydNode(ASTNode):
         self.value = value
 
 class AssignmentNode(ASTNode):
+    _fields = ('identifier', 'expression')
+    __slots__ = ('identifier', 'op', 'expression')
     def __init__(self, identifier, op, expression, line, filename):
         super().__init__(line, filename)
         self.identifier = identifier
@@ -93,32 +133,40 @@ class AssignmentNode(ASTNode):
 #|-----------------------------------------------------------------|
 
 class ReturnStatementNode(ASTNode):
+    _fields = ('expression',)
+    __slots__ = ('expression',)
     def __init__(self, expression, line=None, filename=None):
         super().__init__(line, filename)
         self.expression = expression
 
 class BreakNode(ASTNode):
     """Represents the 'joog' statement (break)."""
+    __slots__ = ()
     def __init__(self, line=None, filename=None):
         super().__init__(line, filename)
 
 class ContinueNode(ASTNode):
     """Represents the 'kasoco' statement (continue)."""
+    __slots__ = ()
     def __init__(self, line=None, filename=None):
         super().__init__(line, filename)
 
 class EmbeddedCNode(ASTNode):
     """Represents an embedded C code block injected via ___c__code_()."""
+    __slots__ = ('code',)
     def __init__(self, code, line=None, filename=None):
         super().__init__(line, filename)
         self.code = code
 
 class QorNode(ASTNode):
+    _fields = ('expressions',)
+    __slots__ = ('expressions',)
     def __init__(self, line, expressions, filename):
         super().__init__(line, filename)
         self.expressions = expressions
 
 class HelNode(ASTNode):
+    __slots__ = ('identifier',)
     def __init__(self, line, identifier, filename):
         super().__init__(line, filename)
         self.identifier = identifier
@@ -127,6 +175,8 @@ class HelNode(ASTNode):
 #|                       HADDII (IF Statements)                    |
 #|-----------------------------------------------------------------|
 class IfNode(ASTNode):
+    _fields = ('cases', 'else_case')
+    __slots__ = ('cases', 'else_case')
     def __init__(self, cases, else_case=None, line=None, filename=None):
         super().__init__(line, filename)
         self.cases = cases
@@ -137,6 +187,7 @@ class IfNode(ASTNode):
 #|-----------------------------------------------------------------|
 
 class ArrayTypeNode(ASTNode):
+    __slots__ = ('element_type',)
     def __init__(self, line, element_type=None, filename=None):
         super().__init__(line, filename)
         self.element_type = element_type # This can now be a string OR another ArrayTypeNode
@@ -155,6 +206,7 @@ class ArrayTypeNode(ASTNode):
             return "tix"
 
 class FunctionTypeNode(ASTNode):
+    __slots__ = ('param_types', 'return_type')
     def __init__(self, line, param_types, return_type, filename=None):
         super().__init__(line, filename)
         self.param_types = param_types
@@ -170,23 +222,40 @@ class FunctionTypeNode(ASTNode):
         return f"hawl({param_str}):{self.return_type}"
 
 class ArrayInitializationNode(ExpressionNode):
+    _fields = ('elements',)
+    __slots__ = ('elements',)
     def __init__(self, line, elements, filename):
         super().__init__(line, filename)
         self.elements = elements
 
 class ArrayAccessNode(ExpressionNode):
+    _fields = ('array_name_node', 'index_expression')
+    __slots__ = ('array_name_node', 'index_expression')
     def __init__(self, line, array_name_node, index_expression, filename):
         super().__init__(line, filename)
         self.array_name_node = array_name_node
         self.index_expression = index_expression
 
+class SliceNode(ExpressionNode):
+    """Represents `s[bilow:dhammaad]` on an eray; either bound may be omitted (None)."""
+    _fields = ('value_node', 'start_expression', 'end_expression')
+    __slots__ = ('value_node', 'start_expression', 'end_expression')
+    def __init__(self, line, value_node, start_expression, end_expression, filename):
+        super().__init__(line, filename)
+        self.value_node = value_node
+        self.start_expression = start_expression
+        self.end_expression = end_expression
+
 class ArrayTypeQueryNode(ExpressionNode):
     """Represents the special nooc(arr[]) syntax to ask for an array's element type."""
+    __slots__ = ('identifier',)
     def __init__(self, line, identifier, filename):
         super().__init__(line, filename)
         self.identifier = identifier
 
 class ArrayAssignmentNode(ASTNode):
+    _fields = ('array_access_node', 'value_expression')
+    __slots__ = ('array_access_node', 'value_expression')
     def __init__(self, line, array_access_node, value_expression, filename):
         super().__init__(line, filename)
         self.array_access_node = array_access_node
@@ -196,6 +265,8 @@ class ArrayAssignmentNode(ASTNode):
 #|                       HAWL/SHAQO (Function Declarations)        |
 #|-----------------------------------------------------------------|
 class FunctionNode(ASTNode):
+    _fields = ('params', 'body')
+    __slots__ = ('return_type', 'name', 'params', 'body', 'docstring')
     def __init__(self, return_type, name, params, body, line, filename):
         super().__init__(line, filename)
         self.return_type = return_type
@@ -205,6 +276,8 @@ class FunctionNode(ASTNode):
         self.docstring = None
 
 class ParameterNode(ASTNode):
+    _fields = ('default_value',)
+    __slots__ = ('name', 'param_type', 'default_value')
     def __init__(self, name, param_type, default_value=None, line=None, filename=None):
         super().__init__(line, filename)
         self.name = name
@@ -213,6 +286,8 @@ class ParameterNode(ASTNode):
 
 # Represents a named argument in a call, e.g., fn(x=1)
 class NamedArgument(ASTNode):
+    _fields = ('value',)
+    __slots__ = ('name', 'value')
     def __init__(self, name, value, line=None, filename=None):
         super().__init__(line, filename)
         self.name = name
@@ -222,6 +297,8 @@ class NamedArgument(ASTNode):
 #|                       Function Call                             |
 #|-----------------------------------------------------------------|
 class FunctionCallNode(ExpressionNode):
+    _fields = ('params',)
+    __slots__ = ('name', 'params', 'ordered_args')
     def __init__(self, name, params, line, filename):
         super().__init__(line, filename)
         self.name = name
@@ -234,18 +311,24 @@ class FunctionCallNode(ExpressionNode):
 #|-----------------------------------------------------------------|
 
 class WhileNode(ASTNode):
+    _fields = ('condition', 'body')
+    __slots__ = ('condition', 'body')
     def __init__(self, line, condition, body, filename):
         super().__init__(line, filename)
         self.condition = condition
         self.body = body
 
 class DoWhileNode(ASTNode):
+    _fields = ('body', 'condition')
+    __slots__ = ('body', 'condition')
     def __init__(self, line, body, condition, filename):
         super().__init__(line, filename)
         self.body = body
         self.condition = condition
 
 class ForRangeNode(ASTNode):
+    _fields = ('start_expr', 'end_expr', 'body')
+    __slots__ = ('iterator_var_name', 'start_expr', 'end_expr', 'body')
     def __init__(self, line, iterator_var_name, start_expr, end_expr, body, filename):
         super().__init__(line, filename)
         self.iterator_var_name = iterator_var_name
@@ -254,6 +337,8 @@ class ForRangeNode(ASTNode):
         self.body = body
 
 class ForEachNode(ASTNode):
+    _fields = ('array_expr', 'body')
+    __slots__ = ('iterator_var_name', 'array_expr', 'body')
     def __init__(self, line, iterator_var_name, array_expr, body, filename):
         super().__init__(line, filename)
         self.iterator_var_name = iterator_var_name
@@ -261,14 +346,18 @@ class ForEachNode(ASTNode):
         self.body = body
 
 class MethodCallNode(ExpressionNode):
+    _fields = ('object_node', 'args_list')
+    __slots__ = ('object_node', 'method_name', 'args_list', 'ordered_args', 'method_source_class')
     def __init__(self, line, object_node, method_name, args_list, filename):
         super().__init__(line, filename)
         self.object_node = object_node
         self.method_name = method_name
         self.args_list = args_list
         self.ordered_args = None
+        self.method_source_class = None
 
 class KeenNode(ASTNode):
+    __slots__ = ()
     def __init__(self, line, filename_to_import, source_filename):
         # Kaydi meesha 'keen' lagu qoray
         super().__init__(line, source_filename)
@@ -284,6 +373,8 @@ class KeenNode(ASTNode):
 
 class ClassNode(ASTNode):
     """Represents a class definition with its members and methods."""
+    _fields = ('members', 'methods')
+    __slots__ = ('name', 'members', 'methods', 'docstring', 'parent_name', 'parent_class')
     def __init__(self, name, members, methods, line, filename, parent_name=None):
         super().__init__(line, filename)
         self.name = name
@@ -291,9 +382,13 @@ class ClassNode(ASTNode):
         self.methods = methods
         self.docstring = None
         self.parent_name = parent_name # The name of the parent class, if any
+        # Waxaa dhigaya semantic checker-ka marka waalidka la helo.
+        self.parent_class = None
 
 class ClassInstantiationNode(ExpressionNode):
     """Represents creating a new instance of a class, e.g., Qof(...) cusub."""
+    _fields = ('constructor_args',)
+    __slots__ = ('class_name', 'constructor_args', 'ordered_args')
     def __init__(self, class_name, constructor_args, line, filename):
         super().__init__(line, filename)
         self.class_name = class_name
@@ -302,6 +397,8 @@ class ClassInstantiationNode(ExpressionNode):
 
 class MemberAccessNode(ExpressionNode):
     """Represents accessing a member of an object, e.g., qof1.magac."""
+    _fields = ('object_node',)
+    __slots__ = ('object_node', 'member_name')
     def __init__(self, object_node, member_name, line, filename):
         super().__init__(line, filename)
         self.object_node = object_node
@@ -309,16 +406,20 @@ class MemberAccessNode(ExpressionNode):
 
 class ThisNode(ExpressionNode):
     """Represents the 'kan' keyword inside a method."""
+    __slots__ = ()
     def __init__(self, line, filename):
         super().__init__(line, filename)
 
 class WaalidNode(ExpressionNode):
     """Represents the 'waalid' keyword for parent access."""
+    __slots__ = ()
     def __init__(self, line, filename):
         super().__init__(line, filename)
 
 
 class CCallNode(ExpressionNode):
+    _fields = ('args',)
+    __slots__ = ('c_function_name', 'args')
     def __init__(self, c_function_name, args, line, filename):
         super().__init__(line, filename)
         self.c_function_name = c_function_name
@@ -334,12 +435,16 @@ class CCallNode(ExpressionNode):
 
 class DictionaryInitializationNode(ExpressionNode):
     """Represents a dictionary literal, e.g., {"magac": "Ali", "da": 25}."""
+    _fields = ('pairs',)
+    __slots__ = ('pairs',)
     def __init__(self, line, pairs, filename):
         super().__init__(line, filename)
         self.pairs = pairs
 
 class DictionaryAccessNode(ExpressionNode):
     """Represents accessing a dictionary's value, e.g., my_dict["key"]."""
+    _fields = ('dictionary_node', 'key_node')
+    __slots__ = ('dictionary_node', 'key_node')
     def __init__(self, line, dictionary_node, key_node, filename):
         super().__init__(line, filename)
         self.dictionary_node = dictionary_node
@@ -347,7 +452,61 @@ class DictionaryAccessNode(ExpressionNode):
 
 class DictionaryAssignmentNode(ASTNode):
     """Represents assigning a value to a dictionary key, e.g., my_dict["key"] = value."""
+    _fields = ('dictionary_access_node', 'value_node')
+    __slots__ = ('dictionary_access_node', 'value_node')
     def __init__(self, line, dictionary_access_node, value_node, filename):
         super().__init__(line, filename)
         self.dictionary_access_node = dictionary_access_node
         self.value_node = value_node
+
+
+#|-----------------------------------------------------------------|
+#|                 Socdaalka geedka (Tree traversal)               |
+#|-----------------------------------------------------------------|
+
+def _iter_nodes(value):
+    if isinstance(value, ASTNode):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_nodes(item)
+
+
+def iter_child_nodes(node):
+    """
+    Yield the direct child nodes of `node`, following its declared `_fields`.
+    Lists and tuples (e.g. IfNode.cases, DictionaryInitializationNode.pairs)
+    are flattened; non-node values such as names and types are skipped.
+    """
+    for field in node._fields:
+        yield from _iter_nodes(getattr(node, field, None))
+
+
+class NodeVisitor:
+    """
+    Base class for AST passes. `visit` dispatches to `visit_<ClassName>` and
+    falls back to `generic_visit`, which visits every child node.
+    """
+    _dispatch_cache = None
+
+    def visit(self, node):
+        if isinstance(node, list):
+            for item in node:
+                self.visit(item)
+            return None
+        if node is None:
+            return None
+        cache = self.__class__.__dict__.get("_dispatch_cache")
+        if cache is None:
+            cache = {}
+            self.__class__._dispatch_cache = cache
+        node_class = type(node)
+        method = cache.get(node_class)
+        if method is None:
+            method = getattr(self.__class__, f"visit_{node_class.__name__}", self.__class__.generic_visit)
+            cache[node_class] = method
+        return method(self, node)
+
+    def generic_visit(self, node):
+        for child in iter_child_nodes(node):
+            self.visit(child)
@@ -1,7 +1,8 @@
 # array_grammer_rule.py 
 
 from compiler.frontend.parser.ast_nodes import (
-    ArrayTypeNode, ArrayAssignmentNode, ArrayAccessNode, ArrayInitializationNode, ArrayTypeQueryNode, IdentifierNode
+    ArrayTypeNode, ArrayAssignmentNode, ArrayAccessNode, ArrayInitializationNode, ArrayTypeQueryNode, IdentifierNode,
+    SliceNode
 )
 
 def p_type_specifier(p):
@@ -59,6 +60,31 @@ def p_array_access_simple(p):
     filename = p.lexer.filename
     p[0] = ArrayAccessNode(line, IdentifierNode(p[1], line=line, filename=filename), p[3], filename)
 
+# Qayb eray ah: s[bilow:dhammaad], s[bilow:], s[:dhammaad], s[:]
+def p_slice_access(p):
+    '''array_access : expression LBRACKET slice_bounds RBRACKET'''
+    p[0] = SliceNode(p.lineno(2), p[1], p[3][0], p[3][1], p.lexer.filename)
+
+def p_slice_access_simple(p):
+    '''expression : IDENTIFIER LBRACKET slice_bounds RBRACKET'''
+    line = p.lineno(2)
+    filename = p.lexer.filename
+    p[0] = SliceNode(line, IdentifierNode(p[1], line=line, filename=filename), p[3][0], p[3][1], filename)
+
+def p_slice_bounds(p):
+    '''slice_bounds : expression COLON expression
+                    | expression COLON
+                    | COLON expression
+                    | COLON'''
+    if len(p) == 4:
+        p[0] = (p[1], p[3])
+    elif len(p) == 2:
+        p[0] = (None, None)
+    elif p.slice[1].type == 'COLON':
+        p[0] = (None, p[2])
+    else:
+        p[0] = (p[1], None)
+
 def p_array_type_query(p):
     'array_type_query : IDENTIFIER LBRACKET RBRACKET'
     line = p.lineno(2)
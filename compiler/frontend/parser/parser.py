@@ -1,7 +1,16 @@
+import glob
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
 import ply.yacc as yacc
 from compiler.frontend.lexer.lexer import tokens, lexer
 from compiler.frontend.parser.grammar_rules import *
 
+_PARSER_DIR = os.path.dirname(os.path.abspath(__file__))
+_TABLE_PACKAGE = "compiler.frontend.parser"
 
 
 def p_error(p):
@@ -19,5 +28,98 @@ def p_error(p):
         print(f"Khalad Naxwe: Waxaa Laga Helay Dhammaadka '{filename}':  faylkan")
         sys.exit(1)
 
+
+def _grammar_fingerprint():
+    """
+    Hash of every file that defines the grammar, used to name the table
+    module so an edited grammar never loads stale tables. Returns None when
+    the sources are not on disk (frozen builds ship a fixed 'parsetab').
+    """
+    sources = [
+        os.path.join(_PARSER_DIR, "parser.py"),
+        os.path.join(_PARSER_DIR, "grammar_rules.py"),
+        os.path.join(os.path.dirname(_PARSER_DIR), "lexer", "lexer.py"),
+        *sorted(glob.glob(os.path.join(_PARSER_DIR, "includes", "*.py"))),
+    ]
+    digest = hashlib.sha256()
+    try:
+        for path in sources:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    except OSError:
+        return None
+    return digest.hexdigest()[:16]
+
+
+def _table_module_name():
+    if getattr(sys, "frozen", False):
+        return "parsetab"
+    fingerprint = _grammar_fingerprint()
+    return f"parsetab_{fingerprint}" if fingerprint else "parsetab"
+
+
+def build_parser(table_module=None):
+    """
+    Build the LALR parser from pre-generated tables when they exist. The
+    tables are written next to this file the first time, without the
+    'parser.out' debug file, so later processes only import them.
+    """
+    table_module = table_module or _table_module_name()
+    table_path = os.path.join(_PARSER_DIR, f"{table_module}.py")
+    if os.path.exists(table_path):
+        return yacc.yacc(debug=False, optimize=True, tabmodule=f"{_TABLE_PACKAGE}.{table_module}", outputdir=_PARSER_DIR)
+
+    # Tables for an older grammar are never loaded again. Another compile may
+    # remove them first, and a read-only install cannot remove them at all.
+    for stale in glob.glob(os.path.join(_PARSER_DIR, "parsetab_*.py")):
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+    try:
+        staging = tempfile.mkdtemp(prefix=".parsetab-", dir=_PARSER_DIR)
+    except OSError:
+        return yacc.yacc(debug=False, write_tables=False)
+    try:
+        # Generated in a private directory and renamed into place, so a
+        # concurrent compile never imports a half-written table module.
+        parser = yacc.yacc(debug=False, tabmodule=table_module, outputdir=staging)
+        os.replace(os.path.join(staging, f"{table_module}.py"), table_path)
+    except OSError:
+        pass
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return parser
+
+
+def build_tables():
+    """Generate the shipped 'parsetab'/'lextab' modules (used before freezing the CLI)."""
+    from compiler.frontend.lexer.lexer import build_lexer
+
+    build_lexer("lextab")
+    build_parser("parsetab")
+
+
+class _LazyParser:
+    """
+    Stands in for the PLY parser so importing the compiler does not build
+    or load the parse tables until the first parse.
+    """
+
+    def __init__(self):
+        self._parser = None
+
+    def _get(self):
+        if self._parser is None:
+            self._parser = build_parser()
+        return self._parser
+
+    def parse(self, *args, **kwargs):
+        return self._get().parse(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+
 # Build the parser
-parser = yacc.yacc(debug=True)
\ No newline at end of file
+parser = _LazyParser()
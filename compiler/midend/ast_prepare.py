@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from compiler.frontend.parser.ast_nodes import ClassNode, FStringNode, FunctionNode, NodeVisitor
+from compiler.midend.docstring_utils import attach_docstring
+from compiler.midend.fstring_resolver import resolve_fstring
+
+
+def prepare_ast(ast):
+    """
+    Single walk over the merged AST that does the work of resolve_fstrings
+    and attach_docstrings together, ahead of semantic analysis.
+    """
+    _PreparePass().visit(ast)
+    return ast
+
+
+class _PreparePass(NodeVisitor):
+    def visit_FStringNode(self, node: FStringNode):
+        resolve_fstring(node)
+        self.generic_visit(node)
+
+    def visit_FunctionNode(self, node: FunctionNode):
+        attach_docstring(node)
+        self.generic_visit(node)
+
+    def visit_ClassNode(self, node: ClassNode):
+        attach_docstring(node)
+        self.generic_visit(node)
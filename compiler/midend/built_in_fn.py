@@ -1,20 +1,32 @@
 functions_ = {
-    "tix_cayiman": {"return_type": None, "feature": "array"}, 
+    "tix_cayiman": {"return_type": None}, 
     "nooc": {"return_type": "eray"},
     "dherer": {"return_type": "tiro"},
+    "xadhig": {"return_type": "xadhig"},
     
     # Type Conversion Functions
-    "eray":  {"return_type": "eray", "feature": "conversion"},
-    "tiro":  {"return_type": "tiro", "feature": "conversion"},
-    "jajab": {"return_type": "jajab", "feature": "conversion"},
-    "miyaa": {"return_type": "miyaa", "feature": "conversion"},
+    "eray":  {"return_type": "eray"},
+    "tiro":  {"return_type": "tiro"},
+    "jajab": {"return_type": "jajab"},
+    "miyaa": {"return_type": "miyaa"},
 
-    "tusmo_os_system": {"return_type": "tiro", "feature": "os"},
-    "koobi": {"return_type": "waxbo", "feature": "os"},
-    "nuqul": {"return_type": "waxbo", "feature": "os"},
-    "u_dhaqaaji": {"return_type": "waxbo", "feature": "os"},
-    "aqri_fayl": {"return_type": "eray", "feature": "os"},
-    "qor_fayl": {"return_type": "waxbo", "feature": "os"},
-    "isku_dar_waddo": {"return_type": "eray", "feature": "os"},
-    "cabbir_fayl": {"return_type": "tiro", "feature": "os"}
+    "tusmo_os_system": {"return_type": "tiro"},
+    "koobi": {"return_type": "waxbo"},
+    "nuqul": {"return_type": "waxbo"},
+    "u_dhaqaaji": {"return_type": "waxbo"},
+    "aqri_fayl": {"return_type": "eray"},
+    "qor_fayl": {"return_type": "waxbo"},
+    "isku_dar_waddo": {"return_type": "eray"},
+    "cabbir_fayl": {"return_type": "tiro"}
+}
+
+
+# Eray helpers implemented natively in runtime/string.c. They are ordinary
+# names rather than keywords, so a program's own function of the same name
+# takes precedence. `optional` counts trailing params that may be left out.
+eray_functions_ = {
+    "kala_jar": {"params": ["eray", "eray"], "return_type": "tix:eray"},
+    "ku_dar": {"params": ["tix:eray", "eray"], "return_type": "eray"},
+    "raadi": {"params": ["eray", "eray", "tiro"], "optional": 1, "return_type": "tiro"},
+    "beddel": {"params": ["eray", "eray", "eray"], "return_type": "eray"},
 }
@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import math
+
+from compiler.frontend.parser.ast_nodes import (
+    ArrayAccessNode, ArrayAssignmentNode, ASTNode, AssignmentNode, BinaryOpNode, BooleanNode, ClassInstantiationNode,
+    ClassNode, DoWhileNode, EmbeddedCNode, FloatNode, ForEachNode, ForRangeNode, FStringNode, FunctionCallNode,
+    FunctionNode, HelNode, IdentifierNode, IfNode, KeydNode, MethodCallNode, NamedArgument, NodeVisitor, NumberNode,
+    StringNode, TernaryOpNode, WhileNode,
+)
+
+# `tiro` waa C `int`; natiijooyin ka baxsan xadkan lama isku laabo (overflow).
+# INT_MIN lafteeda C kuma qormi karto literal ahaan, sidaa darteed waa laga reebay.
+INT_MIN, INT_MAX = -(2**31 - 1), 2**31 - 1
+
+_LITERAL_TYPES = {NumberNode: "tiro", FloatNode: "jajab", StringNode: "eray", BooleanNode: "miyaa"}
+_COMPARISONS = {
+    "==": lambda a, b: a == b, "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b, ">": lambda a, b: a > b,
+    "<=": lambda a, b: a <= b, ">=": lambda a, b: a >= b,
+}
+_AND, _OR = ("iyo", "&&"), ("ama", "||")
+
+
+def fold_constants(ast):
+    """
+    Evaluate what is known at compile time, after semantic checking and
+    before codegen:
+
+    * arithmetic and comparisons on `tiro`/`jajab` literals, `miyaa` logic
+      and `==`/`!=` on `eray` literals, with C's semantics (truncating `/`
+      and `%`, 32-bit `tiro`);
+    * `eray + ...` and f-strings whose pieces are all known become a single
+      string literal, so no `tusmo_concat_cstr` runs for them. The result
+      is marked `owned`: at runtime it was a fresh, writable eray, so
+      codegen emits a copy of the literal rather than the read-only literal;
+    * a `keyd` whose value folds to a literal of its own type and whose name
+      is never assigned (`=`, `hel`, `x[i] = ...`, loop variable) is
+      replaced by that literal where it is used. An `owned` eray is not
+      propagated: every use must see the same writable buffer;
+    * `haddii`/`ama_haddii` branches with a constant condition, ternaries on
+      a constant and `inta ay been` loops are reduced to what can run.
+
+    Declarations stay in place. Programs with embedded C (`___c__code_`)
+    are folded but nothing is propagated, since that code can write any
+    variable. `ast` is rewritten in place and returned.
+    """
+    assigned, embedded_c = _written_names(ast)
+    ast[:] = _ConstantFolder(assigned, propagate=not embedded_c).fold_block(ast)
+    return ast
+
+
+def _written_names(ast):
+    """
+    Every variable name the program writes after declaring it, and whether
+    it embeds C. Writes are statements, so expressions are not entered.
+    """
+    names, embedded_c = set(), False
+    pending = list(ast)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, list):
+            pending.extend(node)
+        elif isinstance(node, (AssignmentNode, ArrayAssignmentNode)):
+            target = node.identifier if isinstance(node, AssignmentNode) else node.array_access_node
+            # `s[0] = 'x'` wuxuu beddelaa erayga `s` laftiisa.
+            while isinstance(target, ArrayAccessNode):
+                target = target.array_name_node
+            if isinstance(target, IdentifierNode):
+                names.add(target.name)
+        elif isinstance(node, HelNode):
+            names.add(node.identifier)
+        elif isinstance(node, EmbeddedCNode):
+            embedded_c = True
+        elif isinstance(node, IfNode):
+            for _, body in node.cases:
+                pending.extend(body or ())
+            pending.extend(node.else_case or ())
+        elif isinstance(node, ClassNode):
+            pending.extend(node.methods)
+        elif isinstance(node, (FunctionNode, WhileNode, DoWhileNode, ForRangeNode, ForEachNode)):
+            if isinstance(node, (ForRangeNode, ForEachNode)):
+                names.add(node.iterator_var_name)
+            pending.extend(node.body or ())
+    return names, embedded_c
+
+
+def _literal(node):
+    """The Python value of a literal node and its Tusmo type, else (None, None)."""
+    literal_type = _LITERAL_TYPES.get(type(node))
+    if literal_type is None:
+        return None, None
+    return node.value, literal_type
+
+
+def _make_literal(value, literal_type, like: ASTNode):
+    node_class = {"tiro": NumberNode, "jajab": FloatNode, "eray": StringNode, "miyaa": BooleanNode}[literal_type]
+    return node_class(value, line=like.line, filename=like.filename)
+
+
+def _as_text(node):
+    """The text `_ensure_string_operand` would produce at runtime for a literal, else None."""
+    value, literal_type = _literal(node)
+    if literal_type == "eray":
+        return value
+    if literal_type == "tiro":
+        return str(value)
+    if literal_type == "jajab":
+        return "%f" % value
+    if literal_type == "miyaa":
+        return "run" if value else "been"
+    return None
+
+
+def _is_eray(node):
+    """Whether `node` is known to be an `eray` without the symbol table (e.g. the head of a `+` chain)."""
+    if isinstance(node, BinaryOpNode):
+        # Codegen-ku wuxuu isku xiraa kaliya marka dhinaca bidix yahay eray.
+        return node.op == "+" and _is_eray(node.left)
+    return isinstance(node, (StringNode, FStringNode)) or node.inferred_type == "eray"
+
+
+def _arithmetic(op, left, right, literal_type):
+    if literal_type == "tiro":
+        if op == "+": return left + right
+        if op == "-": return left - right
+        if op == "*": return left * right
+        if op in ("/", "%") and right:
+            # C wuxuu u gooyaa eber dhankiisa.
+            quotient = abs(left) // abs(right)
+            if (left < 0) != (right < 0):
+                quotient = -quotient
+            return quotient if op == "/" else left - right * quotient
+        return None
+    if op == "+": return left + right
+    if op == "-": return left - right
+    if op == "*": return left * right
+    if op == "/" and right:
+        return left / right
+    return None
+
+
+def _in_range(value, literal_type):
+    if literal_type == "tiro":
+        return INT_MIN <= value <= INT_MAX
+    return math.isfinite(value)
+
+
+class _ConstantFolder(NodeVisitor):
+    """
+    Rewrites expressions bottom-up: every `visit_*` returns the node that
+    takes the visited one's place. Statement visitors may return None to
+    drop the statement. `scopes` maps names to the literal a constant
+    `keyd` holds, or None for anything else that shadows an outer name.
+    """
+
+    def __init__(self, assigned, propagate=True):
+        self.assigned = assigned
+        self.propagate = propagate
+        self.scopes = [{}]
+
+    def fold(self, value):
+        if isinstance(value, ASTNode):
+            return self.visit(value)
+        if isinstance(value, list):
+            return [folded for folded in map(self.fold, value) if folded is not None]
+        if isinstance(value, tuple):
+            return tuple(map(self.fold, value))
+        return value
+
+    def fold_block(self, body, names=()):
+        """Fold a statement list in a scope of its own; `names` are declared in it first (parameters, loop variables)."""
+        if body is None:
+            return None
+        self.scopes.append(dict.fromkeys(names))
+        try:
+            return self.fold(body)
+        finally:
+            self.scopes.pop()
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def generic_visit(self, node):
+        for field in node._fields:
+            setattr(node, field, self.fold(getattr(node, field, None)))
+        return node
+
+    def _fold_arguments(self, node, field):
+        """Fold call arguments and keep the checker's `ordered_args` pointing at the folded values."""
+        folded = {}
+        args = []
+        for arg in getattr(node, field):
+            value = arg.value if isinstance(arg, NamedArgument) else arg
+            new = self.fold(arg)
+            folded[id(value)] = new.value if isinstance(new, NamedArgument) else new
+            args.append(new)
+        setattr(node, field, args)
+        if node.ordered_args is not None:
+            node.ordered_args = [
+                folded[id(arg)] if id(arg) in folded else self._fold_unscoped(arg) for arg in node.ordered_args
+            ]
+        return node
+
+    def _fold_unscoped(self, value):
+        """
+        Fold an expression C evaluates away from where it is written (a
+        parameter default filled in at a call, a member initialiser); it
+        sees no constants.
+        """
+        outer, self.scopes = self.scopes, [{}]
+        try:
+            return self.fold(value)
+        finally:
+            self.scopes = outer
+
+    # ---------------- Scopes & declarations ----------------
+    def visit_FunctionNode(self, node: FunctionNode):
+        # Hawl kasta waxay C ku noqotaa hawl gaar ah; ma arkaan `keyd`-yada sare.
+        outer, self.scopes = self.scopes, [{}]
+        try:
+            for param in node.params:
+                param.default_value = self.fold(param.default_value)
+            node.body = self.fold_block(node.body, (param.name for param in node.params))
+        finally:
+            self.scopes = outer
+        return node
+
+    def visit_ClassNode(self, node: ClassNode):
+        for member in node.members:
+            member.value = self._fold_unscoped(member.value)
+        node.methods = [self.visit(method) for method in node.methods]
+        return node
+
+    def visit_KeydNode(self, node: KeydNode):
+        node.value = self.fold(node.value)
+        _, literal_type = _literal(node.value)
+        constant = (
+            self.propagate and literal_type is not None
+            and literal_type == str(node.var_type) and node.var_name not in self.assigned
+            and not (literal_type == "eray" and node.value.owned)
+        )
+        self.scopes[-1][node.var_name] = node.value if constant else None
+        return node
+
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        value = self.lookup(node.name)
+        if value is None:
+            return node
+        return type(value)(value.value, line=node.line, filename=node.filename)
+
+    def visit_ForRangeNode(self, node: ForRangeNode):
+        node.start_expr = self.fold(node.start_expr)
+        node.end_expr = self.fold(node.end_expr)
+        node.body = self.fold_block(node.body, (node.iterator_var_name,))
+        return node
+
+    def visit_ForEachNode(self, node: ForEachNode):
+        node.array_expr = self.fold(node.array_expr)
+        node.body = self.fold_block(node.body, (node.iterator_var_name,))
+        return node
+
+    def visit_DoWhileNode(self, node: DoWhileNode):
+        node.body = self.fold_block(node.body)
+        node.condition = self.fold(node.condition)
+        return node
+
+    # ---------------- Dead branches ----------------
+    def visit_WhileNode(self, node: WhileNode):
+        node.condition = self.fold(node.condition)
+        if isinstance(node.condition, BooleanNode) and not node.condition.value:
+            return None
+        node.body = self.fold_block(node.body)
+        return node
+
+    def visit_IfNode(self, node: IfNode):
+        cases = []
+        else_case = node.else_case
+        for condition, body in node.cases:
+            condition = self.fold(condition)
+            if isinstance(condition, BooleanNode):
+                if not condition.value:
+                    continue
+                if cases:
+                    else_case = body
+                    break
+                # Laan had iyo jeer la qaado; waxay haysaa scope-keeda C.
+                node.cases, node.else_case = [(condition, self.fold_block(body))], None
+                return node
+            cases.append((condition, self.fold_block(body)))
+        else_case = self.fold_block(else_case)
+        if not cases:
+            if not else_case:
+                return None
+            cases, else_case = [(BooleanNode(True, line=node.line, filename=node.filename), else_case)], None
+        node.cases = cases
+        node.else_case = else_case
+        return node
+
+    def visit_TernaryOpNode(self, node: TernaryOpNode):
+        self.generic_visit(node)
+        if isinstance(node.condition, BooleanNode):
+            return node.if_true if node.condition.value else node.if_false
+        return node
+
+    # ---------------- Expressions ----------------
+    def visit_FunctionCallNode(self, node: FunctionCallNode):
+        return self._fold_arguments(node, "params")
+
+    def visit_MethodCallNode(self, node: MethodCallNode):
+        node.object_node = self.fold(node.object_node)
+        return self._fold_arguments(node, "args_list")
+
+    def visit_ClassInstantiationNode(self, node: ClassInstantiationNode):
+        return self._fold_arguments(node, "constructor_args")
+
+    def visit_BinaryOpNode(self, node: BinaryOpNode):
+        self.generic_visit(node)
+        op, left, right = node.op, node.left, node.right
+        if op == "+" and isinstance(left, StringNode):
+            # Isku-darka ayaa eray cusub sameeya; qaybtiisa hore uma baahna nuqul.
+            left.owned = False
+        left_value, left_type = _literal(left)
+        right_value, right_type = _literal(right)
+
+        if op in _AND or op in _OR:
+            short_circuit = op in _OR
+            if left_type == "miyaa":
+                # `run ama x` waa run; `been ama x` waa x (sidoo kale `iyo`).
+                return left if left_value == short_circuit else right
+            if right_type == "miyaa" and right_value != short_circuit:
+                return left
+            return node
+
+        if left_type is None and op == "+" and right_type is not None and _is_eray(left):
+            # `x + ":" + 5`: qoraalka "5" hadda la sameeyo, runtime-ka ha qaabayn,
+            # oo ku dar qoraalka ka horreeya: `x + ":5"`.
+            text = _make_literal(_as_text(right), "eray", right)
+            if isinstance(left, BinaryOpNode) and isinstance(left.right, StringNode):
+                left.right = _make_literal(left.right.value + text.value, "eray", left.right)
+                return left
+            node.right = text
+            return node
+        if left_type is None or right_type is None:
+            return node
+
+        if op == "+" and left_type == "eray":
+            text = _as_text(right)
+            if text is None:
+                return node
+            return StringNode(left_value + text, line=node.line, filename=node.filename, owned=True)
+
+        if left_type != right_type:
+            return node
+        if op in _COMPARISONS:
+            if left_type == "eray" and op not in ("==", "!="):
+                return node
+            return _make_literal(_COMPARISONS[op](left_value, right_value), "miyaa", node)
+        if left_type in ("tiro", "jajab"):
+            value = _arithmetic(op, left_value, right_value, left_type)
+            if value is not None and _in_range(value, left_type):
+                return _make_literal(value, left_type, node)
+        return node
+
+    def visit_FStringNode(self, node: FStringNode):
+        parts, text = [], []
+        for part_type, part_value in node.parts:
+            if part_type == "expr" and isinstance(part_value, ASTNode):
+                part_value = self.fold(part_value)
+                known = _as_text(part_value)
+                if known is None:
+                    if text:
+                        parts.append(("text", "".join(text)))
+                        text = []
+                    parts.append(("expr", part_value))
+                    continue
+                part_value = known
+            text.append(str(part_value))
+        if not parts:
+            return StringNode("".join(text), line=node.line, filename=node.filename, owned=True)
+        if text:
+            parts.append(("text", "".join(text)))
+        node.parts = parts
+        return node
@@ -4,6 +4,7 @@ from compiler.frontend.parser.ast_nodes import (
     ASTNode,
     ClassNode,
     FunctionNode,
+    NodeVisitor,
     StringNode,
 )
 
@@ -42,18 +43,12 @@ def attach_docstrings(ast):
     instances. Removes the synthetic StringNode from the body/members so it
     does not generate code.
     """
-    if isinstance(ast, list):
-        for node in ast:
-            _attach_docstrings(node)
-    elif isinstance(ast, ASTNode):
-        _attach_docstrings(ast)
+    _DocstringAttacher().visit(ast)
     return ast
 
 
-def _attach_docstrings(node: ASTNode | None):
-    if node is None:
-        return
-
+def attach_docstring(node: ASTNode) -> None:
+    """Attach the docstring of a single FunctionNode/ClassNode (children untouched)."""
     if isinstance(node, FunctionNode):
         if isinstance(node.body, list) and node.body and isinstance(node.body[0], StringNode):
             node.docstring = _unescape_docstring(node.body[0].value)
@@ -66,16 +61,13 @@ def _attach_docstrings(node: ASTNode | None):
                 node.docstring = _unescape_docstring(members[0].value)
                 node.members = members[1:]
 
-    for attr_name in dir(node):
-        if attr_name.startswith("__"):
-            continue
-        value = getattr(node, attr_name)
-        if isinstance(value, list):
-            for child in value:
-                if isinstance(child, ASTNode):
-                    _attach_docstrings(child)
-        elif isinstance(value, ASTNode):
-            _attach_docstrings(value)
+
+class _DocstringAttacher(NodeVisitor):
+    def visit_FunctionNode(self, node: FunctionNode):
+        attach_docstring(node)
+        self.generic_visit(node)
+
+    visit_ClassNode = visit_FunctionNode
 
 
 def _unescape_docstring(text: str) -> str:
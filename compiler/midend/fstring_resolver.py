@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import pickle
 from typing import List
 
-from compiler.frontend.parser.ast_nodes import ASTNode, FStringNode
-from compiler.processer import parse_code_to_ast
-from compiler.frontend.parser.ast_nodes import StringNode, BinaryOpNode
+from compiler.frontend.parser.ast_nodes import ASTNode, FStringNode, NodeVisitor, iter_child_nodes
+from compiler.processer import parse_expression
 
 
 def resolve_fstrings(ast):
@@ -13,77 +13,78 @@ def resolve_fstrings(ast):
     real expression subtrees so downstream passes (semantic analysis,
     codegen) can treat them like regular expressions.
     """
-    if isinstance(ast, list):
-        for node in ast:
-            _resolve_node(node)
-    elif isinstance(ast, ASTNode):
-        _resolve_node(ast)
+    _FStringResolver().visit(ast)
     return ast
 
 
-def _resolve_node(node: ASTNode | None):
-    if node is None:
-        return
+def resolve_fstring(node: FStringNode) -> None:
+    """Resolve a single FStringNode; already-resolved nodes are left as they are."""
+    _resolve_fstring_parts(node)
 
-    if isinstance(node, FStringNode):
-        _resolve_fstring_parts(node)
 
-    for attr_name in dir(node):
-        if attr_name.startswith("__"):
-            continue
-        value = getattr(node, attr_name)
-        if isinstance(value, list):
-            for child in list(value):
-                if isinstance(child, ASTNode):
-                    _resolve_node(child)
-        elif isinstance(value, ASTNode):
-            _resolve_node(value)
+class _FStringResolver(NodeVisitor):
+    def visit_FStringNode(self, node: FStringNode):
+        _resolve_fstring_parts(node)
+        self.generic_visit(node)
 
 
 def _resolve_fstring_parts(node: FStringNode) -> None:
-    concatenated: List[ASTNode] = []
-    text_buffer = ""
+    """
+    Leave `node.parts` as literal text runs and parsed expressions in
+    source order, e.g. `[("text", "x="), ("expr", <x>)]`; codegen builds
+    the whole string in one runtime call from them.
+    """
+    parts: List[tuple] = []
+    text_buffer: List[str] = []
 
     def flush_text():
-        nonlocal text_buffer
         if text_buffer:
-            concatenated.append(StringNode(text_buffer, line=node.line, filename=node.filename))
-            text_buffer = ""
+            parts.append(("text", "".join(text_buffer)))
+            text_buffer.clear()
 
     for part_type, part_value in node.parts:
         if part_type == "text":
-            text_buffer += part_value
+            text_buffer.append(part_value)
         elif part_type == "expr":
-            flush_text()
             if isinstance(part_value, ASTNode):
-                concatenated.append(part_value)
+                flush_text()
+                parts.append(("expr", part_value))
             else:
                 expr_text = part_value.strip()
                 if expr_text:
-                    expr_ast = _parse_expression(expr_text, node.filename, node.line)
-                    concatenated.append(expr_ast)
+                    flush_text()
+                    parts.append(("expr", _parse_expression(expr_text, node.filename, node.line)))
     flush_text()
+    node.parts = parts
 
-    if not concatenated:
-        node.parts = [("expr", StringNode("", line=node.line, filename=node.filename))]
-        return
 
-    combined = concatenated[0]
-    for expr in concatenated[1:]:
-        combined = BinaryOpNode(combined, '+', expr, line=node.line, filename=node.filename)
-    node.parts = [("expr", combined)]
+_MAX_CACHED_HOLES = 4096
+_parsed_holes: dict[str, bytes] = {}
 
 
 def _parse_expression(expr_src: str, filename: str | None, line: int | None):
     """
-    Parse a single expression snippet using the regular compiler parser by
-    wrapping it in a minimal statement.
+    Parse one hole. Parsed holes are cached, pickled, by their source text
+    (the same `{x}` tends to appear in many f-strings); a hit is a fresh
+    copy placed at this f-string's file and line.
     """
-    code = f"{expr_src};"
-    parsed = parse_code_to_ast(code, filename or "<fstring>")
-    if not parsed:
-        raise SyntaxError(
-            f"F-string: Failed to parse expression '{expr_src}'"
-            f"{' at line ' + str(line) if line else ''}"
-        )
-    return parsed[0]
+    blob = _parsed_holes.get(expr_src)
+    if blob is None:
+        expr_ast = parse_expression(expr_src, filename or "<fstring>", line or 1)
+        if expr_ast is None:
+            raise SyntaxError(
+                f"F-string: Failed to parse expression '{expr_src}'"
+                f"{' at line ' + str(line) if line else ''}"
+            )
+        if len(_parsed_holes) >= _MAX_CACHED_HOLES:
+            _parsed_holes.clear()
+        _parsed_holes[expr_src] = pickle.dumps(expr_ast, protocol=pickle.HIGHEST_PROTOCOL)
+        return expr_ast
+
+    expr_ast = pickle.loads(blob)
+    pending = [expr_ast]
+    while pending:
+        expr_node = pending.pop()
+        expr_node.filename, expr_node.line = filename, line
+        pending.extend(iter_child_nodes(expr_node))
+    return expr_ast
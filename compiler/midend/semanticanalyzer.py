@@ -16,12 +16,34 @@ from compiler.frontend.parser.ast_nodes import (
 
     DictionaryInitializationNode, DictionaryAccessNode, DictionaryAssignmentNode,
 
-    FunctionTypeNode, ParameterNode, BreakNode, ContinueNode, NamedArgument, TypeLiteralNode
+    FunctionTypeNode, ParameterNode, BreakNode, ContinueNode, NamedArgument, TypeLiteralNode,
+
+    SliceNode, iter_child_nodes
 )
 
 from compiler.midend.symbol_table import SymbolTable
 
-from compiler.midend.built_in_fn import functions_
+from compiler.midend.built_in_fn import functions_, eray_functions_
+
+
+
+# Values a 'xadhig' (string builder) accepts in 'gali'.
+_XADHIG_PIECE_TYPES = frozenset({'eray', 'xaraf', 'tiro', 'jajab', 'miyaa'})
+
+
+# Compound expressions whose type depends only on their children and on
+# declarations, never on where the question is asked. Leaves (identifiers,
+# 'kan', literals) are cheap to look up, and CCallNode follows the function
+# currently being checked, so those are always recomputed.
+_MEMOIZED_EXPRESSION_NODES = frozenset({
+
+    BinaryOpNode, TernaryOpNode, FStringNode, MemberAccessNode, MethodCallNode,
+
+    ArrayAccessNode, SliceNode, DictionaryAccessNode, ArrayInitializationNode,
+
+    FunctionCallNode, ClassInstantiationNode, DictionaryInitializationNode,
+
+})
 
 
 
@@ -147,29 +169,27 @@ class SemanticChecker:
 
     def generic_check(self, node):
 
-        for attr_name in dir(node):
+        for child in iter_child_nodes(node):
 
-            if not attr_name.startswith("__"):
+            self.check(child)
 
-                value = getattr(node, attr_name)
 
-                if isinstance(value, list):
 
-                    for item in value:
+    def get_expression_type(self, node: ASTNode, skip_context_check=False):
 
-                        if isinstance(item, ASTNode): self.check(item)
+        """
 
-                elif isinstance(value, ASTNode): self.check(value)
+        Get the type of an expression node.
 
+        
 
+        The type of a compound expression is stored on the node the first time
 
-    def get_expression_type(self, node: ASTNode, skip_context_check=False):
+        it is known (normally while checking), so code generation reads it back
 
-        """
+        instead of re-typing the whole subtree at every level.
 
-        Get the type of an expression node.
 
-        
 
         Args:
 
@@ -179,6 +199,24 @@ class SemanticChecker:
 
         """
 
+        inferred = getattr(node, 'inferred_type', None)
+
+        if inferred is not None:
+
+            return inferred
+
+        expression_type = self._infer_expression_type(node, skip_context_check)
+
+        if expression_type is not None and type(node) in _MEMOIZED_EXPRESSION_NODES:
+
+            node.inferred_type = expression_type
+
+        return expression_type
+
+
+
+    def _infer_expression_type(self, node: ASTNode, skip_context_check=False):
+
         if not isinstance(node, ASTNode):
 
              raise SemanticError(f"Cilad Gudaha ah: get_expression_type waxaa la siiyay wax aan ASTNode ahayn: {type(node).__name__}")
@@ -228,7 +266,7 @@ class SemanticChecker:
 
                 raise SemanticError(f"Cilad Macne: Doorsoomaha '{node.name}' lama helin.\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
 
-            return var_info[1] if var_info else None
+            return var_info.var_type if var_info else None
 
         if isinstance(node, ArrayTypeQueryNode):
             var_info = self.symbol_table.get(node.identifier)
@@ -357,6 +395,18 @@ class SemanticChecker:
                 if node.method_name == 'majiraa': return 'miyaa'
                 return None
 
+            if str(object_type) == 'xadhig':
+                if node.method_name == 'gali':
+                    if len(node.args_list) != 1:
+                        raise SemanticError(f"Cilad Tirada: Hawsha 'gali' ee xadhig waxay rabtaa 1 halbeeg.\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
+                    arg_type = self.get_expression_type(node.args_list[0])
+                    if str(arg_type) not in _XADHIG_PIECE_TYPES:
+                        raise SemanticError(f"Cilad Nooca Xogta: xadhig waxaa lagu dari karaa oo kaliya eray, xaraf, tiro, jajab ama miyaa, laakiin waxaa la siiyay '{arg_type}'.\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
+                    return 'waxbo'
+                if not skip_context_check:
+                    raise SemanticError(f"Cilad: Ma jiro hawl la yiraahdo '{node.method_name}' oo saaran xadhig.\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
+                return None
+
             class_info = self.symbol_table.get(str(object_type))
             if not class_info: return None
             
@@ -392,6 +442,24 @@ class SemanticChecker:
 
             return None
 
+        if isinstance(node, SliceNode):
+
+            if not skip_context_check:
+
+                base_type = self.get_expression_type(node.value_node)
+
+                if str(base_type) != 'eray':
+
+                    raise SemanticError(f"Cilad Nooca Xogta: Qaybin [bilow:dhammaad] waxaa lagu samayn karaa oo kaliya eray, laakiin waxaa la siiyay '{base_type}'.\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
+
+                for bound in (node.start_expression, node.end_expression):
+
+                    if bound is not None and str(self.get_expression_type(bound)) != 'tiro':
+
+                        raise SemanticError(f"Cilad Nooca Xogta: Xadka qaybinta erayga waa inuu noqdaa 'tiro'.\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
+
+            return 'eray'
+
         if isinstance(node, DictionaryAccessNode):
 
             base_type = self.get_expression_type(node.dictionary_node, skip_context_check)
@@ -464,10 +532,18 @@ class SemanticChecker:
 
                 return ArrayTypeNode(line=node.line, element_type=None, filename=node.filename)
 
+            if node.name == 'xadhig' and not skip_context_check and not self.symbol_table.get(node.name):
+                if len(node.params) != 1 or str(self.get_expression_type(node.params[0])) != 'tiro':
+                    raise SemanticError(f"Cilad Nooca Xogta: 'xadhig(...)' waxay rabtaa hal halbeeg oo 'tiro' ah (awoodda bilowga).\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
+
 
 
             func_info = self.symbol_table.get(node.name)
 
+            if node.name in eray_functions_ and not func_info:
+
+                return self._eray_function_type(node, skip_context_check)
+
         
 
             # Check if it's a built-in function
@@ -636,7 +712,7 @@ class SemanticChecker:
 
             type_info = self.symbol_table.get(node.var_type)
 
-            is_primitive = node.var_type in ['tiro', 'eray', 'jajab', 'miyaa', 'xaraf', 'waxbo', 'qaamuus']
+            is_primitive = node.var_type in ['tiro', 'eray', 'jajab', 'miyaa', 'xaraf', 'waxbo', 'qaamuus', 'xadhig']
 
             is_known_class = type_info and type_info[1] == 'class_definition'
 
@@ -725,6 +801,10 @@ class SemanticChecker:
         if isinstance(object_type, ArrayTypeNode):
             self.get_expression_type(node)
             return
+        if str(object_type) == 'xadhig':
+            self.get_expression_type(node)
+            self.check(node.args_list)
+            return
         class_info = self.symbol_table.get(str(object_type))
         if not class_info or class_info[1] != 'class_definition':
             raise SemanticError(f"Cilad Macne: Hawsha '{node.method_name}' lagama yeeri karo shayga '{object_type}' (ma ahan koox).\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
@@ -808,7 +888,9 @@ class SemanticChecker:
 
     def check_IfNode(self, node: IfNode):
 
-        self.generic_check(node)
+        # Only the haddii_kale body is checked, in the enclosing scope, as the
+        # attribute walk always did; the (condition, body) cases are not.
+        self.check(node.else_case)
 
 
 
@@ -845,9 +927,34 @@ class SemanticChecker:
 
 
 
+    def _eray_function_type(self, node: FunctionCallNode, skip_context_check=False):
+        """Check a call to kala_jar/ku_dar/raadi/beddel and return its result type."""
+        spec = eray_functions_[node.name]
+        params = spec["params"]
+        if not skip_context_check:
+            minimum = len(params) - spec.get("optional", 0)
+            if not minimum <= len(node.params) <= len(params):
+                expected = f"{minimum} ilaa {len(params)}" if minimum != len(params) else str(len(params))
+                raise SemanticError(f"Cilad Tirada: Hawsha '{node.name}' waxay rabtaa {expected} halbeeg, laakiin waxaa la siiyay {len(node.params)}.\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
+            for i, (arg_node, expected_type) in enumerate(zip(node.params, params)):
+                if isinstance(arg_node, NamedArgument):
+                    raise SemanticError(f"Cilad Macne: Hawl dhaxal (built-in) '{node.name}' ma taageerto halbeegyo magac leh.\n\t\tFaylka: '{arg_node.filename}', Sadarka: {arg_node.line}")
+                arg_type = self.get_expression_type(arg_node)
+                if not self._are_types_compatible(expected_type, arg_type):
+                    raise SemanticError(f"Cilad Nooca Xogta: Qaybta {i+1} ee hawsha '{node.name}' waa inay noqotaa '{expected_type}', laakiin la siiyay '{arg_type}'.\n\t\tFaylka: '{getattr(arg_node, 'filename', node.filename)}', Sadarka: {getattr(arg_node, 'line', node.line)}")
+        if spec["return_type"] == "tix:eray":
+            return ArrayTypeNode(line=node.line, element_type='eray', filename=node.filename)
+        return spec["return_type"]
+
     def check_FunctionCallNode(self, node: FunctionCallNode):
         func_info = self.symbol_table.get(node.name)
-        is_builtin = node.name in functions_
+        # 'xadhig' is a contextual name, so a user symbol of that name shadows the builtin.
+        is_builtin = node.name in functions_ and not (node.name == 'xadhig' and func_info)
+
+        if node.name in eray_functions_ and not func_info:
+            self.get_expression_type(node)
+            self.generic_check(node)
+            return
 
         if not func_info and not is_builtin:
             raise SemanticError(f"Cilad Macne: Hawsha '{node.name}' lama helin.\n\t\tFaylka: '{node.filename}', Sadarka: {node.line}")
@@ -903,6 +1010,14 @@ class SemanticChecker:
 
 
 
+    def check_SliceNode(self, node: SliceNode):
+
+        self.get_expression_type(node)
+
+        self.generic_check(node)
+
+
+
     def check_ArrayAssignmentNode(self, node: ArrayAssignmentNode):
 
         self.generic_check(node)
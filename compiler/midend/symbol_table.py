@@ -1,19 +1,35 @@
 # midend/symbol_table.py
 
-from typing import Any, Optional, Tuple
+from typing import Any, NamedTuple, Optional
+
+class Symbol(NamedTuple):
+    """
+    One binding in the symbol table.
+
+    It still unpacks and indexes like the old `(value, type, return_type)`
+    tuple. `depth` is the scope it lives in (0 is global).
+    """
+    value: Any
+    var_type: Any
+    return_type: Optional[str]
+    depth: int
 
 class SymbolTable:
     """
     SymbolTable for Tusmo language.
 
     - Supports multiple scopes (global + local)
-    - Variables stored as tuple: (value, type, return_type)
+    - Variables are stored as `Symbol` records
     - Functions can have return_type
+    - Every name maps to a stack of its live bindings (innermost last), so
+      lookups cost the same however deeply scopes are nested
     """
 
     def __init__(self) -> None:
         # Stack of scopes, first is global
-        self.scopes: list[dict[str, Tuple[Any, str, Optional[str]]]] = [{}]
+        self.scopes: list[dict[str, Symbol]] = [{}]
+        # name -> bindings visible from the current scope, innermost last
+        self._bindings: dict[str, list[Symbol]] = {}
 
     # ---------------- Scope Management ----------------
     def push_scope(self) -> None:
@@ -23,34 +39,59 @@ class SymbolTable:
     def pop_scope(self) -> None:
         """Exit current scope."""
         if len(self.scopes) > 1:  # Keep global scope
-            self.scopes.pop()
+            for name in self.scopes.pop():
+                stack = self._bindings[name]
+                stack.pop()
+                if not stack:
+                    del self._bindings[name]
         else:
             raise Exception("Cannot pop global scope")
 
+    @property
+    def depth(self) -> int:
+        """Depth of the current scope (0 is global)."""
+        return len(self.scopes) - 1
+
     # ---------------- Variable Management ----------------
-    def set(self, name: str, var_type: str, value: Any = None, return_type: Optional[str] = None) -> None:
+    def _bind(self, depth: int, name: str, var_type: Any, value: Any, return_type: Optional[str]) -> Symbol:
+        scope = self.scopes[depth]
+        previous = scope.get(name)
+        symbol = Symbol(value, var_type, return_type, depth)
+        scope[name] = symbol
+
+        stack = self._bindings.setdefault(name, [])
+        if previous is None:
+            # Keep the stack ordered by depth; a global added from inside a
+            # nested scope goes underneath any local shadowing it.
+            position = len(stack)
+            while position and stack[position - 1].depth > depth:
+                position -= 1
+            stack.insert(position, symbol)
+        else:
+            stack[stack.index(previous)] = symbol
+        return symbol
+
+    def set(self, name: str, var_type: str, value: Any = None, return_type: Optional[str] = None) -> Symbol:
         """
         Set variable in current scope.
         """
-        self.scopes[-1][name] = (value, var_type, return_type)
+        return self._bind(self.depth, name, var_type, value, return_type)
 
-    def set_global(self, name: str, var_type: str, value: Any = None, return_type: Optional[str] = None) -> None:
+    def set_global(self, name: str, var_type: str, value: Any = None, return_type: Optional[str] = None) -> Symbol:
         """
         Set variable in global scope.
         """
         if self.exists_in_global_scope(name):
             raise Exception(f"Khalad: '{name}' hore ayaa loo qeexay global scope.")
-        self.scopes[0][name] = (value, var_type, return_type)
+        return self._bind(0, name, var_type, value, return_type)
 
-    def get(self, name: str) -> Optional[Tuple[Any, str, Optional[str]]]:
+    def get(self, name: str) -> Optional[Symbol]:
         """
         Lookup variable from current scope up to global.
-        Returns (value, type, return_type) or None.
+        Returns the innermost `Symbol` or None.
         """
-        for scope in reversed(self.scopes):
-            if name in scope:
-                return scope[name]
-        return None
+        stack = self._bindings.get(name)
+        return stack[-1] if stack else None
 
     # ---------------- Existence Checks ----------------
     def exists_in_current_scope(self, name: str) -> bool:
@@ -71,8 +112,8 @@ class SymbolTable:
         if not current_scope:
             print("  (Empty)")
         else:
-            for name, (value, var_type, ret_type) in current_scope.items():
-                print(f"  {name} ({var_type}) = {value}, return_type={ret_type}")
+            for name, symbol in current_scope.items():
+                print(f"  {name} ({symbol.var_type}) = {symbol.value}, return_type={symbol.return_type}")
         print("========================================")
 
     def dump_all(self) -> None:
@@ -83,6 +124,6 @@ class SymbolTable:
             if not scope:
                 print("  (Empty)")
             else:
-                for name, (value, var_type, ret_type) in scope.items():
-                    print(f"  {name} ({var_type}) = {value}, return_type={ret_type}")
+                for name, symbol in scope.items():
+                    print(f"  {name} ({symbol.var_type}) = {symbol.value}, return_type={symbol.return_type}")
         print("========================================")
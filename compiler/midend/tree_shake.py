@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from compiler.frontend.parser.ast_nodes import (
+    ArrayTypeNode, ClassInstantiationNode, ClassNode, EmbeddedCNode, FunctionCallNode, FunctionNode,
+    FunctionTypeNode, IdentifierNode, KeydNode, MethodCallNode, NodeVisitor, ParameterNode, TypeLiteralNode,
+)
+
+CONSTRUCTOR_NAME = "dhis"
+
+
+def shake_tree(ast, roots=None):
+    """
+    Drop the top-level functions and classes, and the class methods, that
+    the program can never reach, before semantic checking and codegen.
+
+    Reachability starts from the top-level statements (the body of `main`)
+    and from every function and class (with all its methods) in `roots`,
+    normally the entry file's own AST, so mistakes in the user's own code
+    are still reported. It follows calls, functions used as values,
+    instantiations, method calls (by name, on every reachable class) and
+    class names used as types; a reachable class keeps its parent chain and
+    its constructor.
+
+    Programs that reach embedded C (`___c__code_`) are left untouched, since
+    that code can call anything. `ast` is filtered in place and returned.
+    """
+    functions, classes = {}, {}
+    for node in ast:
+        if isinstance(node, FunctionNode):
+            functions.setdefault(node.name, []).append(node)
+        elif isinstance(node, ClassNode):
+            classes.setdefault(node.name, []).append(node)
+
+    reach = _Reachability(functions, classes)
+    root_ids = {id(node) for node in roots or ()}
+    for node in ast:
+        if not isinstance(node, (FunctionNode, ClassNode)):
+            reach.visit(node)
+        elif id(node) in root_ids:
+            if isinstance(node, FunctionNode):
+                reach.use_function(node.name)
+            else:
+                reach.use_class(node.name)
+                for method in node.methods:
+                    reach.keep(method)
+    reach.run()
+    if reach.embedded_c:
+        return ast
+
+    ast[:] = [
+        node for node in ast
+        if not isinstance(node, (FunctionNode, ClassNode))
+        or id(node) in reach.kept
+    ]
+    for node in ast:
+        if isinstance(node, ClassNode):
+            node.methods = [method for method in node.methods if id(method) in reach.kept]
+    return ast
+
+
+def _type_names(type_spec):
+    """Class names mentioned by a type: a plain name, `tix:T` or `hawl(...):T`."""
+    if isinstance(type_spec, str):
+        yield type_spec
+    elif isinstance(type_spec, ArrayTypeNode):
+        yield from _type_names(type_spec.element_type)
+    elif isinstance(type_spec, FunctionTypeNode):
+        for param_type in type_spec.param_types:
+            yield from _type_names(param_type)
+        yield from _type_names(type_spec.return_type)
+
+
+class _Reachability(NodeVisitor):
+    """
+    Worklist over function/class names. Bodies are only visited once the
+    definition is reached; a method is reached once its class is and some
+    reached code calls a method of that name.
+    """
+
+    def __init__(self, functions, classes):
+        self.functions = functions
+        self.classes = classes
+        self.kept = set()
+        self.used_classes = set()
+        self.called_methods = {CONSTRUCTOR_NAME}
+        self.pending = []
+        self.embedded_c = False
+
+    def run(self):
+        while self.pending:
+            self.visit(self.pending.pop())
+
+    def keep(self, node):
+        if id(node) not in self.kept:
+            self.kept.add(id(node))
+            self.pending.append(node)
+
+    def use_function(self, name):
+        for node in self.functions.get(name, ()):
+            self.keep(node)
+
+    def use_class(self, name):
+        if name in self.used_classes or name not in self.classes:
+            return
+        self.used_classes.add(name)
+        for node in self.classes[name]:
+            self.kept.add(id(node))
+            if node.parent_name:
+                self.use_class(node.parent_name)
+            for member in node.members:
+                self.visit(member)
+            for method in node.methods:
+                if method.name in self.called_methods:
+                    self.keep(method)
+
+    def use_method(self, name):
+        if name in self.called_methods:
+            return
+        self.called_methods.add(name)
+        for class_name in self.used_classes:
+            for node in self.classes[class_name]:
+                for method in node.methods:
+                    if method.name == name:
+                        self.keep(method)
+
+    def use_types(self, type_spec):
+        for name in _type_names(type_spec):
+            self.use_class(name)
+
+    # Definitions are only entered through the worklist.
+    def visit_FunctionNode(self, node: FunctionNode):
+        self.use_types(node.return_type)
+        self.generic_visit(node)
+
+    def visit_ClassNode(self, node: ClassNode):
+        pass
+
+    def visit_FunctionCallNode(self, node: FunctionCallNode):
+        self.use_function(node.name)
+        self.generic_visit(node)
+
+    def visit_IdentifierNode(self, node: IdentifierNode):
+        # Magac hawleed oo qiime ahaan loo isticmaalay (function pointer).
+        self.use_function(node.name)
+
+    def visit_ClassInstantiationNode(self, node: ClassInstantiationNode):
+        self.use_class(node.class_name)
+        self.generic_visit(node)
+
+    def visit_MethodCallNode(self, node: MethodCallNode):
+        self.use_method(node.method_name)
+        self.generic_visit(node)
+
+    def visit_KeydNode(self, node: KeydNode):
+        self.use_types(node.var_type)
+        self.generic_visit(node)
+
+    def visit_ParameterNode(self, node: ParameterNode):
+        self.use_types(node.param_type)
+        self.generic_visit(node)
+
+    def visit_TypeLiteralNode(self, node: TypeLiteralNode):
+        self.use_class(node.type_name)
+
+    def visit_EmbeddedCNode(self, node: EmbeddedCNode):
+        self.embedded_c = True
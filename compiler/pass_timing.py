@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from compiler.frontend.parser.ast_nodes import ASTNode, iter_child_nodes
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kb() -> int | None:
+    """Peak resident set size of this process in KiB, or None when unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def count_nodes(ast) -> int:
+    """Number of AST nodes reachable from `ast` (a node or a list of nodes)."""
+    stack = list(ast) if isinstance(ast, list) else [ast]
+    count = 0
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ASTNode):
+            count += 1
+            stack.extend(iter_child_nodes(node))
+    return count
+
+
+@dataclass
+class PassRecord:
+    """Measurements for one compiler stage, or for one imported module."""
+
+    name: str
+    start: float
+    wall: float
+    cpu: float
+    peak_rss_kb: int | None = None
+    nodes: int | None = None
+    module: str | None = None
+    pid: int = field(default_factory=os.getpid)
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "module": self.module,
+            "start_ms": round(self.start * 1000, 3),
+            "wall_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "peak_rss_kb": self.peak_rss_kb,
+            "nodes": self.nodes,
+            "pid": self.pid,
+        }
+
+
+class PassTimer:
+    """
+    Collects wall time, CPU time, peak RSS and AST node counts per compiler
+    stage. A disabled timer measures nothing, so the driver can wrap its
+    stages unconditionally.
+    """
+
+    FORMATS = ("table", "json", "chrome")
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.records: list[PassRecord] = []
+        self._origin = time.perf_counter()
+        self._origin_epoch = time.time()
+
+    @contextmanager
+    def measure(self, name: str, module: str | None = None):
+        """
+        Time the body of the `with` block. The yielded record may be given a
+        node count (`record.nodes = ...`) before the block ends.
+        """
+        if not self.enabled:
+            yield PassRecord(name, 0.0, 0.0, 0.0)
+            return
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        record = PassRecord(name, wall_start - self._origin, 0.0, 0.0, module=module)
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - wall_start
+            record.cpu = time.process_time() - cpu_start
+            record.peak_rss_kb = peak_rss_kb()
+            self.records.append(record)
+
+    def add(self, name: str, started_epoch: float, wall: float, cpu: float,
+            module: str | None = None, pid: int | None = None, nodes: int | None = None) -> None:
+        """Record a stage measured elsewhere, e.g. a module parsed in a worker process."""
+        if not self.enabled:
+            return
+        self.records.append(PassRecord(
+            name, started_epoch - self._origin_epoch, wall, cpu,
+            nodes=nodes, module=module, pid=pid if pid is not None else os.getpid(),
+        ))
+
+    def count_nodes(self, ast) -> int | None:
+        return count_nodes(ast) if self.enabled else None
+
+    # ---------------- Output ----------------
+    def format_table(self) -> str:
+        rows = [("Marxalad (stage)", "wall ms", "cpu ms", "peak RSS KiB", "nodes")]
+        for record in self.records:
+            label = record.name if record.module is None else f"  {record.name} {record.module}"
+            rows.append((
+                label,
+                f"{record.wall * 1000:.2f}",
+                f"{record.cpu * 1000:.2f}",
+                "-" if record.peak_rss_kb is None else str(record.peak_rss_kb),
+                "-" if record.nodes is None else str(record.nodes),
+            ))
+        top_level = [r for r in self.records if r.module is None]
+        rows.append((
+            "Wadar (total)",
+            f"{sum(r.wall for r in top_level) * 1000:.2f}",
+            f"{sum(r.cpu for r in top_level) * 1000:.2f}",
+            str(peak_rss_kb() or "-"),
+            "",
+        ))
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = []
+        for index, row in enumerate(rows):
+            cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+            lines.append("  ".join(cells))
+            if index == 0 or index == len(rows) - 2:
+                lines.append("  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def to_json(self) -> dict:
+        return {"passes": [record.as_dict() for record in self.records], "peak_rss_kb": peak_rss_kb()}
+
+    def to_chrome_trace(self) -> dict:
+        """Trace Event Format, loadable in chrome://tracing or Perfetto."""
+        events = []
+        for record in self.records:
+            args = {"cpu_ms": round(record.cpu * 1000, 3)}
+            if record.peak_rss_kb is not None:
+                args["peak_rss_kb"] = record.peak_rss_kb
+            if record.nodes is not None:
+                args["nodes"] = record.nodes
+            events.append({
+                "name": record.name if record.module is None else f"{record.name} {os.path.basename(record.module)}",
+                "cat": "module" if record.module else "pass",
+                "ph": "X",
+                "ts": round(record.start * 1_000_000),
+                "dur": round(record.wall * 1_000_000),
+                "pid": record.pid,
+                "tid": record.pid,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def report(self, fmt: str = "table", output: str | None = None) -> None:
+        """Write the report in `fmt` to `output`, or to stderr when no path is given."""
+        if fmt == "table":
+            text = self.format_table() + "\n"
+        elif fmt == "json":
+            text = json.dumps(self.to_json(), indent=2) + "\n"
+        elif fmt == "chrome":
+            text = json.dumps(self.to_chrome_trace()) + "\n"
+        else:
+            raise ValueError(f"Qaab aan la aqoon: {fmt}")
+        if output:
+            with open(output, "w") as f:
+                f.write(text)
+        else:
+            sys.stderr.write(text)
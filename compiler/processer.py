@@ -1,9 +1,14 @@
+import concurrent.futures
+import contextlib
+import io
 import sys
 import os
-from compiler.frontend.parser.ast_nodes import KeenNode
+import time
+from compiler.frontend.parser.ast_nodes import ExpressionNode, KeenNode
 from compiler.frontend.lexer.lexer import lexer
 from compiler.frontend.parser.parser import parser
 from compiler.midend.docstring_utils import preprocess_docstrings
+from compiler.ast_cache import module_ast_cache
 
 def find_and_read_file(file_path):
     """Wuxuu si badbaado leh u furaa oo u akhriyaa fayl."""
@@ -24,10 +29,169 @@ def parse_code_to_ast(code, filename):
         return []
     return ast
 
-def process_imports(initial_ast_nodes, base_directory, stdlib_path="stdlib", processed_files=None):
+_expression_lexer = None
+
+
+def parse_expression(source, filename, line=1):
+    """
+    Parse a single expression, e.g. an f-string hole. It runs on a lexer of
+    its own, so the filename and line of the file being lexed are left
+    alone; line numbers in the result start at `line`. Returns None when
+    `source` is not one expression.
+    """
+    global _expression_lexer
+    if _expression_lexer is None:
+        _expression_lexer = lexer.clone()
+    _expression_lexer.filename = filename
+    _expression_lexer.lineno = line
+    ast = parser.parse(f"{source};", lexer=_expression_lexer)
+    if not ast or len(ast) != 1 or not isinstance(ast[0], ExpressionNode):
+        return None
+    return ast[0]
+
+def load_module_ast(file_path):
+    """
+    Wuxuu soo celiyaa AST-ga module-ka, isagoo ka qaadanaya kaydka (cache)
+    haddii faylku aanu isbeddelin, haddii kalena wuu parse-gareynayaa oo kaydinayaa.
+    """
+    imported_code = find_and_read_file(file_path)
+    cached_ast = module_ast_cache.load(file_path, imported_code)
+    if cached_ast is not None:
+        return cached_ast
+    imported_ast = parse_code_to_ast(imported_code, file_path)
+    module_ast_cache.store(file_path, imported_code, imported_ast)
+    return imported_ast
+
+def resolve_import_path(module_name, base_directory, stdlib_path="stdlib"):
+    """
+    Wuxuu helaa waddada buuxda ee module-ka 'keen' loogu yeeray, ama None haddii la waayo.
+    """
+    if module_name.endswith(".tus"):
+        file_to_import = module_name
+    else:
+        file_to_import = module_name + ".tus"
+
+    # --- Istaraatiijiyadda Raadinta Faylka ---
+    # 1. Marka hore, ka hubi galka uu ku jiro faylka hadda la shaqeynayo.
+    # 2. Haddii aan laga helin deegaanka, ka hubi maktabadda `library`.
+    # 3. Haddii aan laga helin maktabadda, ka hubi maktabadda asaasiga ah (stdlib).
+    for candidate in (
+        os.path.join(base_directory, file_to_import),
+        os.path.join("lib", file_to_import),
+        os.path.join(stdlib_path, file_to_import),
+    ):
+        candidate = os.path.abspath(candidate)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+def _top_level_imports(ast_nodes, base_directory, stdlib_path):
+    for node in ast_nodes:
+        if isinstance(node, KeenNode):
+            found_path = resolve_import_path(node.filename.strip('"\''), base_directory, stdlib_path)
+            if found_path:
+                yield found_path
+
+def _parse_module_worker(file_path):
+    """
+    Process-pool entry point: each worker process has its own lexer/parser.
+    Returns (AST or None, start time, wall seconds, CPU seconds, pid).
+    """
+    started, wall_start, cpu_start = time.time(), time.perf_counter(), time.process_time()
+    # Ciladaha naxwaha waxaa mar kale soo sheegaya marxaladda isku-darka (merge).
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            module_ast = load_module_ast(file_path)
+        except (Exception, SystemExit):
+            module_ast = None
+    return module_ast, started, time.perf_counter() - wall_start, time.process_time() - cpu_start, os.getpid()
+
+def default_jobs():
+    """Tirada shaqaalaha isbarbar socda: TUSMO_JOBS, haddii kale tirada CPU-yada."""
+    return int(os.environ.get("TUSMO_JOBS", "0")) or os.cpu_count() or 1
+
+def preparse_imports(initial_ast_nodes, base_directory, stdlib_path="stdlib", jobs=None, timer=None):
+    """
+    Wuxuu ogaadaa garaafka 'keen' oo dhan heer-heer, wuxuuna modules-ka aan
+    kaydka ku jirin si isbarbar socda (process pool) ugu parse-gareeyaa.
+    Wuxuu soo celiyaa {waddo: AST}; process_imports ayaa markaas isku daraya
+    isla habka caadiga ah si natiijadu u noqoto mid go'an.
+    Haddii `timer` (PassTimer) la siiyo, module kasta waqtigiisa waa la qoraa.
+    """
+    roots = _top_level_imports(initial_ast_nodes, base_directory, stdlib_path)
+    return preparse_modules(roots, stdlib_path, jobs, timer)
+
+def preparse_modules(paths, stdlib_path="stdlib", jobs=None, timer=None):
+    """
+    Sida preparse_imports, laakiin wuxuu ka bilaabaa liis faylal ah (tusaale:
+    barnaamijyo badan oo hal mar la turjumayo). Faylasha laftooda iyo wax
+    kasta oo ay 'keen' gareeyaan mar keliya ayaa la parse-gareeyaa.
+    """
+    if jobs is None:
+        jobs = default_jobs()
+
+    parsed = {}
+    frontier = list(dict.fromkeys(paths))
+    executor = None
+    try:
+        while frontier:
+            misses = []
+            for path in frontier:
+                started, wall_start, cpu_start = time.time(), time.perf_counter(), time.process_time()
+                try:
+                    cached_ast = module_ast_cache.load(path)
+                except Exception:
+                    cached_ast = None
+                if cached_ast is not None:
+                    parsed[path] = cached_ast
+                    if timer is not None:
+                        timer.add("kayd (cache)", started, time.perf_counter() - wall_start,
+                                  time.process_time() - cpu_start, module=path,
+                                  nodes=timer.count_nodes(cached_ast))
+                else:
+                    misses.append(path)
+
+            if len(misses) > 1 and jobs > 1:
+                if executor is None:
+                    executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+                futures = [executor.submit(_parse_module_worker, path) for path in misses]
+                results = []
+                for future in futures:
+                    try:
+                        results.append(future.result())
+                    except Exception:
+                        # Tusaale: AST aad u qoto dheer oo aan la pickle-gareyn karin.
+                        results.append(None)
+            else:
+                results = [_parse_module_worker(path) for path in misses]
+
+            for path, result in zip(misses, results):
+                if result is None:
+                    continue
+                module_ast, started, wall, cpu, pid = result
+                if module_ast is not None:
+                    parsed[path] = module_ast
+                if timer is not None:
+                    timer.add("parse", started, wall, cpu, module=path, pid=pid,
+                              nodes=timer.count_nodes(module_ast) if module_ast is not None else None)
+
+            next_frontier = []
+            for path in frontier:
+                if path in parsed:
+                    for child in _top_level_imports(parsed[path], os.path.dirname(path), stdlib_path):
+                        if child not in parsed and child not in next_frontier:
+                            next_frontier.append(child)
+            frontier = next_frontier
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return parsed
+
+def process_imports(initial_ast_nodes, base_directory, stdlib_path="stdlib", processed_files=None, parsed_modules=None):
     """
     Wuxuu si is-daba-joog ah u raadiyaa dhammaan qodobbada 'keen', wuxuuna soo celiyaa
-    hal AST oo la isku daray.
+    hal AST oo la isku daray. `parsed_modules` (ka yimid preparse_imports) waxaa
+    loo isticmaalaa halkii module-ka mar kale la parse-gareyn lahaa.
     """
     if processed_files is None:
         processed_files = set()
@@ -37,28 +201,7 @@ def process_imports(initial_ast_nodes, base_directory, stdlib_path="stdlib", pro
     for node in initial_ast_nodes:
         if isinstance(node, KeenNode):
             module_name = node.filename.strip('"\'')
-            if module_name.endswith(".tus"):
-                file_to_import = module_name
-            else:
-                file_to_import = module_name + ".tus"
-            found_path = None
-
-            # --- Istaraatiijiyadda Raadinta Faylka ---
-            # 1. Marka hore, ka hubi galka uu ku jiro faylka hadda la shaqeynayo.
-            potential_local_path = os.path.abspath(os.path.join(base_directory, file_to_import))
-            
-            if os.path.exists(potential_local_path):
-                found_path = potential_local_path
-            else:
-                # 2. Haddii aan laga helin deegaanka, ka hubi maktabadda `library`.
-                potential_library_path = os.path.abspath(os.path.join("lib", file_to_import))
-                if os.path.exists(potential_library_path):
-                    found_path = potential_library_path
-                else:
-                    # 3. Haddii aan laga helin maktabadda, ka hubi maktabadda asaasiga ah (stdlib).
-                    potential_stdlib_path = os.path.abspath(os.path.join(stdlib_path, file_to_import))
-                    if os.path.exists(potential_stdlib_path):
-                        found_path = potential_stdlib_path
+            found_path = resolve_import_path(module_name, base_directory, stdlib_path)
 
             # --- Cilad haddii faylka la waayo ---
             if not found_path:
@@ -74,11 +217,13 @@ def process_imports(initial_ast_nodes, base_directory, stdlib_path="stdlib", pro
             processed_files.add(found_path)
 
             try:
-                imported_code = find_and_read_file(found_path)
-                imported_ast = parse_code_to_ast(imported_code, found_path)
+                if parsed_modules and found_path in parsed_modules:
+                    imported_ast = parsed_modules[found_path]
+                else:
+                    imported_ast = load_module_ast(found_path)
                 
                 new_base_dir = os.path.dirname(found_path)
-                resolved_imported_ast = process_imports(imported_ast, new_base_dir, stdlib_path, processed_files)
+                resolved_imported_ast = process_imports(imported_ast, new_base_dir, stdlib_path, processed_files, parsed_modules)
                 
                 final_ast.extend(resolved_imported_ast)
 
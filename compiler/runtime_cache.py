@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from typing import Iterable
+
+_compiler_identities: dict[str, str] = {}
+_compiler_identities_lock = threading.Lock()
+
+
+def default_cache_dir() -> str:
+    """
+    Where build artefacts are kept between compiler invocations.
+    `TUSMO_CACHE_DIR` wins, then `$XDG_CACHE_HOME/tusmo`, then `~/.cache/tusmo`.
+    """
+    override = os.environ.get("TUSMO_CACHE_DIR")
+    if override:
+        return override
+    xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg, "tusmo")
+
+
+def _hash_file(path: str, digest) -> None:
+    with open(path, "rb") as f:
+        digest.update(f.read())
+
+
+def runtime_headers(runtime_dir: str) -> list[str]:
+    return sorted(
+        os.path.join(runtime_dir, name)
+        for name in os.listdir(runtime_dir)
+        if name.endswith(".h")
+    )
+
+
+def compiler_identity(cc: str) -> str:
+    """
+    What the C compiler `cc` actually is, not just its name: the executable
+    it resolves to plus its `--version` and `-dumpmachine` output. Upgrading
+    gcc/clang or pointing `cc` at another compiler changes it, so objects
+    (and LTO IR) built by a different compiler are never reused. Resolved
+    once per process; falls back to the name when `cc` cannot be run.
+    """
+    with _compiler_identities_lock:
+        identity = _compiler_identities.get(cc)
+        if identity is None:
+            resolved = shutil.which(cc)
+            parts = [cc, os.path.realpath(resolved) if resolved else ""]
+            for probe in ("--version", "-dumpmachine"):
+                try:
+                    result = subprocess.run([cc, probe], capture_output=True, text=True, timeout=30)
+                    parts.append(result.stdout)
+                except (OSError, subprocess.SubprocessError):
+                    parts.append("")
+            identity = _compiler_identities[cc] = hashlib.sha256("\0".join(parts).encode()).hexdigest()
+        return identity
+
+
+def runtime_object_key(cc: str, flags: list[str], source: str, headers: Iterable[str]) -> str:
+    """
+    Cache key for one runtime object: the compiler's identity, the exact
+    flags, the source bytes and every runtime header the source may include.
+    """
+    digest = hashlib.sha256()
+    digest.update(compiler_identity(cc).encode())
+    digest.update(b"\0")
+    digest.update(" ".join(flags).encode())
+    digest.update(b"\0")
+    _hash_file(source, digest)
+    for header in headers:
+        digest.update(os.path.basename(header).encode())
+        _hash_file(header, digest)
+    return digest.hexdigest()[:24]
+
+
+def compile_runtime_objects(
+    cc: str,
+    flags: list[str],
+    sources: list[str],
+    include_dirs: list[str],
+    runtime_dir: str,
+    cache_dir: str | None = None,
+    jobs: int = 1,
+) -> list[str] | None:
+    """
+    Compile each runtime source to an object file once and reuse it on later
+    builds. Returns the object paths in the same order as `sources`, or None
+    when an object could not be built so the caller can fall back to handing
+    the sources to the C compiler directly.
+    """
+    object_dir = os.path.join(cache_dir or default_cache_dir(), "runtime")
+    return compile_objects(cc, flags, sources, include_dirs, runtime_headers(runtime_dir), object_dir, jobs)
+
+
+def compile_objects(
+    cc: str,
+    flags: list[str],
+    sources: list[str],
+    include_dirs: list[str],
+    headers: Iterable[str],
+    object_dir: str,
+    jobs: int = 1,
+) -> list[str] | None:
+    """
+    Compile `sources` to objects in `object_dir`, up to `jobs` at a time,
+    reusing any object whose source, `headers` and flags are unchanged.
+    Returns the object paths in the order of `sources`, or None when one
+    failed to compile (the C compiler's diagnostics are already printed).
+    """
+    try:
+        os.makedirs(object_dir, exist_ok=True)
+    except OSError:
+        return None
+
+    headers = list(headers)
+    include_args = [f"-I{path}" for path in include_dirs]
+
+    def build(source):
+        stem = os.path.splitext(os.path.basename(source))[0]
+        key = runtime_object_key(cc, flags + include_args, source, headers)
+        object_path = os.path.join(object_dir, f"{stem}-{key}.o")
+
+        if not os.path.exists(object_path):
+            # Write next to the final name and rename, so concurrent builds never
+            # link a half-written object.
+            tmp_path = f"{object_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            command = [cc, *flags, "-c", source, "-o", tmp_path, *include_args]
+            result = subprocess.run(command)
+            if result.returncode != 0:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return None
+            os.replace(tmp_path, object_path)
+        return object_path
+
+    if jobs > 1 and len(sources) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+            objects = list(pool.map(build, sources))
+    else:
+        objects = []
+        for source in sources:
+            objects.append(build(source))
+            if objects[-1] is None:
+                break
+    return None if None in objects else objects
@@ -0,0 +1,146 @@
+"""
+Which runtime object a program has to be linked with, worked out from the
+runtime itself instead of from hand-written feature names.
+
+The manifest is generated from `runtime/`:
+
+* the public API is every function prototype and function-like macro in
+  `tusmo_runtime.h` and the runtime headers it includes;
+* a runtime object is a `.c` file there that includes one of those
+  headers; the non-static functions it defines are its symbols;
+* an object requires every other object whose functions it calls
+  (e.g. `array.c` prints mixed arrays through `dictionary.c`).
+
+Code generation records which public symbols the generated C mentions
+(`symbols_in`) and the driver links `sources_for(symbols)`: exactly the
+objects that define them plus what those objects need in turn.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+RUNTIME_HEADER = "tusmo_runtime.h"
+
+_IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+_COMMENT_OR_LITERAL = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.S)
+_LOCAL_INCLUDE = re.compile(r'^\s*#\s*include\s+"([^"]+)"', re.M)
+_MACRO = re.compile(r"^\s*#\s*define\s+([A-Za-z_]\w*)\((.*)$", re.M)
+_PROTOTYPE = re.compile(r"\b([A-Za-z_]\w*)\s*\([^;{}()]*\)\s*;")
+# A function definition: `<prefix> name(params) {` where params may hold one
+# level of parentheses (function-pointer parameters).
+_DEFINITION = re.compile(
+    r"^([^\n;{}#]*?)\b([A-Za-z_]\w*)\s*\((?:[^;{}()]|\([^()]*\))*\)\s*\{", re.M
+)
+_NOT_FUNCTIONS = frozenset({"if", "for", "while", "switch", "return", "sizeof", "else", "do"})
+
+
+def _strip_comments(code: str) -> str:
+    return _COMMENT_OR_LITERAL.sub(" ", code)
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+@dataclass(frozen=True)
+class RuntimeManifest:
+    runtime_dir: str
+    # Public symbol (function or macro) -> the runtime sources defining it.
+    symbols: dict[str, tuple[str, ...]]
+    # Runtime source -> the other runtime sources it calls into.
+    requires: dict[str, tuple[str, ...]]
+
+    @property
+    def sources(self) -> list[str]:
+        """Every runtime object, as source paths."""
+        return [os.path.join(self.runtime_dir, name) for name in sorted(self.requires)]
+
+    def symbols_in(self, text: str) -> set[str]:
+        """The runtime symbols mentioned in a piece of generated C."""
+        return self.symbols.keys() & set(_IDENTIFIER.findall(text))
+
+    def sources_for(self, symbols: Iterable[str]) -> list[str]:
+        """The runtime `.c` files a program using `symbols` must be linked with."""
+        needed = set()
+        pending = [name for symbol in symbols for name in self.symbols.get(symbol, ())]
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.requires.get(name, ()))
+        return [os.path.join(self.runtime_dir, name) for name in sorted(needed)]
+
+
+def _headers(runtime_dir: str, name: str, seen: dict[str, str]) -> None:
+    path = os.path.join(runtime_dir, name)
+    if name in seen or not os.path.exists(path):
+        return
+    code = _read(path)
+    seen[name] = _strip_comments(code)
+    for included in _LOCAL_INCLUDE.findall(code):
+        _headers(runtime_dir, included, seen)
+
+
+def _macros(header: str) -> dict[str, set[str]]:
+    """Function-like macros and the identifiers their (continued) bodies use."""
+    joined = header.replace("\\\n", " ")
+    return {name: set(_IDENTIFIER.findall(body)) for name, body in _MACRO.findall(joined)}
+
+
+def build_manifest(runtime_dir: str) -> RuntimeManifest:
+    headers: dict[str, str] = {}
+    _headers(runtime_dir, RUNTIME_HEADER, headers)
+
+    declared = set()
+    macros = {}
+    for header in headers.values():
+        macros.update(_macros(header))
+        without_macros = _MACRO.sub("", header.replace("\\\n", " "))
+        declared.update(_PROTOTYPE.findall(without_macros))
+
+    defined_in: dict[str, str] = {}
+    sources: dict[str, str] = {}
+    for name in sorted(os.listdir(runtime_dir)):
+        if not name.endswith(".c"):
+            continue
+        code = _read(os.path.join(runtime_dir, name))
+        if not headers.keys() & set(_LOCAL_INCLUDE.findall(code)):
+            continue  # Not part of the Tusmo runtime (e.g. vendored libraries).
+        code = sources[name] = _strip_comments(code)
+        for prefix, function in _DEFINITION.findall(code):
+            if function not in _NOT_FUNCTIONS and "static" not in prefix.split():
+                defined_in.setdefault(function, name)
+
+    symbols = {symbol: (defined_in[symbol],) for symbol in declared if symbol in defined_in}
+    for macro, used in macros.items():
+        objects = tuple(sorted({defined_in[symbol] for symbol in used if symbol in defined_in}))
+        if objects:
+            symbols[macro] = objects
+
+    requires = {}
+    for name, code in sources.items():
+        used = set(_IDENTIFIER.findall(code))
+        requires[name] = tuple(sorted({defined_in[symbol] for symbol in used if symbol in defined_in} - {name}))
+    return RuntimeManifest(runtime_dir, symbols, requires)
+
+
+_manifests: dict[tuple, RuntimeManifest] = {}
+
+
+def runtime_manifest(runtime_dir: str) -> RuntimeManifest:
+    """The manifest for `runtime_dir`, built once and rebuilt when a runtime file changes."""
+    key = (runtime_dir, *(
+        (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+        for entry in sorted(os.scandir(runtime_dir), key=lambda entry: entry.name)
+        if entry.name.endswith((".c", ".h"))
+    ))
+    manifest = _manifests.get(key)
+    if manifest is None:
+        _manifests.clear()
+        manifest = _manifests[key] = build_manifest(runtime_dir)
+    return manifest
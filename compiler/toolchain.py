@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import glob
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, replace
+from typing import Callable, Iterable
+
+from compiler.runtime_manifest import runtime_manifest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNTIME_DIR = os.path.join(PROJECT_ROOT, "runtime")
+STDLIB_DIR = os.path.join(PROJECT_ROOT, "stdlib")
+
+# Every function and data object gets its own section, so the linker can
+# drop whatever a program does not reach (`--gc-sections`).
+SECTION_FLAGS = ("-ffunction-sections", "-fdata-sections")
+# Runtime strings carry their length and hash in a header (runtime/string.c).
+COUNTED_STRINGS_FLAG = "-DTUSMO_COUNTED_STRINGS"
+# Seconds the PGO training run may take before the build gives up on it.
+DEFAULT_PGO_TIMEOUT = 300.0
+
+
+@dataclass(frozen=True)
+class BuildProfile:
+    """
+    How the generated C and the runtime are compiled, selected with
+    `--profile`. With `split_units` every `.tus` module becomes its own
+    translation unit, compiled in parallel and cached per module.
+    """
+
+    name: str
+    c_flags: tuple[str, ...]
+    description: str
+    pgo: bool = False
+    split_units: bool = False
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        BuildProfile(
+            "dev", ("-O1", "-g"),
+            "Dhisid degdeg ah: -O1, LTO la'aan, runtime-ka horay loo diyaariyay, "
+            "module kasta C gaar ah oo isbarbar loo dhiso",
+            split_units=True,
+        ),
+        BuildProfile(
+            "release", ("-O3", "-march=native", "-flto", *SECTION_FLAGS),
+            "Barnaamij dhakhso badan oo yar: -O3 -march=native -flto, qaybaha aan la isticmaalin waa la tuuraa",
+        ),
+        BuildProfile(
+            "pgo", ("-O3", "-march=native", "-flto", *SECTION_FLAGS),
+            "Sida release, laakiin marka hore barnaamij cabbir leh ayaa la dhisaa oo la "
+            "tababaraa (--pgo-train), kadibna waxaa lagu dhisaa -fprofile-use",
+            pgo=True,
+        ),
+    )
+}
+DEFAULT_PROFILE = "release"
+
+
+def get_profile(name: str | None = None) -> BuildProfile:
+    """The profile called `name`, else `$TUSMO_PROFILE`, else release."""
+    name = name or os.environ.get("TUSMO_PROFILE") or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Profile aan la aqoon: '{name}' (dooro: {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+def with_counted_strings(profile: BuildProfile) -> BuildProfile:
+    """`profile` with the runtime and the program built for counted strings (`--counted-strings`)."""
+    if COUNTED_STRINGS_FLAG in profile.c_flags:
+        return profile
+    return replace(profile, c_flags=(*profile.c_flags, COUNTED_STRINGS_FLAG))
+
+
+def toolchain() -> tuple[str, str, str | None]:
+    """
+    The C compiler, include directory and library directory, which can be
+    overridden via env vars (for bundled installs).
+    """
+    cc = os.environ.get("TUSMO_CC", "gcc")
+    lib_dir_override = os.environ.get("TUSMO_LIB_DIR")
+    include_override = os.environ.get("TUSMO_INCLUDE_DIR")
+    include_dir = include_override if include_override else RUNTIME_DIR
+    return cc, include_dir, lib_dir_override
+
+
+def all_runtime_sources() -> list[str]:
+    return runtime_manifest(RUNTIME_DIR).sources
+
+
+def runtime_sources(runtime_symbols: Iterable[str]) -> list[str]:
+    """The runtime `.c` files a program whose C uses `runtime_symbols` must be linked with."""
+    return runtime_manifest(RUNTIME_DIR).sources_for(runtime_symbols)
+
+
+def gc_sections_flag() -> str:
+    """Linker flag that discards unreferenced sections."""
+    return "-Wl,-dead_strip" if sys.platform == "darwin" else "-Wl,--gc-sections"
+
+
+def link_command(cc: str, flags: Iterable[str], binary: str, sources: Iterable[str],
+                 include_dir: str, lib_dir: str | None) -> list[str]:
+    """The C compiler invocation that builds `binary` from the generated C and the runtime."""
+    return [
+        cc, *flags, "-o", binary, *sources,
+        f"-I{include_dir}", *([f"-L{lib_dir}"] if lib_dir else []), gc_sections_flag(), "-lgc",
+    ]
+
+
+def _is_clang(cc: str) -> bool:
+    try:
+        version = subprocess.run([cc, "--version"], capture_output=True, text=True).stdout
+    except OSError:
+        return False
+    return "clang" in version.lower()
+
+
+def training_command(train: str | None, binary: str) -> list[str]:
+    """
+    The PGO training workload. `{binary}` in `train` is replaced by the
+    instrumented binary; otherwise the binary is passed as the last argument.
+    Without `train` the binary is simply run once.
+    """
+    binary = os.path.abspath(binary)
+    if not train:
+        return [binary]
+    parts = shlex.split(train)
+    if any("{binary}" in part for part in parts):
+        return [part.replace("{binary}", binary) for part in parts]
+    return [*parts, binary]
+
+
+def build_with_pgo(cc: str, command: Callable[[list[str]], list[str]], binary: str, train: str | None,
+                   timeout: float | None = DEFAULT_PGO_TIMEOUT) -> int:
+    """
+    Profile-guided build: compile with `command(instrument_flags)`, run the
+    training workload against that binary, then compile again with
+    `command(profile_use_flags)`. Returns the C compiler's exit status.
+
+    A training run that outlives `timeout` seconds fails the build; the
+    default run (no `train`) gets no stdin, so it cannot wait on a terminal.
+    """
+    clang = _is_clang(cc)
+    with tempfile.TemporaryDirectory(prefix="tusmo-pgo-") as profile_dir:
+        generate = [f"-fprofile-generate={profile_dir}"]
+        if not clang:
+            # Tusmo programs may be multi-threaded (http, socket).
+            generate.append("-fprofile-update=atomic")
+        result = subprocess.run(command(generate))
+        if result.returncode != 0:
+            return result.returncode
+
+        train_argv = training_command(train, binary)
+        print(f"PGO: tababar: {' '.join(train_argv)}", file=sys.stderr)
+        try:
+            stdin = None if train else subprocess.DEVNULL
+            trained = subprocess.run(train_argv, stdin=stdin, timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            print(f"Cilad: tababarka PGO ma dhammaan {timeout:g} ilbiriqsi gudahood. Ku bixi amar tababar oo "
+                  f"dhammaada --pgo-train, ama kordhi --pgo-timeout.", file=sys.stderr)
+            return 1
+        except OSError as e:
+            print(f"Cilad: tababarka lama bilaabi karo: {e}", file=sys.stderr)
+            return 1
+        if trained != 0:
+            print(f"Digniin: tababarku wuxuu ku dhammaaday code {trained}; profile-ka waa la isticmaalayaa.",
+                  file=sys.stderr)
+
+        if clang:
+            raw_profiles = glob.glob(os.path.join(profile_dir, "*.profraw"))
+            profile_data = os.path.join(profile_dir, "default.profdata")
+            merge = [os.environ.get("TUSMO_PROFDATA", "llvm-profdata"), "merge", f"-output={profile_data}", *raw_profiles]
+            if not raw_profiles or subprocess.run(merge).returncode != 0:
+                print("Cilad: xog profile ah lama helin.", file=sys.stderr)
+                return 1
+            use = [f"-fprofile-use={profile_data}"]
+        else:
+            if not glob.glob(os.path.join(profile_dir, "**", "*.gcda"), recursive=True):
+                print("Cilad: xog profile ah lama helin.", file=sys.stderr)
+                return 1
+            use = [f"-fprofile-use={profile_dir}", "-Wno-missing-profile"]
+        return subprocess.run(command(use)).returncode
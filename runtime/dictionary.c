@@ -8,14 +8,9 @@
 
 #define QAAMUUS_INITIAL_CAPACITY 16
 
-// A simple djb2 hash function for strings
+// djb2 (string.c); with counted strings the hash of a runtime string is cached.
 static unsigned long hash_key(const char* key) {
-    unsigned long hash = 5381;
-    int c;
-    while ((c = *key++)) {
-        hash = ((hash << 5) + hash) + c; // hash * 33 + c
-    }
-    return hash;
+    return tusmo_str_hash(key);
 }
 
 TusmoQaamuus* tusmo_qaamuus_create() {
@@ -57,7 +52,7 @@ void tusmo_qaamuus_set(TusmoQaamuus* qaamuus, const char* key, TusmoValue value)
     TusmoQaamuusEntry* entry = qaamuus->entries[index];
 
     while (entry != NULL) {
-        if (strcmp(entry->key, key) == 0) {
+        if (tusmo_str_eq(entry->key, key)) {
             entry->value = value;
             return;
         }
@@ -65,8 +60,7 @@ void tusmo_qaamuus_set(TusmoQaamuus* qaamuus, const char* key, TusmoValue value)
     }
 
     TusmoQaamuusEntry* new_entry = (TusmoQaamuusEntry*)GC_MALLOC(sizeof(TusmoQaamuusEntry));
-    new_entry->key = (char*)GC_MALLOC(strlen(key) + 1);
-    strcpy(new_entry->key, key);
+    new_entry->key = tusmo_str_copy(key);
     new_entry->value = value;
     new_entry->next = qaamuus->entries[index];
     qaamuus->entries[index] = new_entry;
@@ -99,7 +93,7 @@ TusmoValue tusmo_qaamuus_get(TusmoQaamuus* qaamuus, const char* key) {
     TusmoQaamuusEntry* entry = qaamuus->entries[index];
 
     while (entry != NULL) {
-        if (strcmp(entry->key, key) == 0) {
+        if (tusmo_str_eq(entry->key, key)) {
             return entry->value;
         }
         entry = entry->next;
@@ -117,7 +111,7 @@ void tusmo_qaamuus_delete(TusmoQaamuus* qaamuus, const char* key) {
     TusmoQaamuusEntry* prev = NULL;
 
     while (entry != NULL) {
-        if (strcmp(entry->key, key) == 0) {
+        if (tusmo_str_eq(entry->key, key)) {
             if (prev == NULL) {
                 qaamuus->entries[index] = entry->next;
             } else {
@@ -136,7 +130,7 @@ bool tusmo_qaamuus_has_key(TusmoQaamuus* qaamuus, const char* key) {
     TusmoQaamuusEntry* entry = qaamuus->entries[index];
 
     while (entry != NULL) {
-        if (strcmp(entry->key, key) == 0) {
+        if (tusmo_str_eq(entry->key, key)) {
             return true;
         }
         entry = entry->next;
@@ -42,9 +42,7 @@ typedef struct {
 } TusmoHttpRequest;
 
 static char* tusmo_http_empty_string() {
-    char* s = (char*)GC_MALLOC(1);
-    s[0] = '\0';
-    return s;
+    return tusmo_str_alloc(0);
 }
 
 static TusmoHttpHandleEntry* tusmo_http_handle_find(const char* handle) {
@@ -71,9 +69,7 @@ static char* tusmo_http_register_handle(void* ptr, const char* prefix) {
     char buffer[64];
     unsigned long id = tusmo_http_next_handle_id++;
     snprintf(buffer, sizeof(buffer), "%s:%lu", prefix, id);
-    size_t len = strlen(buffer);
-    entry->handle = (char*)GC_MALLOC(len + 1);
-    strcpy(entry->handle, buffer);
+    entry->handle = tusmo_str_copy(buffer);
 
     tusmo_http_handle_registry = entry;
     return entry->handle;
@@ -147,17 +143,11 @@ static char* tusmo_http_trim_copy(const char* begin, size_t len) {
         len--;
     }
 
-    char* result = (char*)GC_MALLOC(len + 1);
-    memcpy(result, begin, len);
-    result[len] = '\0';
-    return result;
+    return tusmo_str_from(begin, len);
 }
 
 static char* tusmo_http_copy_segment(const char* begin, size_t len) {
-    char* result = (char*)GC_MALLOC(len + 1);
-    memcpy(result, begin, len);
-    result[len] = '\0';
-    return result;
+    return tusmo_str_from(begin, len);
 }
 
 static TusmoQaamuus* tusmo_http_make_error(const char* message) {
@@ -165,21 +155,18 @@ static TusmoQaamuus* tusmo_http_make_error(const char* message) {
        TusmoValue val;
        val.type = TUSMO_ERAY;
 
-       char* status = (char*)GC_MALLOC(6);
-       strcpy(status, "qalad");
+       char* status = tusmo_str_copy("qalad");
        val.type = TUSMO_ERAY;
        val.value.as_eray = status;
        tusmo_qaamuus_set(info, "__status", val);
 
        const char* safe_message = message ? message : "";
-       char* msg_copy = (char*)GC_MALLOC(strlen(safe_message) + 1);
-       strcpy(msg_copy, safe_message);
+       char* msg_copy = tusmo_str_copy(safe_message);
        val.type = TUSMO_ERAY;
        val.value.as_eray = msg_copy;
        tusmo_qaamuus_set(info, "__farriin", val);
 
-       char* handle = (char*)GC_MALLOC(1);
-       handle[0] = '\0';
+       char* handle = tusmo_str_alloc(0);
        val.type = TUSMO_ERAY;
        val.value.as_eray = handle;
        tusmo_qaamuus_set(info, "__handle", val);
@@ -209,6 +196,8 @@ static const char* tusmo_http_reason_phrase(int status) {
     }
 }
 
+// Buffer-ka codsiga ee cayriin waa mid gudaha ah (GC_REALLOC ayuu ku koraa);
+// erayada Tusmo loo celiyo waxaa laga koobiyeeyaa tusmo_http_copy_segment.
 static char* tusmo_http_read_request(int client_fd, size_t* out_size) {
     size_t capacity = TUSMO_HTTP_INITIAL_BUFFER;
     char* buffer = (char*)GC_MALLOC(capacity + 1);
@@ -296,8 +285,7 @@ static TusmoQaamuus* tusmo_http_request_to_payload(TusmoHttpRequest* request) {
 
     val.type = TUSMO_ERAY;
 
-    char* status = (char*)GC_MALLOC(3);
-    strcpy(status, "ok");
+    char* status = tusmo_str_copy("ok");
     val.value.as_eray = status;
     tusmo_qaamuus_set(payload, "__status", val);
 
@@ -699,9 +687,7 @@ static void tusmo_http_json_append_value(TusmoValue value, char** buffer, size_t
 
 char* tusmo_http_qaamuus_to_json(TusmoQaamuus* qaamuus) {
     if (!qaamuus) {
-        char* empty_obj = (char*)GC_MALLOC(3);
-        strcpy(empty_obj, "{}");
-        return empty_obj;
+        return tusmo_str_copy("{}");
     }
     size_t capacity = 256;
     size_t length = 0;
@@ -709,7 +695,7 @@ char* tusmo_http_qaamuus_to_json(TusmoQaamuus* qaamuus) {
     buffer[0] = '\0';
     tusmo_http_json_append_object(qaamuus, &buffer, &length, &capacity);
     tusmo_http_json_append_char(&buffer, &length, &capacity, '\0');
-    return buffer;
+    return tusmo_str_adopt(buffer, length);
 }
 
 static bool tusmo_http_send_all(int fd, const char* data, size_t len) {
@@ -758,6 +744,7 @@ void tusmo_http_send_response(const char* request_handle, int status_code, const
         body_len,
         type);
 
+    // Madaxa jawaabta si toos ah ayaa loo diraa; eray Tusmo ah ma noqdo.
     char* header = (char*)GC_MALLOC((size_t)header_len + 1);
     snprintf(
         header,
@@ -85,6 +85,7 @@ char* hel_str(void) {
         }
     }
 
-    buffer[len] = '\0';
-    return buffer;
+    char* line = tusmo_str_from(buffer, len);
+    free(buffer);
+    return line;
 }
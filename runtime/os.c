@@ -9,9 +9,9 @@
 
 // Get current working directory
 char* tusmo_os_cwd() {
-    char* buf = (char*)GC_MALLOC(1024 * sizeof(char));
-    if (getcwd(buf, 1024) != NULL) {
-        return buf;
+    char buf[1024];
+    if (getcwd(buf, sizeof(buf)) != NULL) {
+        return tusmo_str_copy(buf);
     } else {
         perror("getcwd");
         return ""; // Return empty string on error
@@ -33,7 +33,7 @@ TusmoTixEray* tusmo_os_list_dir(char* path) {
     d = opendir(path);
     if (d) {
         while ((dir = readdir(d)) != NULL) {
-            tusmo_hp_tix_eray_append(list, strdup(dir->d_name));
+            tusmo_hp_tix_eray_append(list, tusmo_str_copy(dir->d_name));
         }
         closedir(d);
     }
@@ -84,7 +84,7 @@ bool tusmo_os_is_dir(char* path) {
 // Get environment variable
 char* tusmo_os_getenv(char* name) {
     char* val = getenv(name);
-    return val ? strdup(val) : ""; // Return empty string if not found
+    return val ? tusmo_str_copy(val) : ""; // Return empty string if not found
 }
 
 // Set environment variable
@@ -136,10 +136,13 @@ char* tusmo_os_read_file(char* path) {
     long fsize = ftell(fp);
     fseek(fp, 0, SEEK_SET);
 
-    char* content = (char*)GC_MALLOC(fsize + 1);
-    fread(content, 1, fsize, fp);
+    char* content = tusmo_str_alloc((size_t)fsize);
+    size_t bytes_read = fread(content, 1, fsize, fp);
     fclose(fp);
-    content[fsize] = 0;
+    if (bytes_read < (size_t)fsize || memchr(content, '\0', bytes_read)) {
+        // Faylka oo ka gaaban intii la filayay ama '\0' ku jira: dhererka sax ah.
+        return tusmo_str_from(content, bytes_read);
+    }
     return content;
 }
 
@@ -158,14 +161,15 @@ void tusmo_os_write_file(char* path, char* content, bool append) {
 char* tusmo_os_path_join(char* part1, char* part2) {
     // Simple join, assumes part1 doesn't end with / and part2 doesn't start with /
     // More robust implementation would handle these cases
-    size_t len1 = strlen(part1);
-    size_t len2 = strlen(part2);
-    char* result = (char*)GC_MALLOC(len1 + len2 + 2); // +1 for /, +1 for null terminator
-    strcpy(result, part1);
-    if (result[len1 - 1] != '/' && part2[0] != '/') {
-        strcat(result, "/");
+    size_t len1 = tusmo_str_len(part1);
+    size_t len2 = tusmo_str_len(part2);
+    size_t separator = (len1 > 0 && part1[len1 - 1] != '/' && part2[0] != '/') ? 1 : 0;
+    char* result = tusmo_str_alloc(len1 + separator + len2);
+    memcpy(result, part1, len1);
+    if (separator) {
+        result[len1] = '/';
     }
-    strcat(result, part2);
+    memcpy(result + len1 + separator, part2, len2);
     return result;
 }
 
@@ -33,9 +33,7 @@ static unsigned long tusmo_socket_next_handle_id = 1;
 
 // Helper function to create empty string
 static char* tusmo_socket_empty_string() {
-    char* s = (char*)GC_MALLOC(1);
-    s[0] = '\0';
-    return s;
+    return tusmo_str_alloc(0);
 }
 
 // Register a socket handle
@@ -51,9 +49,7 @@ static char* tusmo_socket_register_handle(TusmoSocket* socket) {
     char buffer[64];
     unsigned long id = tusmo_socket_next_handle_id++;
     snprintf(buffer, sizeof(buffer), "SOCK:%lu", id);
-    size_t len = strlen(buffer);
-    entry->handle = (char*)GC_MALLOC(len + 1);
-    strcpy(entry->handle, buffer);
+    entry->handle = tusmo_str_copy(buffer);
 
     tusmo_socket_handle_registry = entry;
     return entry->handle;
@@ -286,7 +282,7 @@ char* tusmo_socket_receive(const char* handle, int max_size) {
     }
 
     buffer[received] = '\0';
-    return buffer;
+    return tusmo_str_adopt(buffer, (size_t)received);
 }
 
 // Close socket and free resources
@@ -2,6 +2,135 @@
 
 #include "tusmo_runtime.h"
 
+// ==========================================================================
+// --- Eray la tiriyay (counted strings)
+// ==========================================================================
+
+#define TUSMO_ERAY_MAGIC 0x45524159u  // "ERAY"
+
+#ifdef TUSMO_COUNTED_STRINGS
+// Madaxa erayga haddii runtime-ku sameeyay; NULL haddii uu yahay literal ama
+// eray ka yimid C (GC_base wuxuu xaqiijiyaa in madaxu yahay bilowga shayga).
+static TusmoErayHeader* tusmo_str_header(const char* value) {
+    if (!value) return NULL;
+    TusmoErayHeader* header = (TusmoErayHeader*)(value - sizeof(TusmoErayHeader));
+    if (GC_base((void*)value) != (void*)header || header->magic != TUSMO_ERAY_MAGIC) {
+        return NULL;
+    }
+    return header;
+}
+#endif
+
+// Eray cusub oo `length` xaraf ah (+ '\0'); qofka wacay ayaa buuxinaya.
+char* tusmo_str_alloc(size_t length) {
+#ifdef TUSMO_COUNTED_STRINGS
+    TusmoErayHeader* header = GC_MALLOC_ATOMIC(sizeof(TusmoErayHeader) + length + 1);
+    if (!header) return NULL;
+    header->length = length;
+    header->hash = 0;
+    header->magic = TUSMO_ERAY_MAGIC;
+    header->hashed = false;
+    char* value = (char*)(header + 1);
+#else
+    char* value = GC_MALLOC_ATOMIC(length + 1);
+    if (!value) return NULL;
+#endif
+    value[length] = '\0';
+    return value;
+}
+
+char* tusmo_str_from(const char* bytes, size_t length) {
+    // Dhererku waa strlen-ka erayga, xitaa haddii `bytes` ay '\0' ku jirto.
+    const char* nul = memchr(bytes, '\0', length);
+    if (nul) length = (size_t)(nul - bytes);
+    char* value = tusmo_str_alloc(length);
+    if (!value) return NULL;
+    memcpy(value, bytes, length);
+    return value;
+}
+
+char* tusmo_str_copy(const char* value) {
+    if (!value) return NULL;
+    return tusmo_str_from(value, strlen(value));
+}
+
+// Buffer GC ah oo qofka wacay dhisay (NUL ku dhammaaday): sidiisa ayaa loo
+// celiyaa, marka eray la tiriyay la isticmaalayo mooyee oo nuqul madax leh la sameeyo.
+char* tusmo_str_adopt(char* buffer, size_t length) {
+#ifdef TUSMO_COUNTED_STRINGS
+    return buffer ? tusmo_str_from(buffer, length) : NULL;
+#else
+    (void)length;
+    return buffer;
+#endif
+}
+
+// djb2, isla natiijada erayga oo madax leh iyo mid aan lahayn.
+unsigned long tusmo_str_hash(const char* value) {
+#ifdef TUSMO_COUNTED_STRINGS
+    TusmoErayHeader* header = tusmo_str_header(value);
+    if (header && header->hashed) return header->hash;
+#endif
+    unsigned long hash = 5381;
+    const unsigned char* cursor = (const unsigned char*)value;
+    int c;
+    while ((c = *cursor++)) {
+        hash = ((hash << 5) + hash) + c; // hash * 33 + c
+    }
+#ifdef TUSMO_COUNTED_STRINGS
+    if (header) {
+        header->hash = hash;
+        header->hashed = true;
+    }
+#endif
+    return hash;
+}
+
+#ifdef TUSMO_COUNTED_STRINGS
+size_t tusmo_str_len(const char* value) {
+    TusmoErayHeader* header = tusmo_str_header(value);
+    return header ? header->length : strlen(value);
+}
+
+bool tusmo_str_eq(const char* left, const char* right) {
+    if (left == right) return true;
+    TusmoErayHeader* left_header = tusmo_str_header(left);
+    TusmoErayHeader* right_header = tusmo_str_header(right);
+    if (left_header && right_header) {
+        if (left_header->length != right_header->length) return false;
+        if (left_header->hashed && right_header->hashed && left_header->hash != right_header->hash) return false;
+        return memcmp(left, right, left_header->length) == 0;
+    }
+    return strcmp(left, right) == 0;
+}
+
+#endif
+
+// `value[index] = character`. Erayga la qorayo waa inuu yahay bilowga shaygiisa:
+// literal ama tilmaame gudaha buffer kale ku jira waa la koobiyeeyaa marka
+// hore, si buffer-ka uu ka dhex jiro aanu isbeddelin.
+// Qofka wacay wuxuu kaydiyaa erayga la celiyay.
+char* tusmo_str_set_xaraf(char* value, int index, char character) {
+#ifdef TUSMO_COUNTED_STRINGS
+    TusmoErayHeader* header = tusmo_str_header(value);
+    if (!header) {
+        value = tusmo_str_copy(value);
+        header = tusmo_str_header(value);
+    }
+    value[index] = character;
+    header->hashed = false;
+    if (character == '\0' || (size_t)index >= header->length) {
+        header->length = strlen(value);
+    }
+#else
+    if (GC_base(value) != (void*)value) {
+        value = tusmo_str_copy(value);
+    }
+    value[index] = character;
+#endif
+    return value;
+}
+
 char* tusmo_str_format(const char* format, ...) {
     va_list args1, args2;
     va_start(args1, format);
@@ -9,7 +138,7 @@ char* tusmo_str_format(const char* format, ...) {
     int size = vsnprintf(NULL, 0, format, args1);
     va_end(args1);
     if (size < 0) return NULL;
-    char* buffer = GC_MALLOC(size + 1);
+    char* buffer = tusmo_str_alloc((size_t)size);
     if (!buffer) return NULL;
     vsnprintf(buffer, size + 1, format, args2);
     va_end(args2);
@@ -32,3 +161,279 @@ char* tusmo_concat_cstr(const char* left, const char* right) {
     const char* safe_right = tusmo_safe_cstr(right);
     return tusmo_str_format("%s%s", safe_left, safe_right);
 }
+
+// Qoraalka tirada `value`, laga qoray gadaal una socda `end`; wuxuu celiyaa bilowga.
+static char* tusmo_write_tiro(char* end, int value) {
+    unsigned int magnitude = value < 0 ? 0u - (unsigned int)value : (unsigned int)value;
+    do {
+        *--end = (char)('0' + magnitude % 10);
+        magnitude /= 10;
+    } while (magnitude);
+    if (value < 0) {
+        *--end = '-';
+    }
+    return end;
+}
+
+// Isku xir `count` qaybood (eray, tiro, jajab, miyaa, xaraf) hal mar:
+// dhererka guud waa la xisaabiyaa, kadib qayb kasta waxaa lagu qoraa
+// hal buffer oo keliya. Waa sida tusmo_concat_cstr oo silsilad dhan ah.
+char* tusmo_str_build(size_t count, const TusmoValue* pieces) {
+    size_t lengths[count ? count : 1];
+    size_t total = 0;
+    bool has_nul = false;
+    char digits[16];
+    for (size_t i = 0; i < count; i++) {
+        const TusmoValue* piece = &pieces[i];
+        size_t length = 0;
+        switch (piece->type) {
+            case TUSMO_ERAY: length = tusmo_str_len(tusmo_safe_cstr(piece->value.as_eray)); break;
+            case TUSMO_TIRO:
+                length = (size_t)(digits + sizeof digits - tusmo_write_tiro(digits + sizeof digits, piece->value.as_tiro));
+                break;
+            case TUSMO_JAJAB: {
+                int size = snprintf(NULL, 0, "%f", piece->value.as_jajab);
+                length = size > 0 ? (size_t)size : 0;
+                break;
+            }
+            case TUSMO_MIYAA: length = piece->value.as_miyaa ? 3 : 4; break;
+            case TUSMO_XARAF:
+                length = 1;
+                has_nul = has_nul || piece->value.as_xaraf == '\0';
+                break;
+            default: break;
+        }
+        lengths[i] = length;
+        total += length;
+    }
+
+    char* buffer = tusmo_str_alloc(total);
+    if (!buffer) return NULL;
+    char* out = buffer;
+    for (size_t i = 0; i < count; i++) {
+        const TusmoValue* piece = &pieces[i];
+        switch (piece->type) {
+            case TUSMO_ERAY: memcpy(out, tusmo_safe_cstr(piece->value.as_eray), lengths[i]); break;
+            case TUSMO_TIRO: tusmo_write_tiro(out + lengths[i], piece->value.as_tiro); break;
+            case TUSMO_JAJAB: snprintf(out, lengths[i] + 1, "%f", piece->value.as_jajab); break;
+            case TUSMO_MIYAA: memcpy(out, piece->value.as_miyaa ? "run" : "been", lengths[i]); break;
+            case TUSMO_XARAF: *out = piece->value.as_xaraf; break;
+            default: break;
+        }
+        out += lengths[i];
+    }
+    *out = '\0';
+    // Xaraf '\0' ah wuxuu erayga ku jarayaa halkaas; dhererka madaxa waa in uu la mid noqdaa.
+    return has_nul ? tusmo_str_from(buffer, total) : buffer;
+}
+
+// ==========================================================================
+// --- xadhig: eray la koriyo (string builder)
+// ==========================================================================
+
+TusmoXadhig* tusmo_xadhig_create(int capacity) {
+    TusmoXadhig* builder = GC_MALLOC(sizeof(TusmoXadhig));
+    builder->capacity = capacity > 0 ? (size_t)capacity : 16;
+    builder->data = GC_MALLOC_ATOMIC(builder->capacity);
+    builder->length = 0;
+    return builder;
+}
+
+// Hubi in `extra` bytes oo kale ay ku filan yihiin; awoodda waa la labanlaabaa
+// si gali kasta uu celcelis ahaan u noqdo O(1).
+static char* tusmo_xadhig_reserve(TusmoXadhig* builder, size_t extra) {
+    size_t needed = builder->length + extra;
+    if (needed > builder->capacity) {
+        size_t capacity = builder->capacity ? builder->capacity : 16;
+        while (capacity < needed) {
+            capacity *= 2;
+        }
+        builder->data = GC_REALLOC(builder->data, capacity);
+        builder->capacity = capacity;
+    }
+    return builder->data + builder->length;
+}
+
+void tusmo_xadhig_append_eray(TusmoXadhig* builder, const char* value) {
+    const char* safe_value = tusmo_safe_cstr(value);
+    size_t length = tusmo_str_len(safe_value);
+    memcpy(tusmo_xadhig_reserve(builder, length), safe_value, length);
+    builder->length += length;
+}
+
+void tusmo_xadhig_append_xaraf(TusmoXadhig* builder, char value) {
+    *tusmo_xadhig_reserve(builder, 1) = value;
+    builder->length += 1;
+}
+
+void tusmo_xadhig_append_tiro(TusmoXadhig* builder, int value) {
+    char digits[16];
+    char* start = tusmo_write_tiro(digits + sizeof digits, value);
+    size_t length = (size_t)(digits + sizeof digits - start);
+    memcpy(tusmo_xadhig_reserve(builder, length), start, length);
+    builder->length += length;
+}
+
+void tusmo_xadhig_append_jajab(TusmoXadhig* builder, double value) {
+    int size = snprintf(NULL, 0, "%f", value);
+    if (size <= 0) return;
+    // snprintf wuxuu qoraa '\0' dheeraad ah, kaas oo aan dhererka lagu darin.
+    snprintf(tusmo_xadhig_reserve(builder, (size_t)size + 1), (size_t)size + 1, "%f", value);
+    builder->length += (size_t)size;
+}
+
+void tusmo_xadhig_append_miyaa(TusmoXadhig* builder, bool value) {
+    tusmo_xadhig_append_eray(builder, value ? "run" : "been");
+}
+
+// Eray cusub oo ah nuqul ka mid ah waxa hadda ku jira; xadhigga waa la
+// sii isticmaali karaa iyada oo erayga la celiyay aan isbeddelin.
+char* tusmo_xadhig_eray(const TusmoXadhig* builder) {
+    return tusmo_str_from(builder->data, builder->length);
+}
+
+// ==========================================================================
+// --- Qaybin iyo raadin (slices, kala_jar, ku_dar, raadi, beddel)
+// ==========================================================================
+
+// Tusaha `index` (tiro taban waxay ka tirisaa dhammaadka) oo lagu xiray [0, length].
+static size_t tusmo_str_clamp(int index, size_t length) {
+    if (index < 0) {
+        index += (int)length;
+        if (index < 0) return 0;
+    }
+    return (size_t)index > length ? length : (size_t)index;
+}
+
+// Meesha ugu horreysa ee `needle` (needle_length > 0) ka muuqato `haystack`;
+// memchr ayaa u booda xarafka koowaad, kadib memcmp ayaa xaqiijiya.
+static const char* tusmo_str_search(const char* haystack, size_t length, const char* needle, size_t needle_length) {
+    if (needle_length > length) return NULL;
+    const char* last = haystack + (length - needle_length);
+    const char* cursor = haystack;
+    while (cursor <= last) {
+        cursor = memchr(cursor, needle[0], (size_t)(last - cursor) + 1);
+        if (!cursor) return NULL;
+        if (memcmp(cursor, needle, needle_length) == 0) return cursor;
+        cursor++;
+    }
+    return NULL;
+}
+
+// Qayb kasta waa nuqul: qayb buffer-ka waalidka wadaagta way beddelmi lahayd
+// marka waalidka xaraf lagu qoro (tusmo_str_set_xaraf).
+char* tusmo_str_slice_from(const char* value, int start) {
+    const char* safe_value = tusmo_safe_cstr(value);
+    size_t length = tusmo_str_len(safe_value);
+    size_t from = tusmo_str_clamp(start, length);
+    return tusmo_str_from(safe_value + from, length - from);
+}
+
+char* tusmo_str_slice(const char* value, int start, int end) {
+    const char* safe_value = tusmo_safe_cstr(value);
+    size_t length = tusmo_str_len(safe_value);
+    size_t from = tusmo_str_clamp(start, length);
+    size_t to = tusmo_str_clamp(end, length);
+    if (to <= from) return tusmo_str_alloc(0);
+    return tusmo_str_from(safe_value + from, to - from);
+}
+
+int tusmo_str_find(const char* value, const char* needle, int start) {
+    const char* safe_value = tusmo_safe_cstr(value);
+    const char* safe_needle = tusmo_safe_cstr(needle);
+    size_t length = tusmo_str_len(safe_value);
+    size_t from = tusmo_str_clamp(start, length);
+    size_t needle_length = tusmo_str_len(safe_needle);
+    if (needle_length == 0) return (int)from;
+    const char* found = tusmo_str_search(safe_value + from, length - from, safe_needle, needle_length);
+    return found ? (int)(found - safe_value) : -1;
+}
+
+// kala_jar: qaybaha u dhexeeya `separator`; separator madhan wuxuu erayga u
+// kala jaraa xarfo. Qayb kastaa waa nuqul, kan ugu dambeeya ayaa ku jira.
+TusmoTixEray* tusmo_str_split(const char* value, const char* separator) {
+    const char* safe_value = tusmo_safe_cstr(value);
+    const char* safe_separator = tusmo_safe_cstr(separator);
+    size_t length = tusmo_str_len(safe_value);
+    size_t separator_length = tusmo_str_len(safe_separator);
+    TusmoTixEray* parts = tusmo_hp_tix_eray_create(4);
+
+    if (separator_length == 0) {
+        for (size_t i = 0; i < length; i++) {
+            tusmo_hp_tix_eray_append(parts, tusmo_str_from(safe_value + i, 1));
+        }
+        return parts;
+    }
+
+    const char* start = safe_value;
+    const char* end = safe_value + length;
+    const char* found;
+    while ((found = tusmo_str_search(start, (size_t)(end - start), safe_separator, separator_length))) {
+        tusmo_hp_tix_eray_append(parts, tusmo_str_from(start, (size_t)(found - start)));
+        start = found + separator_length;
+    }
+    tusmo_hp_tix_eray_append(parts, tusmo_str_from(start, (size_t)(end - start)));
+    return parts;
+}
+
+// ku_dar: qaybaha oo `separator` u dhexeeyo; dhererka waa la xisaabiyaa marka
+// hore si hal buffer oo keliya loo qoro.
+char* tusmo_str_join(const TusmoTixEray* parts, const char* separator) {
+    const char* safe_separator = tusmo_safe_cstr(separator);
+    size_t separator_length = tusmo_str_len(safe_separator);
+    size_t count = parts ? parts->size : 0;
+    size_t total = count > 1 ? separator_length * (count - 1) : 0;
+    for (size_t i = 0; i < count; i++) {
+        total += tusmo_str_len(tusmo_safe_cstr(parts->data[i]));
+    }
+
+    char* buffer = tusmo_str_alloc(total);
+    if (!buffer) return NULL;
+    char* out = buffer;
+    for (size_t i = 0; i < count; i++) {
+        if (i > 0) {
+            memcpy(out, safe_separator, separator_length);
+            out += separator_length;
+        }
+        const char* part = tusmo_safe_cstr(parts->data[i]);
+        size_t part_length = tusmo_str_len(part);
+        memcpy(out, part, part_length);
+        out += part_length;
+    }
+    return buffer;
+}
+
+// beddel: eray cusub oo `old_part` kasta lagu beddelay `new_part`.
+char* tusmo_str_replace(const char* value, const char* old_part, const char* new_part) {
+    const char* safe_value = tusmo_safe_cstr(value);
+    const char* safe_old = tusmo_safe_cstr(old_part);
+    const char* safe_new = tusmo_safe_cstr(new_part);
+    size_t length = tusmo_str_len(safe_value);
+    size_t old_length = tusmo_str_len(safe_old);
+    size_t new_length = tusmo_str_len(safe_new);
+    if (old_length == 0) return tusmo_str_from(safe_value, length);
+
+    const char* end = safe_value + length;
+    size_t count = 0;
+    for (const char* cursor = safe_value;
+         (cursor = tusmo_str_search(cursor, (size_t)(end - cursor), safe_old, old_length));
+         cursor += old_length) {
+        count++;
+    }
+    if (count == 0) return tusmo_str_from(safe_value, length);
+
+    char* buffer = tusmo_str_alloc(length - count * old_length + count * new_length);
+    if (!buffer) return NULL;
+    char* out = buffer;
+    const char* start = safe_value;
+    const char* found;
+    while ((found = tusmo_str_search(start, (size_t)(end - start), safe_old, old_length))) {
+        memcpy(out, start, (size_t)(found - start));
+        out += found - start;
+        memcpy(out, safe_new, new_length);
+        out += new_length;
+        start = found + old_length;
+    }
+    memcpy(out, start, (size_t)(end - start));
+    return buffer;
+}
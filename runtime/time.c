@@ -23,13 +23,13 @@ int tusmo_wait(int number) {
 char* tusmo_format_time(const char* format) {
     time_t rawtime;
     struct tm * timeinfo;
-    char * buffer = (char *)GC_MALLOC(80 * sizeof(char));
+    char buffer[80];
 
     time(&rawtime);
     timeinfo = localtime(&rawtime);
 
-    strftime(buffer, 80, format, timeinfo);
-    return buffer;
+    size_t length = strftime(buffer, sizeof(buffer), format, timeinfo);
+    return tusmo_str_from(buffer, length);
 }
 
 int tusmo_get_seconds() {
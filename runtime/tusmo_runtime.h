@@ -22,6 +22,7 @@ typedef struct TusmoTixJajab { double* data; size_t size; size_t capacity; } Tus
 typedef struct TusmoTixMiyaa { bool* data; size_t size; size_t capacity; } TusmoTixMiyaa;
 typedef struct TusmoTixMixed { TusmoValue* data; size_t size; size_t capacity; } TusmoTixMixed;
 typedef struct TusmoTixGeneric { void** data; size_t size; size_t capacity; } TusmoTixGeneric;// This holds an array of pointers to other Tusmo array structs.
+typedef struct TusmoXadhig { char* data; size_t length; size_t capacity; } TusmoXadhig; // String builder (xadhig).
 
 #include "dictionary.h"
 #include "type_conversion.h"
@@ -68,6 +69,47 @@ bool tusmo_tix_mixed_remove(TusmoTixMixed* tix, TusmoValue value);
 // --- String Formatting (from string.c) ---
 char* tusmo_str_format(const char* format, ...);
 char* tusmo_concat_cstr(const char* left, const char* right);
+char* tusmo_str_build(size_t count, const TusmoValue* pieces);
+
+// --- Counted Strings (from string.c) ---
+// Built with -DTUSMO_COUNTED_STRINGS (tusmo.py --counted-strings), every string
+// the runtime allocates carries this header in front of its bytes. The bytes
+// are still NUL-terminated and `length` always equals their strlen, so the
+// string stays a plain char* for C. Literals and strings coming from C have no
+// header; for those the functions below fall back to strlen/strcmp.
+typedef struct TusmoErayHeader { size_t length; unsigned long hash; unsigned int magic; bool hashed; } TusmoErayHeader;
+char* tusmo_str_alloc(size_t length);
+char* tusmo_str_from(const char* bytes, size_t length);
+char* tusmo_str_copy(const char* value);
+char* tusmo_str_adopt(char* buffer, size_t length);
+unsigned long tusmo_str_hash(const char* value);
+char* tusmo_str_set_xaraf(char* value, int index, char character);
+#ifdef TUSMO_COUNTED_STRINGS
+size_t tusmo_str_len(const char* value);
+bool tusmo_str_eq(const char* left, const char* right);
+#else
+#define tusmo_str_len(value) strlen(value)
+#define tusmo_str_eq(left, right) (strcmp((left), (right)) == 0)
+#endif
+
+// --- Slicing & Searching (from string.c) ---
+// Slices and kala_jar parts are copies, so writing to the parent later does not
+// change them. tusmo_str_set_xaraf copies a literal before writing to it.
+char* tusmo_str_slice(const char* value, int start, int end);
+char* tusmo_str_slice_from(const char* value, int start);
+int tusmo_str_find(const char* value, const char* needle, int start);
+TusmoTixEray* tusmo_str_split(const char* value, const char* separator);
+char* tusmo_str_join(const TusmoTixEray* parts, const char* separator);
+char* tusmo_str_replace(const char* value, const char* old_part, const char* new_part);
+
+// --- String Builder (xadhig, from string.c) ---
+TusmoXadhig* tusmo_xadhig_create(int capacity);
+void tusmo_xadhig_append_eray(TusmoXadhig* builder, const char* value);
+void tusmo_xadhig_append_xaraf(TusmoXadhig* builder, char value);
+void tusmo_xadhig_append_tiro(TusmoXadhig* builder, int value);
+void tusmo_xadhig_append_jajab(TusmoXadhig* builder, double value);
+void tusmo_xadhig_append_miyaa(TusmoXadhig* builder, bool value);
+char* tusmo_xadhig_eray(const TusmoXadhig* builder);
 
 // hel
 char* hel_str();
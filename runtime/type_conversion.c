@@ -1,6 +1,7 @@
 // runtime/type_conversion.c
 
 #include "type_conversion.h"
+#include "tusmo_runtime.h"
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
@@ -8,21 +9,17 @@
 
 // Convert any TusmoValue to a string (eray)
 char* tusmo_to_eray(TusmoValue val) {
-    char* buffer = GC_MALLOC(128); // Allocate a buffer
     switch (val.type) {
         case TUSMO_TIRO:
-            snprintf(buffer, 128, "%d", val.value.as_tiro);
-            break;
+            return tusmo_str_format("%d", val.value.as_tiro);
         case TUSMO_JAJAB:
-            snprintf(buffer, 128, "%f", val.value.as_jajab);
-            break;
+            return tusmo_str_format("%f", val.value.as_jajab);
         case TUSMO_ERAY:
             return val.value.as_eray; // Already a string
         case TUSMO_MIYAA:
             return val.value.as_miyaa ? "run" : "been";
         case TUSMO_XARAF:
-            snprintf(buffer, 128, "%c", val.value.as_xaraf);
-            break;
+            return tusmo_str_from(&val.value.as_xaraf, 1);
         case TUSMO_QAAMUUS:
             return "<qaamuus>";
         case TUSMO_TIX:
@@ -30,7 +27,6 @@ char* tusmo_to_eray(TusmoValue val) {
         default:
             return "<nooc aan la menneyn>";
     }
-    return buffer;
 }
 
 // Convert any TusmoValue to an integer (tiro)
@@ -150,7 +150,7 @@ static const char base64_chars[] = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqr
 
 static char* base64_encode(const uint8_t* data, size_t input_length) {
     size_t output_length = 4 * ((input_length + 2) / 3);
-    char* encoded = (char*)GC_MALLOC(output_length + 1);
+    char* encoded = tusmo_str_alloc(output_length);
     
     if (!encoded) return NULL;
 
@@ -174,7 +174,6 @@ static char* base64_encode(const uint8_t* data, size_t input_length) {
         encoded[output_length - 1] = '=';
     }
 
-    encoded[output_length] = '\0';
     return encoded;
 }
 
@@ -188,6 +187,7 @@ char* tusmo_ws_generate_accept_key(const char* client_key) {
     // Concatenate client key with magic string
     size_t key_len = strlen(client_key);
     size_t magic_len = strlen(WS_MAGIC_STRING);
+    // Buffer gudaha ah oo SHA-1 keliya loo dhisay; eray Tusmo ah ma noqdo.
     char* combined = (char*)GC_MALLOC(key_len + magic_len + 1);
     strcpy(combined, client_key);
     strcat(combined, WS_MAGIC_STRING);
@@ -244,6 +244,7 @@ char* tusmo_ws_encode_frame(uint8_t opcode, const char* payload, size_t payload_
     // Add masking key if needed
     if (mask) frame_size += 4;
 
+    // Frame-ku waa bytes binary ah (waxaa ku jiri kara '\0'), ee maaha eray Tusmo.
     uint8_t* frame = (uint8_t*)GC_MALLOC(frame_size);
     size_t pos = 0;
 
@@ -341,10 +342,11 @@ TusmoQaamuus* tusmo_ws_decode_frame(const char* socket_handle) {
         payload = tusmo_socket_receive(socket_handle, (int)payload_len);
         if (masked && payload) {
             apply_mask((uint8_t*)payload, payload_len, mask);
+            // Furashada maskaraddu waxay beddeshay bytes-ka; dhererka ayaa dib loo tiriyaa.
+            payload = tusmo_str_adopt(payload, strlen(payload));
         }
     } else {
-        payload = (char*)GC_MALLOC(1);
-        payload[0] = '\0';
+        payload = tusmo_str_alloc(0);
     }
 
     // Build result dictionary
@@ -0,0 +1,56 @@
+"""
+Shared helpers for the regression tests: build a `.tus` program with the
+real driver (`tusmo.py`) and run it. Tests that need a C toolchain are
+skipped when `$TUSMO_CC` (or `cc`) cannot link against libgc here.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TUSMO = os.path.join(REPO_ROOT, "tusmo.py")
+
+sys.path.insert(0, REPO_ROOT)
+
+_toolchain_ok: bool | None = None
+
+
+def _build(path: str, *args: str, env: dict | None = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, TUSMO, path, *args],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+    )
+
+
+def _toolchain_available(tmp_path_factory) -> bool:
+    global _toolchain_ok
+    if _toolchain_ok is None:
+        probe = tmp_path_factory.mktemp("probe") / "probe.tus"
+        probe.write_text('qor("ok");\n', encoding="utf-8")
+        env = dict(os.environ, TUSMO_NO_CACHE="1")
+        _toolchain_ok = _build(str(probe), env=env).returncode == 0
+    return _toolchain_ok
+
+
+@pytest.fixture
+def tusmo(tmp_path, tmp_path_factory):
+    """`tusmo(source, *args, env=None)`: build `source` and return the program's stdout."""
+    if not _toolchain_available(tmp_path_factory):
+        pytest.skip("C compiler with libgc not available")
+
+    def build_and_run(source: str, *args: str, env: dict | None = None, name: str = "main") -> str:
+        path = tmp_path / f"{name}.tus"
+        path.write_text(source, encoding="utf-8")
+        env = dict(os.environ, **(env or {}))
+        result = _build(str(path), *args, env=env)
+        assert result.returncode == 0, result.stdout + result.stderr
+        run = subprocess.run([str(tmp_path / name)], capture_output=True, text=True, timeout=60)
+        assert run.returncode == 0, run.stderr
+        return run.stdout
+
+    return build_and_run
@@ -0,0 +1,43 @@
+"""Cached binaries must never outlive the sources they were linked from."""
+
+import os
+
+from compiler.build_cache import BuildCache
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_store_drops_binaries_of_every_toolchain(tmp_path):
+    cache = BuildCache(str(tmp_path / "cache"))
+    source = str(tmp_path / "main.tus")
+    binary = str(tmp_path / "main")
+
+    _write(source, 'qor("v1");\n')
+    cache.store(source, [source], None, [])
+    _write(binary, "v1")
+    cache.store_binary(source, "release", binary)
+
+    # Edit the source and rebuild with a different toolchain.
+    _write(source, 'qor("v2");\n')
+    assert cache.lookup(source, with_c_code=False) is None
+    cache.store(source, [source], None, [])
+    _write(binary, "v2")
+    cache.store_binary(source, "counted", binary)
+
+    # Switching back must not serve the binary linked from the first source.
+    destination = str(tmp_path / "out")
+    assert not cache.fetch_binary(source, "release", destination)
+    assert not os.path.exists(destination)
+    assert cache.fetch_binary(source, "counted", destination)
+    with open(destination) as f:
+        assert f.read() == "v2"
+
+
+def test_edit_switch_toolchain_switch_back(tusmo, tmp_path):
+    env = {"TUSMO_CACHE_DIR": str(tmp_path / "cache"), "TUSMO_NO_CACHE": ""}
+    assert tusmo('qor("v1");\n', "--profile", "release", env=env) == "v1\n"
+    assert tusmo('qor("v2");\n', "--profile", "release", "--counted-strings", env=env) == "v2\n"
+    assert tusmo('qor("v2");\n', "--profile", "release", env=env) == "v2\n"
@@ -0,0 +1,40 @@
+"""A folded concatenation must still give the program a writable eray."""
+
+from compiler.frontend.parser.ast_nodes import BinaryOpNode, IdentifierNode, KeydNode, QorNode, StringNode
+from compiler.midend.constant_fold import fold_constants
+
+
+def _keyd(name, value):
+    return KeydNode(name, "eray", value, line=1, filename="t.tus")
+
+
+def test_folded_concatenation_is_owned_and_not_propagated():
+    concat = BinaryOpNode(StringNode("ab"), "+", StringNode("cd"), line=1, filename="t.tus")
+    ast = [_keyd("s", concat), QorNode(2, [IdentifierNode("s", line=2, filename="t.tus")], "t.tus")]
+    fold_constants(ast)
+
+    folded = ast[0].value
+    assert isinstance(folded, StringNode) and folded.value == "abcd" and folded.owned
+    # Every use must see the same buffer, so `s` is not replaced by copies of the literal.
+    assert isinstance(ast[1].expressions[0], IdentifierNode)
+
+
+def test_plain_literal_is_not_owned():
+    ast = [_keyd("s", StringNode("abcd"))]
+    fold_constants(ast)
+    assert not ast[0].value.owned
+
+
+def test_writing_into_folded_string(tusmo):
+    source = (
+        'keyd:eray s = "ab" + "cd";\n'
+        "s[0] = 'X';\n"
+        "qor(s);\n"
+        "hawl bedel(a: eray) : waxbo {\n"
+        "    a[1] = 'Y';\n"
+        "}\n"
+        'keyd:eray t = $"q{1}r";\n'
+        "bedel(t);\n"
+        "qor(t);\n"
+    )
+    assert tusmo(source, env={"TUSMO_NO_CACHE": "1"}).splitlines() == ["Xbcd", "qYr"]
@@ -0,0 +1,61 @@
+"""F-strings resolve to text runs and holes; a cached hole is placed at its own f-string."""
+
+import pytest
+
+from compiler.frontend.parser.ast_nodes import iter_child_nodes
+from compiler.midend import fstring_resolver
+from compiler.midend.ast_prepare import prepare_ast
+from compiler.midend.semanticanalyzer import SemanticChecker, SemanticError
+from compiler.midend.symbol_table import SymbolTable
+from compiler.processer import parse_code_to_ast
+
+
+@pytest.fixture(autouse=True)
+def empty_hole_cache(monkeypatch):
+    monkeypatch.setattr(fstring_resolver, "_parsed_holes", {})
+
+
+def _positions(node):
+    pending, seen = [node], []
+    while pending:
+        current = pending.pop()
+        seen.append((current.filename, current.line))
+        pending.extend(iter_child_nodes(current))
+    return set(seen)
+
+
+def test_text_runs_and_cached_hole_positions():
+    source = 'keyd:tiro x = 1;\nqor($"a {x + 1} b{x}");\n\n\nqor($"{x + 1}!");\n'
+    ast = prepare_ast(parse_code_to_ast(source, "/src/kow.tus"))
+    first, second = ast[1].expressions[0], ast[2].expressions[0]
+
+    assert [kind for kind, _ in first.parts] == ["text", "expr", "text", "expr"]
+    assert [value for kind, value in first.parts if kind == "text"] == ["a ", " b"]
+    assert [value for kind, value in second.parts if kind == "text"] == ["!"]
+    assert "x + 1" in fstring_resolver._parsed_holes
+
+    first_hole, second_hole = first.parts[1][1], second.parts[0][1]
+    assert second_hole is not first_hole
+    assert _positions(first_hole) == {("/src/kow.tus", 2)}
+    assert _positions(second_hole) == {("/src/kow.tus", 5)}
+
+
+def test_error_in_cached_hole_reports_its_own_position():
+    function = "hawl f(a: tiro) : tiro { soo_celi a; }\n"
+    prepare_ast(parse_code_to_ast(function + 'qor($"{f(1, 2)}");\n', "/src/kow.tus"))
+    assert "f(1, 2)" in fstring_resolver._parsed_holes
+
+    ast = prepare_ast(parse_code_to_ast(function + '\n\nqor($"x {f(1, 2)}");\n', "/src/labo.tus"))
+    with pytest.raises(SemanticError) as error:
+        SemanticChecker(SymbolTable()).check(ast)
+    assert "Faylka: '/src/labo.tus', Sadarka: 4" in str(error.value)
+
+
+def test_repeated_holes_print_their_own_values(tusmo):
+    source = """\
+keyd:tiro x = 1;
+qor($"[{x + 1}]");
+x = 10;
+qor($"<{x + 1}> {x + 1}");
+"""
+    assert tusmo(source).splitlines() == ["[2]", "<11> 11"]
@@ -0,0 +1,58 @@
+"""Generating PLY tables must survive concurrent compiles and read-only installs."""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from compiler.frontend.lexer import lexer as lexer_module
+from compiler.frontend.parser import parser as parser_module
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _read_only(monkeypatch):
+    def denied(*args, **kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(os, "remove", denied)
+    monkeypatch.setattr(tempfile, "mkdtemp", denied)
+
+
+def test_parser_builds_in_read_only_install(monkeypatch):
+    _read_only(monkeypatch)
+    parser = parser_module.build_parser("parsetab_readonly_probe")
+    assert parser is not None
+    assert not os.path.exists(os.path.join(parser_module._PARSER_DIR, "parsetab_readonly_probe.py"))
+
+
+def test_lexer_builds_in_read_only_install(monkeypatch):
+    _read_only(monkeypatch)
+    built = lexer_module.build_lexer("lextab_readonly_probe")
+    built.input("keyd:tiro x = 1;")
+    assert [token.type for token in iter(built.token, None)][:2] == ["KEYD", "COLON"]
+
+
+def test_tables_are_written_whole(tmp_path, monkeypatch):
+    monkeypatch.setattr(parser_module, "_PARSER_DIR", str(tmp_path))
+    parser_module.build_parser("parsetab_atomic_probe")
+    written = [name for name in os.listdir(tmp_path)]
+    # Only the finished module is left; the staging directory is gone.
+    assert written == ["parsetab_atomic_probe.py"]
+    compiled = subprocess.run(
+        [sys.executable, "-m", "py_compile", str(tmp_path / "parsetab_atomic_probe.py")],
+        cwd=REPO_ROOT, capture_output=True,
+    )
+    assert compiled.returncode == 0
+
+
+def test_importing_the_compiler_builds_no_tables():
+    probe = (
+        "import ply.lex, ply.yacc\n"
+        "def denied(*args, **kwargs):\n"
+        "    raise AssertionError('table work at import time')\n"
+        "ply.lex.lex = ply.yacc.yacc = denied\n"
+        "import compiler.processer, compiler.midend.docstring_index\n"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], cwd=REPO_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,25 @@
+"""A PGO training run that never finishes fails the build instead of hanging it."""
+
+import stat
+import sys
+import time
+
+from compiler.toolchain import build_with_pgo
+
+
+def test_training_run_times_out(tmp_path, capsys):
+    binary = tmp_path / "main"
+    binary.write_text("#!/bin/sh\nread line\nsleep 30\n", encoding="utf-8")
+    binary.chmod(binary.stat().st_mode | stat.S_IEXEC)
+    compiles = []
+
+    def command(extra_flags):
+        compiles.append(extra_flags)
+        return [sys.executable, "-c", "pass"]
+
+    started = time.monotonic()
+    assert build_with_pgo("gcc", command, str(binary), None, timeout=0.5) == 1
+    assert time.monotonic() - started < 10
+    # Only the instrumented build ran; the profile-use build never started.
+    assert len(compiles) == 1
+    assert "--pgo-train" in capsys.readouterr().err
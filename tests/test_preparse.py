@@ -0,0 +1,57 @@
+"""Parsing imports in a process pool gives the same result as parsing them one by one."""
+
+from compiler.ast_cache import module_ast_cache
+from compiler.frontend.parser.ast_nodes import ASTNode
+from compiler.processer import preparse_modules
+from compiler.toolchain import STDLIB_DIR
+
+MODULES = {
+    "kow.tus": 'keen "saddex";\nhawl kow() : tiro { soo_celi saddex() + 1; }\n',
+    "labo.tus": 'keen "saddex";\nhawl labo(x: eray) : eray { soo_celi $"<{x}>"; }\n',
+    "saddex.tus": "hawl saddex() : tiro { soo_celi 3; }\n",
+}
+
+MAIN = """\
+keen "kow";
+keen "labo";
+keen "os";
+qor(kow(), " ", labo("a"));
+"""
+
+
+def _dump(value):
+    """A comparable picture of an AST: node classes and every slot, recursively."""
+    if isinstance(value, ASTNode):
+        slots = [name for cls in type(value).__mro__ for name in getattr(cls, "__slots__", ())]
+        return (type(value).__name__, tuple((name, _dump(getattr(value, name, None))) for name in slots))
+    if isinstance(value, (list, tuple)):
+        return tuple(_dump(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _dump(item)) for key, item in value.items()))
+    return value
+
+
+def _write_modules(directory):
+    for name, source in MODULES.items():
+        (directory / name).write_text(source, encoding="utf-8")
+    return [str(directory / "kow.tus"), str(directory / "labo.tus"), str(directory / "saddex.tus")]
+
+
+def test_pool_matches_serial_parse(tmp_path, monkeypatch):
+    monkeypatch.setattr(module_ast_cache, "enabled", False)
+    monkeypatch.setattr(module_ast_cache, "keep_in_memory", False)
+    paths = _write_modules(tmp_path) + [f"{STDLIB_DIR}/os.tus"]
+
+    serial = preparse_modules(paths, STDLIB_DIR, jobs=1)
+    pooled = preparse_modules(paths, STDLIB_DIR, jobs=4)
+    assert list(pooled) == list(serial)
+    assert {path: _dump(ast) for path, ast in pooled.items()} == {path: _dump(ast) for path, ast in serial.items()}
+
+
+def test_pool_and_serial_builds_emit_the_same_c(tusmo, tmp_path):
+    _write_modules(tmp_path)
+    env = {"TUSMO_NO_CACHE": "1"}
+    assert tusmo(MAIN, "-j", "1", "--c", env=env) == "4 <a>\n"
+    serial = (tmp_path / "main.c").read_bytes()
+    assert tusmo(MAIN, "-j", "4", "--c", env=env) == "4 <a>\n"
+    assert (tmp_path / "main.c").read_bytes() == serial
@@ -0,0 +1,38 @@
+"""Runtime objects and binaries are keyed by what the C compiler is, not what it is called."""
+
+import os
+import stat
+
+from compiler import runtime_cache
+from compiler.build_cache import toolchain_key
+
+
+def _fake_cc(path, version):
+    path.write_text(f"#!/bin/sh\necho '{version}'\n", encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def test_upgrading_the_compiler_changes_the_keys(tmp_path, monkeypatch):
+    source = tmp_path / "string.c"
+    source.write_text("int x;\n", encoding="utf-8")
+    monkeypatch.setattr(runtime_cache, "_compiler_identities", {})
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    _fake_cc(tmp_path / "cc", "cc 12.1")
+    old_object = runtime_cache.runtime_object_key("cc", ["-O2"], str(source), [])
+    old_binary = toolchain_key("cc", ["-O2"])
+
+    # Same name, new compiler: a fresh process would see a different identity.
+    _fake_cc(tmp_path / "cc", "cc 13.2")
+    runtime_cache._compiler_identities.clear()
+    assert runtime_cache.runtime_object_key("cc", ["-O2"], str(source), []) != old_object
+    assert toolchain_key("cc", ["-O2"]) != old_binary
+
+
+def test_identity_is_resolved_once_per_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(runtime_cache, "_compiler_identities", {})
+    cc = _fake_cc(tmp_path / "cc", "cc 12.1")
+    first = runtime_cache.compiler_identity(cc)
+    _fake_cc(tmp_path / "cc", "cc 13.2")
+    assert runtime_cache.compiler_identity(cc) == first
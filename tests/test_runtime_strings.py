@@ -0,0 +1,17 @@
+"""Strings built by the networking runtime behave like any other eray."""
+
+import pytest
+
+SOURCE = """\
+hawl furaha(key: eray) : eray {
+    soo_celi ___c__call_("tusmo_ws_generate_accept_key", key);
+}
+keyd:eray k = furaha("dGhlIHNhbXBsZSBub25jZQ==");
+qor(k, " ", dherer(k), " ", k == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo=");
+"""
+
+
+@pytest.mark.parametrize("flags", [(), ("--counted-strings",)], ids=["plain", "counted"])
+def test_websocket_accept_key(tusmo, flags):
+    # The handshake example from RFC 6455, section 1.3.
+    assert tusmo(SOURCE, *flags, env={"TUSMO_NO_CACHE": "1"}) == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo= 28 run\n"
@@ -0,0 +1,46 @@
+"""tusmo_str_build gives the same text as the old chain of tusmo_concat_cstr calls."""
+
+import pytest
+
+# `hore` rebuilds each value the way codegen did before tusmo_str_build:
+# tusmo_str_format per piece, joined pairwise with tusmo_concat_cstr.
+SOURCE = """\
+hawl isku(a: eray, b: eray) : eray { soo_celi ___c__call_("tusmo_concat_cstr", a, b); }
+hawl tiro_eray(n: tiro) : eray { soo_celi ___c__call_("tusmo_str_format", "%d", n); }
+hawl jajab_eray(j: jajab) : eray { soo_celi ___c__call_("tusmo_str_format", "%f", j); }
+hawl xaraf_eray(c: xaraf) : eray { soo_celi ___c__call_("tusmo_str_format", "%c", c); }
+hawl miyaa_eray(m: miyaa) : eray {
+    haddii (m) { soo_celi "run"; }
+    soo_celi "been";
+}
+
+keyd:eray a = "a=";
+keyd:tiro n = 0 - 42;
+keyd:tiro kuu = 2147483647;
+keyd:tiro eber = 0;
+keyd:jajab j = 0.0 - 2.25;
+keyd:miyaa b = been;
+keyd:xaraf x = 'z';
+
+keyd:eray dhisan = a + n + " " + kuu + " " + eber + " " + j + " " + b + " " + x + "|";
+keyd:eray hore = isku(isku(isku(isku(isku(isku(isku(isku(isku(isku(isku(isku(a, tiro_eray(n)), " "), tiro_eray(kuu)), " "), tiro_eray(eber)), " "), jajab_eray(j)), " "), miyaa_eray(b)), " "), xaraf_eray(x)), "|");
+qor(dhisan);
+qor(dhisan == hore, " ", dherer(dhisan) == dherer(hore));
+
+keyd:eray f = $"{n}/{j}/{b}/{x}/{a}";
+keyd:eray f_hore = isku(isku(isku(isku(isku(isku(isku(isku(tiro_eray(n), "/"), jajab_eray(j)), "/"), miyaa_eray(b)), "/"), xaraf_eray(x)), "/"), a);
+qor(f);
+qor(f == f_hore);
+"""
+
+EXPECTED = [
+    "a=-42 2147483647 0 -2.250000 been z|",
+    "run run",
+    "-42/-2.250000/been/z/a=",
+    "run",
+]
+
+
+@pytest.mark.parametrize("flags", [(), ("--counted-strings",)], ids=["plain", "counted"])
+def test_build_matches_pairwise_concatenation(tusmo, flags):
+    assert tusmo(SOURCE, *flags, env={"TUSMO_NO_CACHE": "1"}).splitlines() == EXPECTED
@@ -0,0 +1,65 @@
+"""Writing into a slice view copies it; the parent and other views are untouched."""
+
+import pytest
+
+SOURCE = """\
+keyd:eray s = "salaan" + " adduun";
+keyd:eray t = s[7:];
+keyd:eray t2 = s[7:];
+t2[0] = 'A';
+qor(s);
+qor(t);
+qor(t2);
+qor(s == "salaan adduun", " ", t2 == "Adduun", " ", s[7:] == t2);
+keyd:tix:eray q = kala_jar("a,b,cd", ",");
+q[2][0] = 'X';
+qor(ku_dar(q, ","));
+keyd:eray b = s;
+b[0] = 'S';
+qor(s);
+"""
+
+EXPECTED = [
+    "salaan adduun",
+    "adduun",
+    "Adduun",
+    "run run been",
+    "a,b,Xd",
+    # `b` and `s` share one owned buffer, so the write is seen through both.
+    "Salaan adduun",
+]
+
+
+@pytest.mark.parametrize("flags", [(), ("--counted-strings",)], ids=["plain", "counted"])
+def test_mutated_view_compares_with_parent(tusmo, flags):
+    assert tusmo(SOURCE, *flags, env={"TUSMO_NO_CACHE": "1"}).splitlines() == EXPECTED
+
+
+PARENT_WRITE_SOURCE = """\
+keyd:eray s = "salaan" + " adduun";
+keyd:eray t = s[7:];
+keyd:eray m = s[7:10];
+s[8] = 'Z';
+qor(s);
+qor(t);
+qor(m);
+keyd:eray r = "a,b,cd";
+keyd:tix:eray q = kala_jar(r, ",");
+r[4] = 'X';
+r[0] = 'Y';
+qor(r);
+qor(ku_dar(q, ","));
+"""
+
+PARENT_WRITE_EXPECTED = [
+    "salaan aZduun",
+    "adduun",
+    "add",
+    "Y,b,Xd",
+    "a,b,cd",
+]
+
+
+@pytest.mark.parametrize("flags", [(), ("--counted-strings",)], ids=["plain", "counted"])
+def test_writing_parent_leaves_slices_and_parts_alone(tusmo, flags):
+    assert tusmo(PARENT_WRITE_SOURCE, *flags, env={"TUSMO_NO_CACHE": "1"}).splitlines() == PARENT_WRITE_EXPECTED
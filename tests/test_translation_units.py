@@ -0,0 +1,42 @@
+"""Each module's translation unit depends only on that module's source."""
+
+LIB_WITH_TEMP = """\
+hawl kow() : tiro {
+    keyd:tix:tiro t = [1, 2, 3];
+    soo_celi t[0] + t[2];
+}
+"""
+
+LIB_WITHOUT_TEMP = """\
+hawl kow() : tiro {
+    soo_celi 4;
+}
+"""
+
+LIB_TWO = """\
+hawl labo() : tiro {
+    keyd:tix:tiro t = [5, 6];
+    soo_celi t[1];
+}
+"""
+
+MAIN = """\
+keen "kow";
+keen "labo";
+keyd:tix:tiro m = [7];
+qor(kow(), " ", labo(), " ", m[0]);
+"""
+
+
+def test_editing_one_module_leaves_other_units_unchanged(tusmo, tmp_path):
+    (tmp_path / "labo.tus").write_text(LIB_TWO, encoding="utf-8")
+    units = tmp_path / "main_c"
+
+    (tmp_path / "kow.tus").write_text(LIB_WITH_TEMP, encoding="utf-8")
+    assert tusmo(MAIN, "--profile", "dev", "--c") == "4 6 7\n"
+    before = {name: (units / name).read_bytes() for name in ("labo.c", "main.c")}
+
+    # kow.tus no longer asks for a temporary at all.
+    (tmp_path / "kow.tus").write_text(LIB_WITHOUT_TEMP, encoding="utf-8")
+    assert tusmo(MAIN, "--profile", "dev", "--c") == "4 6 7\n"
+    assert {name: (units / name).read_bytes() for name in before} == before
@@ -0,0 +1,40 @@
+"""Tree shaking drops what an imported module never reaches and keeps what it does."""
+
+import re
+
+LIB = """\
+hawl la_isticmaalo() : tiro { soo_celi 1; }
+hawl aan_la_gaarin() : tiro { soo_celi 2; }
+koox Qof {
+    keyd:eray magac;
+    dhis(m: eray) : waxbo {
+        kan.magac = m;
+    }
+    hawl salaan() : eray {
+        soo_celi "salaan " + kan.magac;
+    }
+    hawl hawl_aan_la_wicin() : tiro {
+        soo_celi 3;
+    }
+}
+koox Aan_La_Isticmaalin {
+    keyd:tiro x;
+}
+"""
+
+MAIN = """\
+keen "lib";
+keyd:Qof q = Qof("Cali") cusub;
+qor(la_isticmaalo(), " ", q.salaan());
+"""
+
+
+def test_unreachable_functions_and_methods_are_dropped(tusmo, tmp_path):
+    (tmp_path / "lib.tus").write_text(LIB, encoding="utf-8")
+    assert tusmo(MAIN, "--c", env={"TUSMO_NO_CACHE": "1"}) == "1 salaan Cali\n"
+
+    c_code = (tmp_path / "main.c").read_text(encoding="utf-8")
+    for kept in ("la_isticmaalo", "Qof_dhis", "Qof_salaan"):
+        assert re.search(rf"\b{kept}\b", c_code), kept
+    for dropped in ("aan_la_gaarin", "hawl_aan_la_wicin", "Aan_La_Isticmaalin"):
+        assert dropped not in c_code, dropped
@@ -0,0 +1,53 @@
+"""The xadhig string builder, and 'xadhig' as a contextual name programs may still use."""
+
+import pytest
+
+ROUND_TRIP = """\
+keyd:xadhig b = xadhig(2);
+soco i laga bilaabo 0 .. 3 {
+    b.gali(i);
+    b.gali(',');
+}
+b.gali("eray ");
+b.gali(1.5);
+b.gali(' ');
+b.gali(run);
+qor(b);
+keyd:eray e = eray(b);
+b.gali("!");
+qor(e, " ", dherer(e));
+qor($"[{b}]");
+"""
+
+
+@pytest.mark.parametrize("flags", [(), ("--counted-strings",)], ids=["plain", "counted"])
+def test_gali_and_qor_round_trip(tusmo, flags):
+    # The builder starts smaller than its contents, and eray(b) is a copy that
+    # later appends do not change.
+    assert tusmo(ROUND_TRIP, *flags, env={"TUSMO_NO_CACHE": "1"}).splitlines() == [
+        "0,1,2,eray 1.500000 run",
+        "0,1,2,eray 1.500000 run 23",
+        "[0,1,2,eray 1.500000 run!]",
+    ]
+
+
+def test_xadhig_builtin_and_local_variable(tusmo):
+    source = """\
+hawl f() : tiro {
+    keyd:tiro xadhig = 5;
+    soo_celi xadhig + 1;
+}
+qor(f());
+keyd:xadhig b = xadhig(16);
+b.gali("ok");
+qor(eray(b));
+"""
+    assert tusmo(source).splitlines() == ["6", "ok"]
+
+
+def test_user_function_named_xadhig_shadows_builtin(tusmo):
+    source = """\
+hawl xadhig(n: tiro) : tiro { soo_celi n * 2; }
+qor(xadhig(21));
+"""
+    assert tusmo(source).splitlines() == ["42"]
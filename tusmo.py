@@ -1,62 +1,205 @@
 # tusmo.py (Correctly Updated)
 
+import argparse
 import sys
 import os
 import traceback
+import shutil
 import subprocess
+import tempfile
 
 sys.path.append(os.path.dirname(__file__))
 
-
-from compiler.frontend.lexer.lexer import lexer
-from compiler.frontend.parser.parser import parser
-from compiler.backend.transpiler import Transpiler
-from compiler.midend.symbol_table import SymbolTable
-from compiler.midend.semanticanalyzer import SemanticChecker, SemanticError
-from compiler.processer import process_imports
-from compiler.midend.fstring_resolver import resolve_fstrings
-from compiler.midend.docstring_utils import (
-    preprocess_docstrings,
-    attach_docstrings,
+# Only the daemon client is imported up front: when a daemon is running the
+# compiler itself never has to be loaded in this process.
+from compiler import daemon
+from compiler.toolchain import (
+    DEFAULT_PGO_TIMEOUT, DEFAULT_PROFILE, PROFILES, RUNTIME_DIR, STDLIB_DIR, all_runtime_sources, build_with_pgo,
+    get_profile, link_command, runtime_sources, toolchain, with_counted_strings,
 )
 
 
-def main():
-    remove_c_code = True
-    if len(sys.argv) not in [2, 3]:
-        print("Isticmaalka: python tusmo.py <magaca_faylka.tus> [--c]")
+def parse_args(argv=None):
+    from compiler.pass_timing import PassTimer
+
+    arg_parser = argparse.ArgumentParser(
+        prog="tusmo.py",
+        description="Wuxuu u turjumaa faylka .tus C, kadibna wuxuu sameeyaa barnaamij la fulin karo.",
+    )
+    arg_parser.add_argument(
+        "filenames", nargs="+", metavar="FAYL",
+        help="Faylka .tus ee la turjumayo. Faylal badan ama gal (directory) ayaa hal mar la wada turjumi karaa.",
+    )
+    arg_parser.add_argument(
+        "-j", "--jobs", type=int, metavar="N",
+        help="Tirada shaqaalaha isbarbar socda marka faylal badan la turjumayo (default: $TUSMO_JOBS ama tirada CPU-yada).",
+    )
+    arg_parser.add_argument(
+        "--c", dest="keep_c", action="store_true",
+        help="Ha tirtirin faylka C ee la sameeyay.",
+    )
+    arg_parser.add_argument(
+        "--profile", choices=PROFILES, default=None,
+        help="Sida C-ga loo dhisayo: " + "; ".join(
+            f"{name}: {profile.description}" for name, profile in PROFILES.items()
+        ) + f" (default: $TUSMO_PROFILE ama {DEFAULT_PROFILE}).",
+    )
+    arg_parser.add_argument(
+        "--counted-strings", action="store_true", default=bool(os.environ.get("TUSMO_COUNTED_STRINGS")),
+        help="Eray kasta oo runtime-ku sameeyo wuxuu wataa dhererkiisa iyo hash-kiisa, sidaa darteed "
+             "dherer, == iyo furayaasha qaamuuska ma dib u tiriyaan xarfaha (default: $TUSMO_COUNTED_STRINGS).",
+    )
+    arg_parser.add_argument(
+        "--pgo-train", metavar="AMAR",
+        help="Amarka tababarka ee --profile pgo. {binary} waxaa lagu beddelaa barnaamijka "
+             "la cabbirayo; haddii kale dhammaadka ayaa lagu daraa. Default: barnaamijka oo hal mar la socodsiiyo.",
+    )
+    arg_parser.add_argument(
+        "--pgo-timeout", metavar="ILBIRIQSI", type=float,
+        default=float(os.environ.get("TUSMO_PGO_TIMEOUT") or DEFAULT_PGO_TIMEOUT),
+        help="Inta ugu badan ee tababarka PGO socon karo ka hor inta dhismuhu fashilmin "
+             f"(default: $TUSMO_PGO_TIMEOUT ama {DEFAULT_PGO_TIMEOUT:g}).",
+    )
+    arg_parser.add_argument(
+        "--time-passes", action="store_true",
+        help="Qor waqtiga, CPU-ga, xusuusta iyo tirada qodobbada marxalad kasta.",
+    )
+    arg_parser.add_argument(
+        "--time-passes-format", choices=PassTimer.FORMATS, default="table",
+        help="Qaabka warbixinta: table (default), json, ama chrome (Chrome trace).",
+    )
+    arg_parser.add_argument(
+        "--time-passes-output", metavar="FAYL",
+        help="Halka warbixinta lagu qorayo (default: stderr).",
+    )
+    return arg_parser.parse_args(argv)
+
+
+def parse_serve_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog="tusmo.py serve",
+        description="Wuxuu bilaabaa daemon turjumaad oo parser-ka iyo stdlib-ka diyaar ku haya.",
+    )
+    arg_parser.add_argument(
+        "--socket", metavar="WADDO",
+        help="Unix socket-ka (default: $TUSMO_DAEMON_SOCKET ama daemon.sock ee galka kaydka).",
+    )
+    arg_parser.add_argument("--stop", action="store_true", help="Jooji daemon-ka shaqaynaya.")
+    return arg_parser.parse_args(argv)
+
+
+def main(argv=None, allow_daemon=True):
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    if argv[:1] == ["serve"]:
+        serve_args = parse_serve_args(argv[1:])
+        if serve_args.stop:
+            sys.exit(daemon.stop(serve_args.socket))
+        sys.exit(daemon.serve(
+            lambda request_argv: main(request_argv, allow_daemon=False),
+            serve_args.socket,
+            warm=warm_daemon,
+        ))
+
+    if "--daemon" in argv:
+        argv.remove("--daemon")
+        use_daemon = True
+    else:
+        use_daemon = bool(os.environ.get("TUSMO_DAEMON"))
+    if allow_daemon and use_daemon:
+        exit_code = daemon.request_compile(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+        # Daemon ma jiro: halkan ayaa lagu turjumayaa.
+
+    args = parse_args(argv)
+    try:
+        profile = get_profile(args.profile)
+    except ValueError as e:
+        print(f"Cilad: {e}", file=sys.stderr)
         sys.exit(1)
-
-    if len(sys.argv) == 3 and sys.argv[2] == "--c":
-        remove_c_code = False
-
-    filename = sys.argv[1]
+    if args.counted_strings:
+        profile = with_counted_strings(profile)
+
+    if len(args.filenames) > 1 or os.path.isdir(args.filenames[0]):
+        from compiler.batch import compile_batch
+
+        if args.time_passes:
+            print("Digniin: --time-passes waxaa la taageeraa hal fayl oo keliya.", file=sys.stderr)
+        if profile.pgo:
+            print("Cilad: --profile pgo waxaa la taageeraa hal fayl oo keliya.", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(compile_batch(args.filenames, jobs=args.jobs, keep_c=args.keep_c, profile=profile))
+    compile_program(args, profile)
+
+
+def warm_daemon():
+    """Load everything a compile needs once, before the daemon forks per request."""
+    from compiler.ast_cache import module_ast_cache
+    from compiler.frontend.lexer.lexer import lexer
+    from compiler.frontend.parser.parser import parser
+    from compiler.processer import load_module_ast
+    from compiler.runtime_cache import compile_runtime_objects
+
+    import compiler.backend.transpiler  # noqa: F401
+    import compiler.midend.semanticanalyzer  # noqa: F401
+    import compiler.pass_timing  # noqa: F401
+
+    lexer._get()
+    parser._get()
+    module_ast_cache.keep_in_memory = True
+    for root, _, files in os.walk(STDLIB_DIR):
+        for name in sorted(files):
+            if name.endswith(".tus"):
+                try:
+                    load_module_ast(os.path.join(root, name))
+                except (Exception, SystemExit):
+                    pass
+
+    if not os.environ.get("TUSMO_NO_CACHE"):
+        cc, include_dir, _ = toolchain()
+        for profile in PROFILES.values():
+            if not profile.pgo:
+                compile_runtime_objects(cc, list(profile.c_flags), all_runtime_sources(), [include_dir], RUNTIME_DIR)
+
+
+def compile_program(args, profile):
+    from compiler.backend.transpiler import Transpiler
+    from compiler.build_cache import BuildCache, runtime_fingerprint, toolchain_key
+    from compiler.midend.ast_prepare import prepare_ast
+    from compiler.midend.constant_fold import fold_constants
+    from compiler.midend.semanticanalyzer import SemanticChecker, SemanticError
+    from compiler.midend.symbol_table import SymbolTable
+    from compiler.midend.tree_shake import shake_tree
+    from compiler.pass_timing import PassTimer
+    from compiler.processer import default_jobs, parse_code_to_ast, preparse_imports, process_imports
+    from compiler.runtime_cache import compile_objects, compile_runtime_objects, default_cache_dir, runtime_headers
+
+    remove_c_code = not args.keep_c
+    timer = PassTimer(enabled=args.time_passes)
+
+    filename = args.filenames[0]
     if not os.path.exists(filename):
         print(f"Cilad: Faylka '{filename}' ma jiro.")
         sys.exit(1)
 
-    script_directory = os.path.dirname(os.path.abspath(__file__))
-    project_root = script_directory
-    runtime_dir = os.path.join(project_root, "runtime")
-    stdlib_dir = os.path.join(project_root, "stdlib")
-
-    # Map features to their source files
-    feature_to_source_map = {
-        "string": os.path.join(runtime_dir, "string.c"),
-        "nasiib": os.path.join(runtime_dir, "random.c"),
-        "io": os.path.join(runtime_dir, "io.c"),
-        "wakhti": os.path.join(runtime_dir, "time.c"),
-        "os": os.path.join(runtime_dir, "os.c"),
-        "dictionary": os.path.join(runtime_dir, "dictionary.c"),
-        "conversion": os.path.join(runtime_dir, "type_conversion.c"),
-        "http": os.path.join(runtime_dir, "http.c"),
-        "socket": os.path.join(runtime_dir, "socket.c"),
-        "websocket": os.path.join(runtime_dir, "websocket.c"),
-        "array": [
-            os.path.join(runtime_dir, "array.c"),
-            os.path.join(runtime_dir, "array_generic.c"),
-        ],
-    }
+    c_flags = list(profile.c_flags)
+    cc, include_dir, lib_dir_override = toolchain()
+
+    use_cache = not os.environ.get("TUSMO_NO_CACHE")
+    build_cache = BuildCache() if use_cache else None
+    build_toolchain = toolchain_key(
+        cc, c_flags, [include_dir, lib_dir_override or "", runtime_fingerprint(RUNTIME_DIR)]
+    ) if use_cache else None
+    # A PGO binary depends on its training run, so it is never reused from the cache.
+    reuse_binary = build_cache is not None and not profile.pgo
+    split_units = profile.split_units
+    jobs = args.jobs or default_jobs()
+
+    out_file = filename.replace(".tus", ".c")
+    binary = out_file.replace(".c", "")
+    # Per-module units are kept next to the program with --c, otherwise in a temporary directory.
+    units_dir = None
 
     with open(filename, "r") as f:
         main_code = f.read()
@@ -64,85 +207,138 @@ def main():
     shared_symbol_table = SymbolTable()
 
     try:
-        initial_ast = parse_code_to_ast(main_code, filename)
-
-        if not initial_ast:
-            sys.exit(0)
-
-        main_file_directory = os.path.dirname(os.path.abspath(filename))
-        final_ast = process_imports(initial_ast, base_directory=main_file_directory, stdlib_path=stdlib_dir)
-
-        if not final_ast:
-            sys.exit(0)
+        with timer.measure("build cache lookup"):
+            cached = build_cache.lookup(filename, with_c_code=not split_units) if build_cache else None
+        # Nothing in the program changed: reuse the linked binary if this
+        # toolchain already produced one, otherwise only re-run the C compiler.
+        if cached is not None and remove_c_code and reuse_binary and build_cache.fetch_binary(
+            filename, build_toolchain, binary
+        ):
+            return
+        if cached is not None and not split_units:
+            runtime_symbols = cached["runtime_symbols"]
+            imported_files = None
+            with open(out_file, "w") as f:
+                f.write(cached["c_code"])
+        else:
+            with timer.measure("parse") as record:
+                initial_ast = parse_code_to_ast(main_code, filename)
+                record.nodes = timer.count_nodes(initial_ast)
+
+            if not initial_ast:
+                sys.exit(0)
+
+            main_file_directory = os.path.dirname(os.path.abspath(filename))
+            imported_files = set()
+            with timer.measure("imports") as record:
+                parsed_modules = preparse_imports(
+                    initial_ast, base_directory=main_file_directory, stdlib_path=STDLIB_DIR,
+                    timer=timer,
+                )
+                final_ast = process_imports(
+                    initial_ast,
+                    base_directory=main_file_directory,
+                    stdlib_path=STDLIB_DIR,
+                    processed_files=imported_files,
+                    parsed_modules=parsed_modules,
+                )
+                record.nodes = timer.count_nodes(final_ast)
+
+            if not final_ast:
+                sys.exit(0)
+
+            with timer.measure("prepare (f-strings, docstrings)"):
+                prepare_ast(final_ast)
+
+            with timer.measure("tree shaking") as record:
+                shake_tree(final_ast, roots=initial_ast)
+                record.nodes = timer.count_nodes(final_ast)
+
+            with timer.measure("semantic check"):
+                checker = SemanticChecker(shared_symbol_table)
+                checker.check(final_ast)
+
+            with timer.measure("constant folding") as record:
+                fold_constants(final_ast)
+                record.nodes = timer.count_nodes(final_ast)
+
+            # Pass the 'checker' instance to the Transpiler
+            with timer.measure("codegen"):
+                transpiler = Transpiler(shared_symbol_table, checker)
+                if split_units:
+                    if remove_c_code:
+                        units_dir = tempfile.mkdtemp(prefix="tusmo-units-")
+                    else:
+                        units_dir = os.path.splitext(filename)[0] + "_c"
+                        os.makedirs(units_dir, exist_ok=True)
+                    units = transpiler.transpile_units(
+                        final_ast, units_dir, os.path.splitext(os.path.basename(filename))[0], filename
+                    )
+                    runtime_symbols = units.runtime_symbols
+                    out_file = units_dir
+                else:
+                    with open(out_file, "w") as f:
+                        runtime_symbols = transpiler.transpile_to(final_ast, f)
 
-        resolve_fstrings(final_ast)
-        attach_docstrings(final_ast)
-
-        checker = SemanticChecker(shared_symbol_table)
-        checker.check(final_ast)
-
-    
-        # Pass the 'checker' instance to the Transpiler
-        transpiler = Transpiler(shared_symbol_table, checker)
-        c_code, used_features = transpiler.transpile(final_ast)                
-        out_file = filename.replace(".tus", ".c")
-        with open(out_file, "w") as f:
-            f.write(c_code)
+        # Dynamically build the list of source files to compile
+        program_files = units.sources if split_units else [out_file]
+        if split_units:
+            # Each module is compiled on its own, in parallel; modules whose C
+            # (and the shared header) did not change reuse their cached object.
+            unit_headers = runtime_headers(include_dir) + ([units.header] if units.header else [])
+            object_dir = os.path.join(default_cache_dir(), "units") if use_cache else units_dir
+            with timer.measure("cc (units)"):
+                unit_objects = compile_objects(
+                    cc, c_flags, program_files, [include_dir], unit_headers, object_dir, jobs
+                )
+            if unit_objects is None:
+                print(f"\nCilad ayaa ka dhacday isku-darka C code-ka. Faylasha C waxay ku yaalaan: {units_dir}")
+                sys.exit(1)
+            program_files = unit_objects
+
+        # Runtime sources only change when Tusmo itself is updated, so they are
+        # compiled once into cached objects and only the generated C is rebuilt.
+        # PGO compiles them from source so the runtime is instrumented too.
+        runtime_files = runtime_sources(runtime_symbols)
+        runtime_objects = None
+        if runtime_files and use_cache and not profile.pgo:
+            with timer.measure("runtime objects"):
+                runtime_objects = compile_runtime_objects(
+                    cc, c_flags, runtime_files, [include_dir], RUNTIME_DIR, jobs=jobs
+                )
+        source_files_to_compile = program_files + (runtime_objects if runtime_objects is not None else runtime_files)
+
+        def compile_command(extra_flags=()):
+            return link_command(
+                cc, [*c_flags, *extra_flags], binary, source_files_to_compile, include_dir, lib_dir_override
+            )
 
-        binary = out_file.replace(".c", "")
+        with timer.measure("cc"):
+            if profile.pgo:
+                compile_result = build_with_pgo(cc, compile_command, binary, args.pgo_train, args.pgo_timeout)
+            else:
+                compile_result = subprocess.run(compile_command()).returncode
 
-        # Dynamically build the list of source files to compile
-        source_files_to_compile = [out_file]
-        
-        
-
-
-        for feature in used_features:
-            if feature in feature_to_source_map:
-                source_path = feature_to_source_map[feature]
-                # Check if the path is a list (like for 'array') or a single string
-                if isinstance(source_path, list):
-                    for path in source_path:
-                        if os.path.exists(path):
-                            source_files_to_compile.append(path)
-                else:  # It's a single string
-                    if os.path.exists(source_path):
-                        source_files_to_compile.append(source_path)
-
-        # Implicit dependency: Array (mixed) might use Dictionary printing
-        if "array" in used_features and "dictionary" not in used_features:
-            dict_path = feature_to_source_map["dictionary"]
-            if os.path.exists(dict_path):
-                source_files_to_compile.append(dict_path)
-
-        all_sources_str = " ".join([f'"{path}"' for path in source_files_to_compile])
-
-        # Allow overriding compiler/lib/include via env vars (for bundled installs)
-        cc = os.environ.get("TUSMO_CC", "gcc")
-        lib_dir_override = os.environ.get("TUSMO_LIB_DIR")
-        include_override = os.environ.get("TUSMO_INCLUDE_DIR")
-
-        include_flag = f'-I"{include_override}"' if include_override else f'-I"{runtime_dir}"'
-        lib_flag = f' -L"{lib_dir_override}"' if lib_dir_override else ""
-
-        # The final, dynamic compile command
-        compile_command = (
-            f'"{cc}" -O3 -march=native -flto -o "{binary}" '
-            f'{all_sources_str} {include_flag}{lib_flag} -lgc'
-        )
-
-        compile_result = os.system(compile_command)
-
-        if compile_result == 1:
+        if compile_result != 0:
             print(
                 f"\nCilad ayaa ka dhacday isku-darka C code-ka. Faylka C wuxuu ku yaal: {out_file}"
             )
-           
+            sys.exit(1)
+
+        if build_cache:
+            if imported_files is not None:
+                build_cache.store(
+                    filename, [filename, *imported_files], None if split_units else out_file, runtime_symbols
+                )
+            if reuse_binary and os.path.exists(binary):
+                build_cache.store_binary(filename, build_toolchain, binary)
 
         if remove_c_code:
-            if os.path.exists(out_file):
+            if units_dir is not None:
+                shutil.rmtree(units_dir, ignore_errors=True)
+            elif os.path.exists(out_file):
                 os.remove(out_file)
-            
+
 
     except SemanticError as e:
         print(f"\n{e}")
@@ -151,14 +347,9 @@ def main():
         print("\nCilad Lama Filaan Ah Ayaa Dhacday:")
         traceback.print_exc()
         sys.exit(1)
-
-
-def parse_code_to_ast(code, filename):
-    code = preprocess_docstrings(code)
-    lexer.filename = filename
-    lexer.lineno = 1
-    ast = parser.parse(code, lexer=lexer)
-    return ast if ast is not None else []
+    finally:
+        if timer.enabled:
+            timer.report(args.time_passes_format, args.time_passes_output)
 
 
 if __name__ == "__main__":